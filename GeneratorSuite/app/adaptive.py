@@ -0,0 +1,142 @@
+import heapq
+import math
+from array import array
+from typing import Callable, Generator, List, Optional, Tuple
+
+from app.analysis import nan_on_error, polynomial_bounds, polynomial_coefficients, polynomial_derivative
+from app.expressions import FunctionLike, resolve_function
+from app.generators import f, report_errors
+from app.grid import validate_range
+
+# --- Адаптивная выборка точек для Задания 2 ---
+#
+# Вместо равномерной сетки точки расставляются так, чтобы ломаная через них
+# отличалась от функции не более чем на tolerance. Отрезок [a, b] делится на
+# initial_points - 1 равных участков, затем участок с наибольшей ошибкой
+# делится пополам, пока ошибка всех участков не станет не больше tolerance
+# или количество точек не достигнет max_points. Порядок делений и результат
+# детерминированы (при равных ошибках первым делится участок левее).
+#
+# Ошибка линейной интерполяции на участке длиной h:
+# - для многочленов (f и строки-выражения) — оценка сверху h^2 / 8 * max|f''| на участке,
+#   где max|f''| находится точно (см. app.analysis.polynomial_bounds), поэтому
+#   ошибка гарантирована (с точностью до округления);
+# - для остальных функций — отклонение функции от хорды в середине участка
+#   (для гладких функций на мелких участках — главный член ошибки; узкие
+#   особенности между точками начального деления могут остаться незамеченными).
+
+DEFAULT_TOLERANCE = 1e-3
+DEFAULT_MAX_POINTS = 10000
+DEFAULT_INITIAL_POINTS = 17
+# Участки короче этой доли [a, b] не делятся (разрывы, точки, где функция не определена)
+_MIN_WIDTH_FRACTION = 1e-12
+
+# Участок: (x0, y0, x1, y1, середина, значение в середине)
+Segment = Tuple[float, float, float, float, float, float]
+
+def _validate(tolerance: float, max_points: int, initial_points: int) -> None:
+    if tolerance <= 0:
+        raise ValueError("Допустимая ошибка (tolerance) должна быть положительной.")
+    if initial_points < 2:
+        raise ValueError("Количество начальных точек (initial_points) должно быть не меньше 2.")
+    if max_points < initial_points:
+        raise ValueError("Максимальное количество точек (max_points) не может быть меньше начального.")
+
+def _error_estimator(function: Callable[[float], float], coefficients: Optional[Tuple[float, ...]]):
+    """Возвращает функцию ошибки интерполяции участка (x0, y0, x1, y1, xm, ym)."""
+    if coefficients is not None:
+        second = polynomial_derivative(polynomial_derivative(coefficients))
+
+        def polynomial_error(x0: float, y0: float, x1: float, y1: float, xm: float, ym: float) -> float:
+            low, high = polynomial_bounds(second, x0, x1)
+            return (x1 - x0) ** 2 / 8 * max(abs(low), abs(high))
+        return polynomial_error
+
+    def midpoint_error(x0: float, y0: float, x1: float, y1: float, xm: float, ym: float) -> float:
+        defined = (y0 == y0) + (y1 == y1) + (ym == ym)
+        if defined == 3:
+            return abs(ym - 0.5 * (y0 + y1))
+        # Граница области определения уточняется, полностью неопределенный участок — нет
+        return math.inf if defined else 0.0
+    return midpoint_error
+
+def adaptive_points(a: float, b: float, tolerance: float = DEFAULT_TOLERANCE, func: FunctionLike = None,
+                    max_points: int = DEFAULT_MAX_POINTS,
+                    initial_points: int = DEFAULT_INITIAL_POINTS) -> Tuple[array, array, float]:
+    """
+    Расставляет точки на [a, b] так, чтобы ломаная через (x, func(x)) отличалась
+    от func (по умолчанию f) не более чем на tolerance, используя не более max_points точек.
+    Возвращает (xs, ys, error): массивы array('d') по возрастанию x и достигнутую ошибку
+    (больше tolerance, если не хватило max_points или функция разрывна).
+    Точки, в которых функция выдает исключение, в результат не входят (сообщение в stderr).
+    Исключительные ситуации:
+    - Если a > b, tolerance <= 0, initial_points < 2 или max_points < initial_points, выдает ValueError.
+    """
+    validate_range(a, b, 1.0)
+    _validate(tolerance, max_points, initial_points)
+    function = resolve_function(func, f)
+    coefficients = polynomial_coefficients(function)
+    evaluate = nan_on_error(function)
+    error_of = _error_estimator(evaluate, coefficients)
+    if a == b:
+        y = evaluate(a)
+        return array("d", [a] if y == y else []), array("d", [y] if y == y else []), 0.0
+
+    min_width = (b - a) * _MIN_WIDTH_FRACTION
+    xs = [a + (b - a) * i / (initial_points - 1) for i in range(initial_points - 1)] + [b]
+    ys = [evaluate(x) for x in xs]
+
+    def segment(x0: float, y0: float, x1: float, y1: float) -> Tuple[float, Segment]:
+        xm = 0.5 * (x0 + x1)
+        # Для многочлена значение в середине не нужно для оценки — вычисляется при делении
+        ym = evaluate(xm) if coefficients is None else math.nan
+        return error_of(x0, y0, x1, y1, xm, ym), (x0, y0, x1, y1, xm, ym)
+
+    # Куча по (-ошибка, x0): первым делится участок с наибольшей ошибкой, при равенстве — левый
+    heap = []
+    for i in range(initial_points - 1):
+        error, part = segment(xs[i], ys[i], xs[i + 1], ys[i + 1])
+        heap.append((-error, part[0], part))
+    heapq.heapify(heap)
+    done: List[Tuple[float, Segment]] = [] # Участки, которые больше не делятся
+    count = initial_points
+    while heap and count < max_points and -heap[0][0] > tolerance:
+        negative_error, _, (x0, y0, x1, y1, xm, ym) = heapq.heappop(heap)
+        if x1 - x0 <= min_width:
+            done.append((-negative_error, (x0, y0, x1, y1, xm, ym)))
+            continue
+        if coefficients is not None:
+            ym = evaluate(xm)
+        for start, start_y, stop, stop_y in ((x0, y0, xm, ym), (xm, ym, x1, y1)):
+            error, part = segment(start, start_y, stop, stop_y)
+            heapq.heappush(heap, (-error, start, part))
+        count += 1
+
+    parts = done + [(-negative_error, part) for negative_error, _, part in heap]
+    parts.sort(key=lambda item: item[1][0])
+    error = max((item[0] for item in parts), default=0.0)
+    result_x = array("d", [parts[0][1][0]])
+    result_y = array("d", [parts[0][1][1]])
+    for _, (x0, y0, x1, y1, xm, ym) in parts:
+        result_x.append(x1)
+        result_y.append(y1)
+    defined = [i for i, y in enumerate(result_y) if y == y]
+    if len(defined) < len(result_y):
+        first = next(x for x, y in zip(result_x, result_y) if y != y)
+        report_errors(len(result_y) - len(defined), first)
+        result_x = array("d", (result_x[i] for i in defined))
+        result_y = array("d", (result_y[i] for i in defined))
+    return result_x, result_y, error
+
+def generate_adaptive_values(a: float, b: float, tolerance: float = DEFAULT_TOLERANCE, func: FunctionLike = None,
+                             max_points: int = DEFAULT_MAX_POINTS,
+                             initial_points: int = DEFAULT_INITIAL_POINTS) -> Generator[Tuple[float, float], None, None]:
+    """
+    Адаптивный вариант generate_function_values: генерирует пары (x, func(x)) по возрастанию x,
+    расставленные так, чтобы ломаная через них отличалась от функции не более чем на tolerance
+    (см. adaptive_points). Точки вычисляются при первом обращении к генератору.
+    """
+    validate_range(a, b, 1.0)
+    _validate(tolerance, max_points, initial_points)
+    xs, ys, _ = adaptive_points(a, b, tolerance, func, max_points, initial_points)
+    yield from zip(xs, ys)
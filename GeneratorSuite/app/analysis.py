@@ -0,0 +1,469 @@
+import math
+import sys
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.expressions import CompiledFunction, FunctionLike, resolve_function
+from app.generators import F_COEFFICIENTS, f
+from app.grid import Grid, validate_range
+
+# --- Корни, экстремумы и пересечения уровня без полного прохода сетки ---
+#
+# Для многочленов (f по умолчанию и строки-выражения, распознанные как многочлен)
+# корни находятся в замкнутой форме (степень до 2) или отделяются между
+# корнями производной и уточняются методом Брента (степень 3 и выше),
+# а экстремумы — среди концов отрезка и корней производной.
+# Для остальных функций отрезок просматривается по samples равномерным точкам,
+# найденные смены знака уточняются методом Брента, а локальные минимумы
+# и максимумы — методом Брента для минимизации. Поэтому для них находятся только
+# корни и экстремумы, различимые на этой редкой сетке.
+#
+# Запросы grid_* отвечают так же, как полный проход generate_function_values,
+# но вычисляют функцию только в нескольких точках сетки около найденных
+# корней и экстремумов: между соседними критическими точками многочлен
+# монотонен, поэтому наименьшее и наибольшее значения на сетке достигаются
+# у концов отрезка или рядом с критическими точками.
+
+Point = Tuple[float, float]
+
+DEFAULT_SAMPLES = 1024
+DEFAULT_XTOL = 1e-12
+_MAX_ITERATIONS = 200
+_EPS = sys.float_info.epsilon
+_SQRT_EPS = math.sqrt(_EPS)
+_GOLDEN = (3 - math.sqrt(5)) / 2
+# Сколько соседних точек сетки проверяется вокруг найденной точки
+_SNAP_RADIUS = 2
+# На сколько точек назад ищется предыдущее определенное значение при поиске пересечений
+_MAX_GAP = 16
+
+def polynomial_coefficients(func: FunctionLike = None) -> Optional[Tuple[float, ...]]:
+    """
+    Возвращает коэффициенты функции от младшей степени к старшей, если она многочлен
+    (f по умолчанию, строка-выражение или CompiledFunction), иначе None.
+    """
+    if func is None or func is f:
+        return F_COEFFICIENTS
+    function = resolve_function(func, f)
+    if isinstance(function, CompiledFunction):
+        return function.coefficients
+    return None
+
+def _prepare(func: FunctionLike) -> Tuple[Callable[[float], float], Optional[Tuple[float, ...]]]:
+    function = resolve_function(func, f)
+    return function, polynomial_coefficients(function)
+
+def nan_on_error(function: Callable[[float], float]) -> Callable[[float], float]:
+    """Оборачивает function: в точках, где она выдает исключение, возвращается nan."""
+    def evaluate(x: float) -> float:
+        try:
+            return function(x)
+        except Exception:
+            return math.nan
+    return evaluate
+
+# --- Многочлены ---
+
+def _trim(coefficients: Sequence[float]) -> List[float]:
+    """Отбрасывает нулевые старшие коэффициенты."""
+    coefficients = list(coefficients)
+    while len(coefficients) > 1 and coefficients[-1] == 0:
+        coefficients.pop()
+    return coefficients
+
+def _horner(coefficients: Sequence[float], x: float) -> float:
+    value = 0.0
+    for c in reversed(coefficients):
+        value = value * x + c
+    return value
+
+def polynomial_derivative(coefficients: Sequence[float]) -> List[float]:
+    """Коэффициенты производной многочлена (от младшей степени к старшей)."""
+    return [k * c for k, c in enumerate(coefficients)][1:] or [0.0]
+
+def _quadratic_roots(c0: float, c1: float, c2: float) -> List[float]:
+    """Корни c2*x^2 + c1*x + c0 = 0 (c2 != 0) без потери точности при вычитании близких чисел."""
+    discriminant = c1 * c1 - 4 * c2 * c0
+    if discriminant < 0:
+        return []
+    if discriminant == 0:
+        return [-c1 / (2 * c2)]
+    q = -0.5 * (c1 + math.copysign(math.sqrt(discriminant), c1))
+    return sorted((q / c2, c0 / q))
+
+def _polynomial_roots(coefficients: Sequence[float], lo: float, hi: float, xtol: float) -> List[float]:
+    """
+    Корни многочлена на [lo, hi] по возрастанию. Для степени 3 и выше отрезок
+    делится корнями производной на участки монотонности, на каждом не более одного корня.
+    Тождественный ноль корней не имеет (возвращается пустой список).
+    """
+    coefficients = _trim(coefficients)
+    degree = len(coefficients) - 1
+    if degree == 0:
+        return []
+    if degree == 1:
+        root = -coefficients[0] / coefficients[1]
+        return [root] if lo <= root <= hi else []
+    if degree == 2:
+        return [root for root in _quadratic_roots(*coefficients) if lo <= root <= hi]
+
+    def p(x: float) -> float:
+        return _horner(coefficients, x)
+
+    bounds = [lo] + _polynomial_roots(polynomial_derivative(coefficients), lo, hi, xtol) + [hi]
+    roots = []
+    for left, right in zip(bounds, bounds[1:]):
+        p_left, p_right = p(left), p(right)
+        if p_left == 0:
+            roots.append(left)
+        elif (p_left < 0) != (p_right < 0) and p_right != 0:
+            roots.append(_brent_root(p, left, right, p_left, p_right, xtol))
+    if p(hi) == 0:
+        roots.append(hi)
+    return sorted(set(roots))
+
+def polynomial_bounds(coefficients: Sequence[float], lo: float, hi: float) -> Tuple[float, float]:
+    """Наименьшее и наибольшее значения многочлена (коэффициенты от младшей степени) на [lo, hi]."""
+    points = [lo, hi] + _polynomial_roots(polynomial_derivative(coefficients), lo, hi, DEFAULT_XTOL)
+    values = [_horner(coefficients, x) for x in points]
+    return min(values), max(values)
+
+# --- Методы Брента ---
+
+def _brent_root(function: Callable[[float], float], a: float, b: float, fa: float, fb: float,
+                xtol: float) -> float:
+    """Корень function на [a, b] при разных знаках fa = function(a) и fb = function(b) (метод Брента)."""
+    c, fc = b, fb
+    d = e = b - a
+    for _ in range(_MAX_ITERATIONS):
+        if (fb > 0) == (fc > 0):
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol = 2 * _EPS * abs(b) + 0.5 * xtol
+        middle = 0.5 * (c - b)
+        if abs(middle) <= tol or fb == 0:
+            return b
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            # Обратная квадратичная интерполяция (или метод секущих)
+            s = fb / fa
+            if a == c:
+                p = 2 * middle * s
+                q = 1 - s
+            else:
+                q = fa / fc
+                r = fb / fc
+                p = s * (2 * middle * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * middle * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = middle
+        else:
+            # Бисекция
+            d = e = middle
+        a, fa = b, fb
+        b += d if abs(d) > tol else math.copysign(tol, middle)
+        fb = function(b)
+    return b
+
+def _brent_minimum(function: Callable[[float], float], lo: float, hi: float, xtol: float) -> float:
+    """Точка локального минимума function на [lo, hi] (метод Брента: золотое сечение и параболы)."""
+    x = w = v = lo + _GOLDEN * (hi - lo)
+    fx = fw = fv = function(x)
+    d = e = 0.0
+    for _ in range(_MAX_ITERATIONS):
+        middle = 0.5 * (lo + hi)
+        tol1 = _SQRT_EPS * abs(x) + xtol / 3
+        tol2 = 2 * tol1
+        if abs(x - middle) <= tol2 - 0.5 * (hi - lo):
+            break
+        golden_step = True
+        if abs(e) > tol1:
+            # Парабола через x, w, v
+            r = (x - w) * (fx - fv)
+            q = (x - v) * (fx - fw)
+            p = (x - v) * q - (x - w) * r
+            q = 2 * (q - r)
+            if q > 0:
+                p = -p
+            q = abs(q)
+            previous_e, e = e, d
+            if abs(p) < abs(0.5 * q * previous_e) and q * (lo - x) < p < q * (hi - x):
+                d = p / q
+                u = x + d
+                if u - lo < tol2 or hi - u < tol2:
+                    d = math.copysign(tol1, middle - x)
+                golden_step = False
+        if golden_step:
+            e = (lo - x) if x >= middle else (hi - x)
+            d = _GOLDEN * e
+        u = x + d if abs(d) >= tol1 else x + math.copysign(tol1, d)
+        fu = function(u)
+        if fu <= fx:
+            if u >= x:
+                lo = x
+            else:
+                hi = x
+            v, w, x = w, x, u
+            fv, fw, fx = fw, fx, fu
+        else:
+            if u < x:
+                lo = u
+            else:
+                hi = u
+            if fu <= fw or w == x:
+                v, w = w, u
+                fv, fw = fw, fu
+            elif fu <= fv or v == x or v == w:
+                v, fv = u, fu
+    return x
+
+# --- Произвольные функции ---
+
+def _sample(function: Callable[[float], float], a: float, b: float, samples: int) -> Tuple[List[float], List[float]]:
+    if samples < 2:
+        raise ValueError("Количество точек просмотра (samples) должно быть не меньше 2.")
+    xs = [a + (b - a) * i / (samples - 1) for i in range(samples)] if b > a else [a]
+    return xs, [function(x) for x in xs]
+
+def _sign_changes(function: Callable[[float], float], a: float, b: float, level: float,
+                  samples: int, xtol: float, keep_poles: bool) -> List[float]:
+    """
+    Уточненные точки смены знака function(x) - level между samples равномерными точками,
+    в том числе между границей области определения и ближайшей определенной точкой просмотра.
+    Смена знака через разрыв (например, 1/x в нуле) тоже сходится к точке разрыва;
+    если keep_poles ложно, такие точки отбрасываются: значение в них не меньше по модулю,
+    чем на концах участка. Если keep_poles истинно, в результат входят и сами границы
+    области определения.
+    """
+    def shifted(x: float) -> float:
+        return function(x) - level
+
+    def refine(x0: float, x1: float, y0: float, y1: float) -> None:
+        if y0 * y1 < 0: # nan и нули не проходят проверку
+            root = _brent_root(shifted, x0, x1, y0, y1, xtol)
+            if keep_poles or abs(shifted(root)) < min(abs(y0), abs(y1)):
+                roots.append(root)
+
+    xs, ys = _sample(shifted, a, b, samples)
+    roots = [x for x, y in zip(xs, ys) if y == 0]
+    for i in range(len(xs) - 1):
+        refine(xs[i], xs[i + 1], ys[i], ys[i + 1])
+    for edge, defined in _domain_edges(shifted, xs, ys, xtol):
+        edge_y = shifted(edge)
+        if keep_poles or edge_y == 0:
+            roots.append(edge)
+        refine(edge, defined, edge_y, shifted(defined))
+    return sorted(roots)
+
+def _domain_edge(function: Callable[[float], float], defined: float, undefined: float, xtol: float) -> float:
+    """Бисекцией находит границу области определения между defined и undefined (со стороны defined)."""
+    for _ in range(_MAX_ITERATIONS):
+        if abs(undefined - defined) <= xtol:
+            break
+        middle = 0.5 * (defined + undefined)
+        if function(middle) == function(middle):
+            defined = middle
+        else:
+            undefined = middle
+    return defined
+
+def _domain_edges(function: Callable[[float], float], xs: Sequence[float], ys: Sequence[float],
+                  xtol: float) -> List[Tuple[float, float]]:
+    """
+    Границы области определения между соседними точками просмотра xs (ys — значения в них):
+    пары (уточненная граница, определенная точка просмотра рядом с ней).
+    """
+    edges = []
+    for i in range(len(xs) - 1):
+        left_defined, right_defined = ys[i] == ys[i], ys[i + 1] == ys[i + 1]
+        if left_defined != right_defined:
+            defined, undefined = (xs[i], xs[i + 1]) if left_defined else (xs[i + 1], xs[i])
+            edges.append((_domain_edge(function, defined, undefined, xtol), defined))
+    return edges
+
+def _sampled_minima(function: Callable[[float], float], a: float, b: float,
+                    samples: int, xtol: float) -> List[float]:
+    """
+    Концы отрезка, уточненные локальные минимумы, видимые на samples точках,
+    и границы области определения (около них значения могут быть наименьшими, как у log(x)).
+    """
+    xs, ys = _sample(function, a, b, samples)
+    candidates = [a, b]
+    for i in range(1, len(xs) - 1):
+        if ys[i] < ys[i - 1] and ys[i] <= ys[i + 1]:
+            candidates.append(_brent_minimum(function, xs[i - 1], xs[i + 1], xtol))
+    candidates.extend(edge for edge, _ in _domain_edges(function, xs, ys, xtol))
+    return candidates
+
+def _critical_points(function: Callable[[float], float], coefficients: Optional[Tuple[float, ...]],
+                     a: float, b: float, samples: int, xtol: float, sign: float) -> List[float]:
+    """
+    Точки-кандидаты на минимум (sign = 1) или максимум (sign = -1) на [a, b]:
+    концы отрезка и корни производной (для многочлена) или уточненные локальные экстремумы.
+    """
+    if coefficients is not None:
+        return [a, b] + _polynomial_roots(polynomial_derivative(coefficients), a, b, xtol)
+    return _sampled_minima(lambda x: sign * function(x), a, b, samples, xtol)
+
+def _best(points: Iterable[Point], sign: float) -> Optional[Point]:
+    """Точка с наименьшим (sign = 1) или наибольшим (sign = -1) значением, первая из равных; nan пропускаются."""
+    best = None
+    for x, y in points:
+        if y == y and (best is None or sign * y < sign * best[1]):
+            best = (x, y)
+    return best
+
+# --- Запросы ---
+
+def find_roots(a: float, b: float, func: FunctionLike = None, level: float = 0.0,
+               step: Optional[float] = None, samples: int = DEFAULT_SAMPLES,
+               xtol: float = DEFAULT_XTOL) -> List[float]:
+    """
+    Возвращает по возрастанию точки x на [a, b], где func(x) = level (func по умолчанию f).
+    Если задан step, корни заменяются ближайшими точками сетки a + i * step (без повторов).
+    Для функций, не являющихся многочленом, находятся корни со сменой знака,
+    различимые на samples равномерных точках.
+    Исключительные ситуации:
+    - Если a > b или step <= 0, выдает ValueError.
+    """
+    validate_range(a, b, step if step is not None else 1.0)
+    function, coefficients = _prepare(func)
+    if coefficients is not None:
+        shifted = list(coefficients)
+        shifted[0] -= level
+        roots = _polynomial_roots(shifted, a, b, xtol)
+    else:
+        roots = _sign_changes(nan_on_error(function), a, b, level, samples, xtol, keep_poles=False)
+    if step is None:
+        return roots
+    grid = Grid(a, b, step)
+    return sorted({grid.x(_nearest_index(grid, root)) for root in roots})
+
+def find_minimum(a: float, b: float, func: FunctionLike = None, samples: int = DEFAULT_SAMPLES,
+                 xtol: float = DEFAULT_XTOL) -> Optional[Point]:
+    """
+    Возвращает (x, func(x)) — наименьшее значение func (по умолчанию f) на отрезке [a, b]
+    (None, если функция нигде не определена).
+    Исключительные ситуации:
+    - Если a > b, выдает ValueError.
+    """
+    return _find_extremum(a, b, func, samples, xtol, 1.0)
+
+def find_maximum(a: float, b: float, func: FunctionLike = None, samples: int = DEFAULT_SAMPLES,
+                 xtol: float = DEFAULT_XTOL) -> Optional[Point]:
+    """Как find_minimum, но возвращает наибольшее значение."""
+    return _find_extremum(a, b, func, samples, xtol, -1.0)
+
+def _find_extremum(a: float, b: float, func: FunctionLike, samples: int, xtol: float, sign: float) -> Optional[Point]:
+    validate_range(a, b, 1.0)
+    function, coefficients = _prepare(func)
+    evaluate = nan_on_error(function)
+    candidates = _critical_points(evaluate, coefficients, a, b, samples, xtol, sign)
+    return _best(((x, evaluate(x)) for x in sorted(candidates)), sign)
+
+# --- Запросы на сетке ---
+
+def _nearest_index(grid: Grid, x: float) -> int:
+    return min(len(grid) - 1, max(0, round((x - grid.a) / grid.step)))
+
+def _neighbour_indices(grid: Grid, points: Iterable[float]) -> List[int]:
+    """Номера точек сетки в радиусе _SNAP_RADIUS вокруг каждой из points, по возрастанию."""
+    indices = set()
+    last = len(grid) - 1
+    for x in points:
+        center = _nearest_index(grid, x)
+        indices.update(range(max(0, center - _SNAP_RADIUS), min(last, center + _SNAP_RADIUS) + 1))
+    return sorted(indices)
+
+def _small_grid(grid: Grid, samples: int) -> bool:
+    # Сетку не длиннее samples дешевле пройти целиком: ответ точный для любой функции
+    return len(grid) <= samples
+
+def grid_minimum(a: float, b: float, step: float = 0.01, func: FunctionLike = None,
+                 samples: int = DEFAULT_SAMPLES) -> Optional[Point]:
+    """
+    Возвращает (x, y) — точку сетки a + i * step с наименьшим значением func (по умолчанию f),
+    как min по проходу generate_function_values (первую из равных), но вычисляя функцию
+    только около концов отрезка и экстремумов. None, если функция не определена ни в одной точке.
+    Исключительные ситуации:
+    - Если step <= 0 или a > b, выдает ValueError.
+    """
+    return _grid_extremum(a, b, step, func, samples, 1.0)
+
+def grid_maximum(a: float, b: float, step: float = 0.01, func: FunctionLike = None,
+                 samples: int = DEFAULT_SAMPLES) -> Optional[Point]:
+    """Как grid_minimum, но возвращает точку сетки с наибольшим значением."""
+    return _grid_extremum(a, b, step, func, samples, -1.0)
+
+def _grid_extremum(a: float, b: float, step: float, func: FunctionLike, samples: int, sign: float) -> Optional[Point]:
+    grid = Grid(a, b, step)
+    function, coefficients = _prepare(func)
+    evaluate = nan_on_error(function)
+    if coefficients is None and _small_grid(grid, samples):
+        indices: Iterable[int] = range(len(grid))
+    else:
+        indices = _neighbour_indices(grid, _critical_points(evaluate, coefficients, grid.a, grid.x(len(grid) - 1),
+                                                             samples, DEFAULT_XTOL, sign))
+    return _best(((grid.x(i), evaluate(grid.x(i))) for i in indices), sign)
+
+def threshold_crossings(a: float, b: float, step: float = 0.01, func: FunctionLike = None, level: float = 0.0,
+                        samples: int = DEFAULT_SAMPLES) -> List[float]:
+    """
+    Возвращает точки сетки a + i * step, в которых func (по умолчанию f) пересекает уровень level:
+    x_i, для которых значения в x_(i-1) и x_i лежат по разные стороны от level
+    (значение, равное level, считается лежащим не ниже). Совпадает с проходом по всей
+    сетке, но функция вычисляется только около корней func(x) = level, разрывов и границ
+    области определения. Для функций, не являющихся многочленом, на сетке длиннее samples
+    находятся пересечения, различимые на samples равномерных точках (как в find_roots).
+    Точки, где функция не определена, пропускаются: значение сравнивается с ближайшим
+    определенным значением слева (не дальше _MAX_GAP точек).
+    Исключительные ситуации:
+    - Если step <= 0 или a > b, выдает ValueError.
+    """
+    grid = Grid(a, b, step)
+    function, coefficients = _prepare(func)
+    evaluate = nan_on_error(function)
+    if len(grid) < 2:
+        return []
+    if coefficients is None and _small_grid(grid, samples):
+        indices: Iterable[int] = range(len(grid))
+    else:
+        last = grid.x(len(grid) - 1)
+        if coefficients is not None:
+            shifted = list(coefficients)
+            shifted[0] -= level
+            roots = _polynomial_roots(shifted, grid.a, last, DEFAULT_XTOL)
+        else:
+            # Пересечение возможно и через разрыв или пропуск в области определения,
+            # поэтому точки разрыва и границы области определения тоже проверяются
+            roots = _sign_changes(evaluate, grid.a, last, level, samples, DEFAULT_XTOL, keep_poles=True)
+        indices = _neighbour_indices(grid, roots)
+    values: Dict[int, float] = {}
+
+    def value(i: int) -> float:
+        if i not in values:
+            values[i] = evaluate(grid.x(i))
+        return values[i]
+
+    def previous_value(i: int) -> float:
+        # Как при проходе, пропускающем точки с ошибками: ближайшее определенное значение слева
+        for j in range(i - 1, max(-1, i - 1 - _MAX_GAP), -1):
+            if value(j) == value(j):
+                return values[j]
+        return math.nan
+
+    crossings = []
+    for i in indices:
+        current = value(i)
+        if i == 0 or current != current:
+            continue
+        previous = previous_value(i)
+        if previous == previous and (previous < level) != (current < level):
+            crossings.append(grid.x(i))
+    return crossings
@@ -0,0 +1,124 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any, AsyncGenerator, Callable, Deque, Iterable, List, Optional, Tuple, TypeVar
+
+from app.combinations import ASCII_LOWERCASE, CombinationSpace
+from app.expressions import FunctionLike
+from app.grid import Grid
+from app.main_multithread import compute_shard, split_into_shards
+
+# --- Асинхронные варианты генераторов для asyncio ---
+#
+# Работа делится на блоки (chunk), каждый блок вычисляется на executor
+# (по умолчанию — пул потоков цикла событий, можно передать ProcessPoolExecutor),
+# поэтому цикл событий не блокируется. Вперед вычисляется не более prefetch
+# блоков, результаты выдаются в исходном порядке через async for и совпадают
+# с синхронными генераторами. Отмена кооперативная: при отмене задачи-потребителя
+# или aclose() еще не начатые блоки отменяются, а уже выполняющиеся
+# досчитываются в фоне и отбрасываются.
+
+DEFAULT_CHUNK_SIZE = 4096
+DEFAULT_PREFETCH = 4
+
+T = TypeVar("T")
+
+def _validate(chunk_size: int, prefetch: int) -> None:
+    if chunk_size <= 0:
+        raise ValueError("Размер блока (chunk_size) должен быть положительным.")
+    if prefetch <= 0:
+        raise ValueError("Глубина предвыборки (prefetch) должна быть положительной.")
+
+async def _iter_chunks(function: Callable[..., List[T]], calls: Iterable[Tuple[Any, ...]],
+                       executor: Optional[Executor], prefetch: int) -> AsyncGenerator[T, None]:
+    """
+    Выполняет function(*args) для каждого набора аргументов из calls на executor,
+    держа в работе не более prefetch блоков, и выдает элементы блоков по порядку.
+    """
+    loop = asyncio.get_running_loop()
+    calls = iter(calls)
+    pending: Deque[asyncio.Future] = deque()
+
+    def submit_next() -> None:
+        args = next(calls, None)
+        if args is not None:
+            pending.append(loop.run_in_executor(executor, function, *args))
+
+    for _ in range(prefetch):
+        submit_next()
+    try:
+        while pending:
+            chunk = await pending.popleft()
+            submit_next()
+            for item in chunk:
+                yield item
+    finally:
+        for future in pending:
+            future.cancel()
+
+# --- Задание 1 ---
+
+def combination_chunk(alphabet: str, k: int, start: int, stop: int) -> List[str]:
+    """
+    Возвращает слова с номерами [start, stop) пространства CombinationSpace(alphabet, k).
+    Объявлена на уровне модуля, поэтому подходит и для ProcessPoolExecutor.
+    """
+    return list(CombinationSpace(alphabet, k).iter_from(start, stop))
+
+async def agenerate_two_letter_combinations(chunk_size: int = DEFAULT_CHUNK_SIZE,
+                                            executor: Optional[Executor] = None,
+                                            prefetch: int = DEFAULT_PREFETCH) -> AsyncGenerator[str, None]:
+    """
+    Асинхронный вариант generate_two_letter_combinations: async for по всем
+    сочетаниям из двух малых латинских букв.
+    Исключительные ситуации:
+    - Если chunk_size <= 0 или prefetch <= 0, выдает ValueError.
+    """
+    _validate(chunk_size, prefetch)
+    space = CombinationSpace(ASCII_LOWERCASE, 2)
+    calls = ((ASCII_LOWERCASE, 2, shard.start, shard.stop) for shard in split_into_shards(len(space), chunk_size))
+    async for combination in _iter_chunks(combination_chunk, calls, executor, prefetch):
+        yield combination
+
+# --- Задание 2 ---
+
+async def agenerate_function_values(a: float, b: float, step: float = 0.01, func: FunctionLike = None,
+                                    chunk_size: int = DEFAULT_CHUNK_SIZE, executor: Optional[Executor] = None,
+                                    prefetch: int = DEFAULT_PREFETCH) -> AsyncGenerator[float, None]:
+    """
+    Асинхронный вариант generate_function_values: значения func (по умолчанию f)
+    на [a, b] с шагом step, блоки по chunk_size точек вычисляются на executor.
+    Для ProcessPoolExecutor func должна передаваться между процессами
+    (строка-выражение, CompiledFunction или функция уровня модуля).
+    Исключительные ситуации:
+    - Если step <= 0, a > b, chunk_size <= 0 или prefetch <= 0, выдает ValueError.
+    - Точки, в которых функция выдает исключение, пропускаются (с сообщением в stderr).
+    """
+    _validate(chunk_size, prefetch)
+    grid = Grid(a, b, step)
+    calls = ((a, b, step, shard.start, shard.stop, func) for shard in split_into_shards(len(grid), chunk_size))
+    async for value in _iter_chunks(compute_shard, calls, executor, prefetch):
+        yield value
+
+# --- Задание 3 ---
+
+def filter_chunk(cities: List[str], min_length: int) -> List[str]:
+    """Возвращает названия из блока cities длиной более min_length (подходит для ProcessPoolExecutor)."""
+    return [city for city in cities if len(city) > min_length]
+
+async def afilter_cities_by_length(city_string: str, min_length: int = 5,
+                                   chunk_size: int = DEFAULT_CHUNK_SIZE, executor: Optional[Executor] = None,
+                                   prefetch: int = DEFAULT_PREFETCH) -> AsyncGenerator[str, None]:
+    """
+    Асинхронный вариант filter_cities_by_length: названия городов из city_string
+    длиной более min_length; названия проверяются блоками по chunk_size на executor.
+    Исключительные ситуации:
+    - Если min_length < 0, chunk_size <= 0 или prefetch <= 0, выдает ValueError.
+    """
+    if min_length < 0:
+        raise ValueError("Минимальная длина (min_length) не может быть отрицательной.")
+    _validate(chunk_size, prefetch)
+    cities = city_string.split()
+    calls = ((cities[start:start + chunk_size], min_length) for start in range(0, len(cities), chunk_size))
+    async for city in _iter_chunks(filter_chunk, calls, executor, prefetch):
+        yield city
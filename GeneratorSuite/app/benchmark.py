@@ -0,0 +1,405 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.async_generators import combination_chunk, filter_chunk
+from app.city_filter import filter_cities_by_length, filter_cities_from_file
+from app.city_index import CityIndex
+from app.combinations import ASCII_LOWERCASE, CombinationSpace
+from app.generators import DEFAULT_BATCH_SIZE, generate_function_value_batches, generate_function_values
+from app.grid import point_count
+from app.main_multithread import (
+    ShardedSweepExecutor, compute_shard, filter_cities_parallel, iter_ordered, split_into_shards
+)
+
+# --- Сравнение режимов выполнения для задач 1-3 ---
+#
+# Каждый случай (задача, режим, размер входа, число воркеров) запускается
+# repeat раз; в отчет попадают лучшее и медианное время, пропускная способность
+# (элементов в секунду), время на элемент, пиковая память (RSS) и ускорение
+# относительно синхронного режима той же задачи и размера. По умолчанию каждый
+# случай выполняется в отдельном процессе, чтобы пиковая память и прогретые
+# кэши одного случая не влияли на другие. Результаты записываются в JSON;
+# --baseline сравнивает их с прошлым запуском и сообщает о регрессиях.
+#
+# Запуск: python -m app.benchmark --sizes 10000,100000 --workers 1,2,4 --output benchmark.json
+
+FORMAT_VERSION = 1
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+DEFAULT_REPEAT = 3
+DEFAULT_TOLERANCE = 0.2
+
+# Длина слов в задаче 1: 26^5 слов хватает для любого размера входа
+COMBINATION_K = 5
+FUNCTION_STEP = 0.01
+CITY_MIN_LENGTH = 5
+_CITY_LETTERS = "абвгдежзийклмнопрстуфхцчшщыэюя"
+
+# --- Задание 1 ---
+
+def _combinations_setup(size: int, workdir: str) -> int:
+    return size
+
+def _combinations_sync(size: int, workers: int) -> int:
+    return sum(1 for _ in CombinationSpace(ASCII_LOWERCASE, COMBINATION_K).iter_from(0, size))
+
+def _combinations_batched(size: int, workers: int) -> int:
+    space = CombinationSpace(ASCII_LOWERCASE, COMBINATION_K)
+    return sum(len(batch) for batch in space.iter_batches(DEFAULT_BATCH_SIZE, 0, size))
+
+def _combination_calls(size: int, workers: int):
+    shard_size = max(1, -(-size // (4 * workers)))
+    return ((ASCII_LOWERCASE, COMBINATION_K, shard.start, shard.stop)
+            for shard in split_into_shards(size, shard_size))
+
+def _combinations_threaded(size: int, workers: int) -> int:
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        chunks = iter_ordered(executor, combination_chunk, _combination_calls(size, workers), 2 * workers)
+        return sum(len(chunk) for chunk in chunks)
+
+def _combinations_multiprocess(size: int, workers: int) -> int:
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunks = iter_ordered(executor, combination_chunk, _combination_calls(size, workers), 2 * workers)
+        return sum(len(chunk) for chunk in chunks)
+
+# --- Задание 2 ---
+
+def _function_values_setup(size: int, workdir: str) -> Tuple[float, float, float]:
+    a = -size * FUNCTION_STEP / 2
+    return a, a + (size - 1) * FUNCTION_STEP, FUNCTION_STEP
+
+def _function_values_sync(sweep: Tuple[float, float, float], workers: int) -> int:
+    return sum(1 for _ in generate_function_values(*sweep))
+
+def _function_values_batched(sweep: Tuple[float, float, float], workers: int) -> int:
+    return sum(len(batch) for batch in generate_function_value_batches(*sweep))
+
+def _function_values_threaded(sweep: Tuple[float, float, float], workers: int) -> int:
+    a, b, step = sweep
+    count = point_count(*sweep)
+    shards = split_into_shards(count, max(1, -(-count // (4 * workers))))
+    calls = ((a, b, step, shard.start, shard.stop, None) for shard in shards)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return sum(len(chunk) for chunk in iter_ordered(executor, compute_shard, calls, 2 * workers))
+
+def _function_values_multiprocess(sweep: Tuple[float, float, float], workers: int) -> int:
+    count = point_count(*sweep)
+    with ShardedSweepExecutor(max_workers=workers, shard_size=max(1, -(-count // (4 * workers)))) as executor:
+        return sum(len(chunk) for chunk in executor.iter_shards(*sweep))
+
+def _function_values_vectorized(sweep: Tuple[float, float, float], workers: int) -> int:
+    from app.vectorized import function_values_array
+    return len(function_values_array(*sweep))
+
+# --- Задание 3 ---
+
+def _cities_setup(size: int, workdir: str) -> Tuple[str, str]:
+    """Создает size случайных названий (воспроизводимо) и записывает их в файл."""
+    rng = random.Random(size)
+    text = " ".join("".join(rng.choices(_CITY_LETTERS, k=rng.randint(3, 12))).capitalize()
+                    for _ in range(size))
+    path = os.path.join(workdir, f"cities_{size}.txt")
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(text)
+    return path, text
+
+def _cities_sync(data: Tuple[str, str], workers: int) -> int:
+    return sum(1 for _ in filter_cities_by_length(data[1], CITY_MIN_LENGTH))
+
+def _cities_stream(data: Tuple[str, str], workers: int) -> int:
+    return sum(1 for _ in filter_cities_from_file(data[0], CITY_MIN_LENGTH))
+
+def _cities_index(data: Tuple[str, str], workers: int) -> int:
+    return len(CityIndex.from_string(data[1]).longer_than(CITY_MIN_LENGTH))
+
+def _cities_threaded(data: Tuple[str, str], workers: int) -> int:
+    cities = data[1].split()
+    chunk_size = max(1, -(-len(cities) // (4 * workers)))
+    calls = ((cities[start:start + chunk_size], CITY_MIN_LENGTH) for start in range(0, len(cities), chunk_size))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return sum(len(chunk) for chunk in iter_ordered(executor, filter_chunk, calls, 2 * workers))
+
+def _cities_multiprocess(data: Tuple[str, str], workers: int) -> int:
+    return sum(1 for _ in filter_cities_parallel(data[0], CITY_MIN_LENGTH, max_workers=workers))
+
+# Задача -> (подготовка данных, {режим: функция}); подготовка не входит в замер
+CASES: Dict[str, Tuple[Callable[[int, str], Any], Dict[str, Callable[[Any, int], int]]]] = {
+    "combinations": (_combinations_setup, {
+        "sync": _combinations_sync,
+        "batched": _combinations_batched,
+        "threaded": _combinations_threaded,
+        "multiprocess": _combinations_multiprocess,
+    }),
+    "function_values": (_function_values_setup, {
+        "sync": _function_values_sync,
+        "batched": _function_values_batched,
+        "threaded": _function_values_threaded,
+        "multiprocess": _function_values_multiprocess,
+        "vectorized": _function_values_vectorized,
+    }),
+    "cities": (_cities_setup, {
+        "sync": _cities_sync,
+        "stream": _cities_stream,
+        "index": _cities_index,
+        "threaded": _cities_threaded,
+        "multiprocess": _cities_multiprocess,
+    }),
+}
+
+# Режимы, которые запускаются для каждого числа воркеров
+PARALLEL_MODES = ("threaded", "multiprocess")
+
+def _numpy_available() -> bool:
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def peak_rss_kb() -> Optional[int]:
+    """
+    Возвращает пиковый объем памяти (RSS) текущего процесса и его дочерних процессов в КБ
+    или None, если платформа не поддерживает модуль resource.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    scale = 1024 if sys.platform == "darwin" else 1 # macOS возвращает байты
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss // scale
+    return max(own, children)
+
+def run_case(task: str, mode: str, size: int, workers: int = 1, repeat: int = DEFAULT_REPEAT) -> Dict[str, Any]:
+    """
+    Выполняет один случай repeat раз и возвращает его метрики.
+    Исключительные ситуации:
+    - Если задача или режим неизвестны, выдает ValueError.
+    """
+    if task not in CASES or mode not in CASES[task][1]:
+        raise ValueError(f"Неизвестный случай: {task}/{mode}")
+    if size <= 0 or workers <= 0 or repeat <= 0:
+        raise ValueError("Размер входа, число воркеров и повторов должны быть положительными.")
+    setup, modes = CASES[task]
+    workdir = tempfile.mkdtemp(prefix="generator_suite_bench_")
+    try:
+        data = setup(size, workdir)
+        times = []
+        items = 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            items = modes[mode](data, workers)
+            times.append(time.perf_counter() - started)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    best = min(times)
+    return {
+        "task": task,
+        "mode": mode,
+        "size": size,
+        "workers": workers,
+        "items": items,
+        "repeat": repeat,
+        "best_s": best,
+        "median_s": statistics.median(times),
+        "throughput_per_s": items / best if best > 0 else None,
+        "ns_per_item": best / items * 1e9 if items else None,
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+def _case_key(result: Dict[str, Any]) -> Tuple[str, str, int, int]:
+    return result["task"], result["mode"], result["size"], result["workers"]
+
+def _add_speedup(result: Dict[str, Any], sync_times: Dict[Tuple[str, int], float]) -> None:
+    """Добавляет ускорение относительно режима sync той же задачи и размера (sync выполняется первым)."""
+    if result["mode"] == "sync":
+        sync_times[result["task"], result["size"]] = result["best_s"]
+    sync_time = sync_times.get((result["task"], result["size"]))
+    result["speedup"] = sync_time / result["best_s"] if sync_time and result["best_s"] > 0 else None
+
+def run_benchmarks(tasks: Sequence[str] = tuple(CASES), sizes: Sequence[int] = DEFAULT_SIZES,
+                   workers: Sequence[int] = (1,), repeat: int = DEFAULT_REPEAT, isolate: bool = True,
+                   modes: Optional[Sequence[str]] = None,
+                   progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Выполняет все случаи для задач tasks, размеров sizes и чисел воркеров workers
+    (параллельные режимы запускаются для каждого числа воркеров, остальные — один раз).
+    modes ограничивает набор режимов. При isolate=True каждый случай выполняется в отдельном процессе.
+    Возвращает отчет {"meta": ..., "results": [...]}.
+    """
+    cases = []
+    for task in tasks:
+        if task not in CASES:
+            raise ValueError(f"Неизвестная задача: {task}")
+        for mode in CASES[task][1]:
+            if modes is not None and mode not in modes:
+                continue
+            if mode == "vectorized" and not _numpy_available():
+                continue
+            for size in sizes:
+                for count in (workers if mode in PARALLEL_MODES else (1,)):
+                    cases.append((task, mode, size, count, repeat))
+
+    results = []
+    sync_times: Dict[Tuple[str, int], float] = {}
+    for case in cases:
+        if isolate:
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+                result = executor.submit(run_case, *case).result()
+        else:
+            result = run_case(*case)
+        _add_speedup(result, sync_times)
+        results.append(result)
+        if progress is not None:
+            progress(result)
+    return {"meta": _environment(isolate), "results": results}
+
+def _environment(isolate: bool) -> Dict[str, Any]:
+    numpy_version = None
+    if _numpy_available():
+        import numpy
+        numpy_version = numpy.__version__
+    return {
+        "format_version": FORMAT_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": numpy_version,
+        "isolated": isolate,
+    }
+
+# --- Время запуска ---
+#
+# Время импорта точек входа измеряется через python -X importtime в отдельном
+# процессе (так ни один модуль не загружен заранее). --startup добавляет его
+# в отчет, и при сравнении с прошлым отчетом рост времени тоже считается регрессией.
+
+STARTUP_MODULES = ("main", "ui.main_window")
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def import_profile(module: str, python: str = sys.executable) -> Dict[str, Any]:
+    """
+    Импортирует module в отдельном процессе с -X importtime и возвращает
+    {"module", "total_us", "modules": {имя модуля: накопленное время импорта, мкс}}.
+    Исключительные ситуации:
+    - Если импорт не удался, выдает subprocess.CalledProcessError.
+    """
+    completed = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"], cwd=_PROJECT_ROOT,
+                               capture_output=True, text=True, encoding="utf-8", check=True)
+    modules = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit(): # Строка заголовка
+            continue
+        modules[fields[2].strip()] = int(fields[1])
+    return {"module": module, "total_us": modules.get(module), "modules": modules}
+
+def measure_startup(modules: Sequence[str] = STARTUP_MODULES, repeat: int = DEFAULT_REPEAT) -> List[Dict[str, Any]]:
+    """Возвращает лучшее из repeat время импорта каждого модуля (модули, которые не импортируются, пропускаются)."""
+    results = []
+    for module in modules:
+        try:
+            profiles = [import_profile(module) for _ in range(repeat)]
+        except subprocess.CalledProcessError:
+            continue
+        best = min(profiles, key=lambda profile: profile["total_us"])
+        results.append({"module": module, "total_us": best["total_us"], "imported": sorted(best["modules"])})
+    return results
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Сравнивает пропускную способность с прошлым отчетом baseline.
+    Возвращает описания случаев, где она упала более чем на долю tolerance.
+    """
+    previous = {_case_key(r): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in current["results"]:
+        old = previous.get(_case_key(result))
+        if not old or not old.get("throughput_per_s") or not result.get("throughput_per_s"):
+            continue
+        ratio = result["throughput_per_s"] / old["throughput_per_s"]
+        if ratio < 1 - tolerance:
+            task, mode, size, workers = _case_key(result)
+            regressions.append(f"{task}/{mode} size={size} workers={workers}: "
+                               f"{old['throughput_per_s']:.0f} -> {result['throughput_per_s']:.0f} эл./с "
+                               f"({(1 - ratio) * 100:.0f}% медленнее)")
+    previous_startup = {r["module"]: r for r in baseline.get("startup", [])}
+    for result in current.get("startup", []):
+        old = previous_startup.get(result["module"])
+        if old and old["total_us"] and result["total_us"] > old["total_us"] * (1 + tolerance):
+            regressions.append(f"импорт {result['module']}: {old['total_us'] / 1000:.1f} -> "
+                               f"{result['total_us'] / 1000:.1f} мс")
+    return regressions
+
+def format_result(result: Dict[str, Any]) -> str:
+    """Строка отчета для одного случая."""
+    rss = result["peak_rss_kb"]
+    speedup = result.get("speedup")
+    return (f"{result['task']:<16}{result['mode']:<14}{result['size']:>10}{result['workers']:>4}"
+            f"{result['best_s']:>10.4f} с{result['throughput_per_s'] or 0:>14.0f} эл./с"
+            f"{result['ns_per_item'] or 0:>10.1f} нс/эл."
+            f"{(rss / 1024 if rss is not None else float('nan')):>9.1f} МБ"
+            + (f"{speedup:>7.2f}x" if speedup is not None else ""))
+
+def _int_list(text: str) -> List[int]:
+    return [int(part) for part in text.split(",") if part]
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Сравнение режимов выполнения задач 1-3.")
+    parser.add_argument("--tasks", default=",".join(CASES), help="задачи через запятую")
+    parser.add_argument("--modes", default=None, help="режимы через запятую (по умолчанию все)")
+    parser.add_argument("--sizes", type=_int_list, default=list(DEFAULT_SIZES), help="размеры входа через запятую")
+    parser.add_argument("--workers", type=_int_list, default=None,
+                        help="числа воркеров через запятую (по умолчанию 1 и число ядер)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="количество повторов каждого случая")
+    parser.add_argument("--output", default="benchmark.json", help="файл для результатов в JSON")
+    parser.add_argument("--baseline", default=None, help="прошлый отчет для поиска регрессий")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="допустимое падение пропускной способности (доля)")
+    parser.add_argument("--no-isolate", action="store_true", help="выполнять все случаи в одном процессе")
+    parser.add_argument("--startup", action="store_true",
+                        help="также измерить время импорта точек входа (-X importtime)")
+    args = parser.parse_args(argv)
+
+    workers = args.workers or sorted({1, os.cpu_count() or 1})
+    report = run_benchmarks(tasks=args.tasks.split(","), sizes=args.sizes, workers=workers,
+                            repeat=args.repeat, isolate=not args.no_isolate,
+                            modes=args.modes.split(",") if args.modes else None,
+                            progress=lambda result: print(format_result(result), flush=True))
+    if args.startup:
+        report["startup"] = measure_startup(repeat=args.repeat)
+        for result in report["startup"]:
+            print(f"Импорт {result['module']}: {result['total_us'] / 1000:.1f} мс, "
+                  f"модулей: {len(result['imported'])}")
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    print(f"Результаты записаны в {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare_results(json.load(file), report, args.tolerance)
+        for line in regressions:
+            print(f"Регрессия: {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
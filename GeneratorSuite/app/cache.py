@@ -0,0 +1,292 @@
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generator, Hashable, List, Optional, Tuple
+
+from app import metrics
+from app.expressions import CompiledFunction, FunctionLike, resolve_function
+from app.generators import f, report_error
+from app.grid import Grid
+
+# --- Кэш результатов для Задания 2 ---
+#
+# Значения хранятся по "решеткам": решетка задается функцией, шагом и
+# сдвигом a относительно шага, точка решетки — целым номером k (x ≈ k * step).
+# Поэтому запросы с разными a и b, но на одной решетке, используют уже
+# вычисленные точки, а досчитываются только недостающие участки.
+# Значения хранятся компактно в array('d'); память ограничена max_bytes,
+# при переполнении вытесняются давно не использованные решетки (LRU).
+#
+# Повторно использованная точка вычислялась от другого a, поэтому ее
+# значение может отличаться от прямого вычисления на единицы последнего
+# знака (x = a1 + i1 * step против x = a2 + i2 * step).
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+CHUNK_SIZE = 65536
+
+# Точность, с которой сравниваются сдвиги решеток
+_PHASE_DIGITS = 9
+
+def function_key(func: Callable[[float], float]) -> Hashable:
+    """Возвращает ключ функции для кэша: текст выражения или сам вызываемый объект."""
+    if isinstance(func, CompiledFunction):
+        return ("expression", func.expression)
+    return func
+
+def lattice_position(a: float, step: float) -> Tuple[int, float]:
+    """
+    Возвращает номер точки a на решетке с шагом step и сдвиг решетки
+    (дробную часть a / step, округленную до _PHASE_DIGITS знаков).
+    """
+    q = a / step
+    k = round(q)
+    phase = round(q - k, _PHASE_DIGITS) + 0.0  # + 0.0 убирает -0.0
+    return k, phase
+
+class _Lattice:
+    """Вычисленные участки одной решетки: отсортированные непересекающиеся сегменты."""
+
+    def __init__(self):
+        self.starts: List[int] = []
+        self.segments: List[array] = []
+        self.nbytes = 0
+
+    def find(self, k: int) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Возвращает (номер сегмента, содержащего k, None)
+        или (None, начало следующего сегмента / None, если его нет).
+        """
+        i = bisect_right(self.starts, k) - 1
+        if i >= 0 and k < self.starts[i] + len(self.segments[i]):
+            return i, None
+        return None, self.starts[i + 1] if i + 1 < len(self.starts) else None
+
+    def store(self, k: int, values: array) -> int:
+        """
+        Добавляет участок, начинающийся с номера k, объединяя его с соседними.
+        Участок, пересекающийся с уже сохраненными (его успел вычислить другой поток), не добавляется.
+        Возвращает прирост памяти в байтах.
+        """
+        i = bisect_right(self.starts, k)
+        if ((i > 0 and self.starts[i - 1] + len(self.segments[i - 1]) > k)
+                or (i < len(self.starts) and self.starts[i] < k + len(values))):
+            return 0
+        # Присоединяем к предыдущему сегменту, если он заканчивается ровно в k
+        if i > 0 and self.starts[i - 1] + len(self.segments[i - 1]) == k:
+            i -= 1
+            self.segments[i].extend(values)
+        else:
+            self.starts.insert(i, k)
+            self.segments.insert(i, array("d", values))
+        # Присоединяем следующий сегмент, если он начинается сразу после нового участка
+        end = self.starts[i] + len(self.segments[i])
+        if i + 1 < len(self.starts) and self.starts[i + 1] == end:
+            self.segments[i].extend(self.segments.pop(i + 1))
+            self.starts.pop(i + 1)
+        added = len(values) * values.itemsize
+        self.nbytes += added
+        return added
+
+class SweepCache:
+    """
+    Кэш значений функции на сетках [a, b] с шагом step с вытеснением LRU.
+    Счетчики: hits — запросы, полностью обслуженные из кэша; misses — остальные;
+    points_reused / points_computed — количество взятых из кэша и вычисленных точек.
+    При включенных метриках (app.metrics) те же события учитываются в счетчиках "cache.*".
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        if max_bytes <= 0:
+            raise ValueError("Размер кэша (max_bytes) должен быть положительным.")
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.points_reused = 0
+        self.points_computed = 0
+        self._lattices: "OrderedDict[Hashable, _Lattice]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_lattice(self, key: Hashable) -> _Lattice:
+        lattice = self._lattices.get(key)
+        if lattice is None:
+            lattice = self._lattices[key] = _Lattice()
+        self._lattices.move_to_end(key)
+        return lattice
+
+    def _store(self, key: Hashable, k: int, values: array) -> None:
+        if len(values) * values.itemsize > self.max_bytes:
+            return
+        with self._lock:
+            self.nbytes += self._get_lattice(key).store(k, values)
+            # Вытесняем давно не использованные решетки, кроме текущей
+            while self.nbytes > self.max_bytes and len(self._lattices) > 1:
+                _, evicted = self._lattices.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+            if self.nbytes > self.max_bytes:
+                self.nbytes -= self._lattices.pop(key).nbytes
+
+    def function_values(self, a: float, b: float, step: float = 0.01,
+                        func: FunctionLike = None) -> Generator[float, None, None]:
+        """
+        Генерирует значения функции func (по умолчанию f) на [a, b] с шагом step,
+        как generate_function_values, но берет уже вычисленные точки из кэша.
+        Исключительные ситуации:
+        - Если step <= 0 или a > b, выдает ValueError.
+        - Точки, в которых функция выдает исключение, пропускаются (с сообщением в stderr);
+          участки с такими точками не кэшируются.
+        - Значения нехешируемой функции (func) не кэшируются, а вычисляются заново.
+        """
+        for chunk, _, _ in self._iter_chunks(a, b, step, func):
+            yield from chunk
+
+    def function_value_batches(self, a: float, b: float, step: float = 0.01, batch_size: int = CHUNK_SIZE,
+                               func: FunctionLike = None) -> Generator[array, None, None]:
+        """
+        Как function_values, но выдает значения пакетами array('d') не длиннее batch_size
+        (как generate_function_value_batches). При расширении или сужении диапазона
+        на той же решетке вычисляются только новые точки.
+        Исключительные ситуации:
+        - Если step <= 0, a > b или batch_size <= 0, выдает ValueError.
+        """
+        for batch, _ in self.indexed_value_batches(a, b, step, batch_size, func):
+            yield batch
+
+    def indexed_value_batches(self, a: float, b: float, step: float = 0.01, batch_size: int = CHUNK_SIZE,
+                              func: FunctionLike = None,
+                              start: int = 0) -> Generator[Tuple[array, Optional[int]], None, None]:
+        """
+        Как function_value_batches, но начинает с точки сетки номер start и выдает пары
+        (пакет, номер точки сетки, следующей за пакетом). Если на участке были точки
+        с ошибками (они пропускаются), номер известен только для последнего пакета участка,
+        для остальных вместо него выдается None.
+        Исключительные ситуации:
+        - Если step <= 0, a > b, batch_size <= 0 или start < 0, выдает ValueError.
+        """
+        if batch_size <= 0:
+            raise ValueError("Размер пакета (batch_size) должен быть положительным.")
+        if start < 0:
+            raise ValueError("Начальный номер (start) не может быть отрицательным.")
+        for chunk, first, stop in self._iter_chunks(a, b, step, func, start):
+            if len(chunk) <= batch_size:
+                yield chunk, stop
+                continue
+            complete = len(chunk) == stop - first
+            for offset in range(0, len(chunk), batch_size):
+                end = offset + batch_size
+                if end >= len(chunk):
+                    yield chunk[offset:], stop
+                else:
+                    yield chunk[offset:end], first + end if complete else None
+
+    def _iter_chunks(self, a: float, b: float, step: float, func: FunctionLike,
+                     start: int = 0) -> Generator[Tuple[array, int, int], None, None]:
+        """
+        Выдает значения на [a, b], начиная с точки номер start, участками: взятыми из кэша
+        или вычисленными заново. Каждый участок — (значения, номер первой точки, номер точки после участка).
+        """
+        grid = Grid(a, b, step)
+        function = resolve_function(func, f)
+        first, phase = lattice_position(a, step)
+        key: Optional[Hashable] = (function_key(function), step, phase)
+        try:
+            hash(key)
+        except TypeError:
+            # Нехешируемая функция не может быть ключом кэша — участки вычисляются без кэша
+            key = None
+        k, end = first + start, first + len(grid)
+        reused = computed = 0
+
+        try:
+            while k < end:
+                index = next_start = None
+                if key is not None:
+                    with self._lock:
+                        lattice = self._get_lattice(key)
+                        index, next_start = lattice.find(k)
+                        if index is not None:
+                            segment_start = lattice.starts[index]
+                            stop = min(end, segment_start + len(lattice.segments[index]), k + CHUNK_SIZE)
+                            chunk = lattice.segments[index][k - segment_start:stop - segment_start]
+                if index is not None:
+                    reused += len(chunk)
+                else:
+                    stop = min(end, k + CHUNK_SIZE, next_start if next_start is not None else end)
+                    chunk, complete = self._compute(grid[k - first:stop - first], function)
+                    computed += stop - k
+                    if complete and key is not None:
+                        self._store(key, k, chunk)
+                if chunk:
+                    yield chunk, k - first, stop - first
+                k = stop
+        finally:
+            with self._lock:
+                self.points_reused += reused
+                self.points_computed += computed
+                if computed:
+                    self.misses += 1
+                elif reused:
+                    self.hits += 1
+            recorder = metrics.current()
+            if recorder is not None and (computed or reused):
+                recorder.count("cache.misses" if computed else "cache.hits")
+                recorder.count("cache.points_reused", reused)
+                recorder.count("cache.points_computed", computed)
+
+    @staticmethod
+    def _compute(grid: Grid, function: Callable[[float], float]) -> Tuple[array, bool]:
+        """Вычисляет значения на участке сетки; второй элемент — не было ли ошибок."""
+        try:
+            return array("d", map(function, grid)), True
+        except Exception:
+            # На участке есть точки с ошибками — вычисляем его поточечно, пропуская их
+            pass
+        values = array("d")
+        complete = True
+        for x in grid:
+            try:
+                values.append(function(x))
+            except Exception as e:
+                report_error(x, e)
+                complete = False
+        return values, complete
+
+    @property
+    def hit_rate(self) -> float:
+        """Доля запросов, полностью обслуженных из кэша."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Возвращает счетчики кэша."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hit_rate,
+                "points_reused": self.points_reused,
+                "points_computed": self.points_computed,
+                "nbytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "lattices": len(self._lattices),
+            }
+
+    def clear(self) -> None:
+        """Очищает кэш и счетчики."""
+        with self._lock:
+            self._lattices.clear()
+            self.nbytes = 0
+            self.hits = self.misses = 0
+            self.points_reused = self.points_computed = 0
+
+# Кэш по умолчанию, общий для консоли и UI
+default_cache = SweepCache()
+
+def cached_function_values(a: float, b: float, step: float = 0.01, func: FunctionLike = None,
+                           cache: Optional[SweepCache] = None) -> Generator[float, None, None]:
+    """
+    Генерирует значения функции на [a, b] с шагом step через кэш (по умолчанию default_cache).
+    См. SweepCache.function_values.
+    """
+    return (cache if cache is not None else default_cache).function_values(a, b, step, func)
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+from typing import TYPE_CHECKING, Any, Dict, Generator, Iterator, Optional, Sequence, Tuple
+
+from app.combinations import ASCII_LOWERCASE, CombinationSpace
+from app.grid import Grid, validate_range
+
+# Кэш (и разбор выражений) загружается только для задач, которые его используют
+if TYPE_CHECKING:
+    from app.cache import SweepCache
+
+# --- Контрольные точки и возобновление долгих задач ---
+#
+# Задача (ResumableJob) описывается видом, параметрами и курсором — явной
+# позицией во входных данных: номером точки сетки (значения функции),
+# номером слова (сочетания) или смещением в байтах (файл городов; курсор
+# всегда стоит на пробельном символе, поэтому чтение с него дает те же названия).
+# Пакет результатов считается обработанным, когда запрошен следующий пакет
+# или вызван commit (commit(n) — обработаны первые n элементов пакета).
+# skip — сколько результатов после курсора уже обработано: курсор переносится
+# только на границу пакета, номер которой известен.
+#
+# Состояние сохраняется в JSON атомарно: во временный файл в том же каталоге,
+# затем os.replace. Прерванная запись не портит предыдущую контрольную точку,
+# а возобновленная задача продолжает ровно с первого необработанного результата.
+
+KINDS = ("function_values", "combinations", "city_file")
+CHECKPOINT_VERSION = 1
+# Интервал периодического сохранения контрольной точки, секунды
+DEFAULT_CHECKPOINT_INTERVAL = 5.0
+DEFAULT_BATCH_SIZE = 4096
+# Размер блока чтения файла городов, байты
+DEFAULT_CHUNK_BYTES = 1024 * 1024
+
+# Байты, которые str.split() считает пробельными и которые однобайтовые в UTF-8
+# (как app.main_multithread._WHITESPACE_BYTE)
+_WHITESPACE_BYTES = (b" ", b"\t", b"\n", b"\r", b"\x0b", b"\x0c", b"\x1c", b"\x1d", b"\x1e", b"\x1f")
+
+class CheckpointError(ValueError):
+    """Исключение для поврежденной или несовместимой контрольной точки."""
+    pass
+
+def save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    """Атомарно записывает состояние state в файл path (JSON)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary = tempfile.mkstemp(prefix=".checkpoint-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as stream:
+            json.dump(state, stream, ensure_ascii=False)
+            stream.flush()
+            os.fsync(stream.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+def load_checkpoint(path: str) -> Dict[str, Any]:
+    """
+    Читает состояние из файла контрольной точки path.
+    Исключительные ситуации:
+    - Если файл поврежден или записан другой версией, выдает CheckpointError.
+    """
+    try:
+        with open(path, encoding="utf-8") as stream:
+            state = json.load(stream)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise CheckpointError(f"Файл контрольной точки {path} поврежден: {e}") from None
+    if not isinstance(state, dict) or state.get("version") != CHECKPOINT_VERSION:
+        raise CheckpointError(f"Файл {path} не является контрольной точкой версии {CHECKPOINT_VERSION}.")
+    if state.get("kind") not in KINDS:
+        raise CheckpointError(f"Неизвестный вид задачи в контрольной точке: {state.get('kind')}.")
+    return state
+
+def remove_checkpoint(path: str) -> None:
+    """Удаляет файл контрольной точки (например, после завершения задачи), если он есть."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+class ResumableJob:
+    """
+    Задача с явным курсором, которую можно сохранить и продолжить с того же места.
+    Создается через function_values, combinations, city_file или load.
+    cache — необязательный кэш значений функции (app.cache.SweepCache), в состояние не входит.
+    """
+
+    def __init__(self, kind: str, params: Dict[str, Any], cursor: int = 0, skip: int = 0,
+                 finished: bool = False, cache: Optional[SweepCache] = None):
+        if kind not in KINDS:
+            raise ValueError(f"Неизвестный вид задачи: {kind}. Допустимые: {', '.join(KINDS)}.")
+        if cursor < 0 or skip < 0:
+            raise ValueError("Курсор (cursor) и пропуск (skip) не могут быть отрицательными.")
+        self.kind = kind
+        self.params = params
+        self.cursor = cursor
+        self.skip = skip
+        self.finished = finished
+        self.cache = cache
+        self.extra: Dict[str, Any] = {}
+        self._remaining = 0 # Необработанные элементы текущего пакета
+        self._position: Optional[int] = None # Курсор после текущего пакета (None — неизвестен)
+        self._saved_at = time.monotonic()
+
+    @classmethod
+    def function_values(cls, a: float, b: float, step: float = 0.01, func: Optional[str] = None,
+                        points: bool = False, cache: Optional[SweepCache] = None) -> "ResumableJob":
+        """
+        Значения функции func (строка-выражение, по умолчанию f) на [a, b] с шагом step;
+        курсор — номер точки сетки. Пакеты — array('d') значений или, если points=True,
+        пары массивов (xs, ys). Точки с ошибками пропускаются, как в generate_function_value_batches.
+        Исключительные ситуации:
+        - Если step <= 0, a > b или func не строка, выдает ValueError.
+        """
+        validate_range(a, b, step)
+        if func is not None and not isinstance(func, str):
+            raise ValueError("Для контрольной точки функция задается строкой-выражением.")
+        return cls("function_values", {"a": a, "b": b, "step": step, "func": func, "points": points}, cache=cache)
+
+    @classmethod
+    def combinations(cls, alphabet: Sequence[str] = ASCII_LOWERCASE, k: int = 2, start: int = 0,
+                     stop: Optional[int] = None) -> "ResumableJob":
+        """
+        Слова длины k над алфавитом с номерами [start, stop) (см. CombinationSpace.iter_batches);
+        курсор — номер слова.
+        Исключительные ситуации:
+        - Если алфавит некорректен, k < 0 или start < 0, выдает ValueError.
+        """
+        space = CombinationSpace(alphabet, k)
+        if start < 0:
+            raise ValueError("Начальный номер (start) не может быть отрицательным.")
+        stop = len(space) if stop is None else min(stop, len(space))
+        alphabet = alphabet if isinstance(alphabet, str) else list(alphabet)
+        return cls("combinations", {"alphabet": alphabet, "k": k, "stop": stop}, cursor=min(start, stop))
+
+    @classmethod
+    def city_file(cls, path: str, min_length: int = 5, encoding: str = "utf-8",
+                  chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> "ResumableJob":
+        """
+        Названия городов длиннее min_length из файла path; курсор — смещение в байтах.
+        Исключительные ситуации:
+        - Если min_length < 0 или chunk_bytes <= 0, выдает ValueError.
+        - Если кодировка не совместима с ASCII (например, UTF-16), выдает ValueError.
+        """
+        if min_length < 0:
+            raise ValueError("Минимальная длина (min_length) не может быть отрицательной.")
+        if chunk_bytes <= 0:
+            raise ValueError("Размер блока (chunk_bytes) должен быть положительным.")
+        if " \t\n".encode(encoding) != b" \t\n":
+            raise ValueError(f"Кодировка {encoding} не совместима с ASCII, смещения в байтах не поддерживаются.")
+        return cls("city_file", {"path": os.path.abspath(path), "min_length": min_length,
+                                 "encoding": encoding, "chunk_bytes": chunk_bytes})
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], cache: Optional[SweepCache] = None) -> "ResumableJob":
+        """Восстанавливает задачу из состояния (см. state)."""
+        job = cls(state["kind"], state["params"], state["cursor"], state["skip"], state["finished"], cache)
+        job.extra = dict(state.get("extra", {}))
+        return job
+
+    @classmethod
+    def load(cls, path: str, cache: Optional[SweepCache] = None) -> "ResumableJob":
+        """Восстанавливает задачу из файла контрольной точки path."""
+        try:
+            return cls.from_state(load_checkpoint(path), cache)
+        except (KeyError, TypeError) as e:
+            raise CheckpointError(f"Неполная контрольная точка {path}: {e}") from None
+
+    def state(self) -> Dict[str, Any]:
+        """Состояние задачи (JSON-совместимый словарь, не связанный с дальнейшими изменениями задачи)."""
+        return {"version": CHECKPOINT_VERSION, "kind": self.kind, "params": dict(self.params),
+                "cursor": self.cursor, "skip": self.skip, "finished": self.finished, "extra": dict(self.extra)}
+
+    def save(self, path: str) -> None:
+        """Атомарно сохраняет состояние в файл path."""
+        save_checkpoint(path, self.state())
+        self._saved_at = time.monotonic()
+
+    def due(self, interval: float = DEFAULT_CHECKPOINT_INTERVAL) -> bool:
+        """Прошло ли не меньше interval секунд с последнего сохранения (или создания задачи)."""
+        return time.monotonic() - self._saved_at >= interval
+
+    @property
+    def end(self) -> int:
+        """Значение курсора после последнего элемента."""
+        if self.kind == "function_values":
+            params = self.params
+            return len(Grid(params["a"], params["b"], params["step"]))
+        if self.kind == "combinations":
+            return self.params["stop"]
+        return os.path.getsize(self.params["path"])
+
+    def progress(self) -> float:
+        """Доля пройденных входных данных (от 0 до 1)."""
+        if self.finished:
+            return 1.0
+        end = self.end
+        return min(1.0, self.cursor / end) if end else 1.0
+
+    def commit(self, count: int) -> None:
+        """
+        Отмечает первые count необработанных элементов текущего пакета как обработанные.
+        Исключительные ситуации:
+        - Если count < 0 или больше количества необработанных элементов пакета, выдает ValueError.
+        """
+        if count < 0 or count > self._remaining:
+            raise ValueError(f"Нельзя отметить {count} элементов: в пакете осталось {self._remaining}.")
+        self._remaining -= count
+        self.skip += count
+        if not self._remaining and self._position is not None:
+            self.cursor, self.skip = self._position, 0
+
+    def batches(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Generator[Any, None, None]:
+        """
+        Генерирует пакеты результатов, начиная с первого необработанного.
+        Состояние (cursor, skip) обновляется по мере обработки пакетов (см. commit).
+        Исключительные ситуации:
+        - Если batch_size <= 0, выдает ValueError.
+        """
+        if batch_size <= 0:
+            raise ValueError("Размер пакета (batch_size) должен быть положительным.")
+        if self.finished:
+            return
+        drop = self.skip
+        for batch, position in self._source(batch_size):
+            size = _batch_length(batch)
+            if drop:
+                # Результаты, обработанные до сохранения контрольной точки
+                dropped = min(drop, size)
+                batch = _batch_tail(batch, dropped)
+                size -= dropped
+                drop -= dropped
+            self._remaining, self._position = size, position
+            if not size:
+                if position is not None:
+                    self.cursor, self.skip = position, drop
+                continue
+            yield batch
+            # Запрошен следующий пакет — текущий обработан целиком
+            self.commit(self._remaining)
+        self.cursor, self.skip, self.finished = self.end, 0, True
+        self._remaining, self._position = 0, None
+
+    def _source(self, batch_size: int) -> Iterator[Tuple[Any, Optional[int]]]:
+        """Пары (пакет, курсор после пакета или None), начиная с позиции self.cursor."""
+        params = self.params
+        if self.kind == "combinations":
+            space = CombinationSpace(params["alphabet"], params["k"])
+            position = self.cursor
+            for batch in space.iter_batches(batch_size, position, params["stop"]):
+                position += len(batch)
+                yield batch, position
+        elif self.kind == "function_values":
+            yield from self._function_source(batch_size)
+        else:
+            yield from _city_file_source(params["path"], params["min_length"], params["encoding"],
+                                         self.cursor, params["chunk_bytes"], batch_size)
+
+    def _function_source(self, batch_size: int) -> Iterator[Tuple[Any, Optional[int]]]:
+        from app.generators import _grid_point_batch, _grid_value_batch, _resolve
+
+        params = self.params
+        a, b, step = params["a"], params["b"], params["step"]
+        if self.cache is not None and not params["points"]:
+            yield from self.cache.indexed_value_batches(a, b, step, batch_size, params["func"], self.cursor)
+            return
+        grid = Grid(a, b, step)
+        function = _resolve(params["func"])
+        for start in range(self.cursor, len(grid), batch_size):
+            stop = min(start + batch_size, len(grid))
+            if params["points"]:
+                yield _grid_point_batch(grid[start:stop], function), stop
+            else:
+                yield _grid_value_batch(grid[start:stop], function), stop
+
+def _batch_length(batch: Any) -> int:
+    # Пакет точек — пара массивов (xs, ys)
+    return len(batch[1]) if isinstance(batch, tuple) else len(batch)
+
+def _batch_tail(batch: Any, start: int) -> Any:
+    if isinstance(batch, tuple):
+        return tuple(part[start:] for part in batch)
+    return batch[start:]
+
+def _last_whitespace(data: bytes) -> int:
+    return max(data.rfind(byte) for byte in _WHITESPACE_BYTES)
+
+def _city_file_source(path: str, min_length: int, encoding: str, offset: int, chunk_bytes: int,
+                      batch_size: int) -> Iterator[Tuple[Any, Optional[int]]]:
+    """
+    Читает файл с offset блоками по chunk_bytes и выдает названия длиннее min_length пакетами
+    не длиннее batch_size. Для последнего пакета блока выдается смещение после последнего
+    пробельного символа блока, для остальных пакетов блока — None.
+    """
+    with open(path, "rb") as stream:
+        stream.seek(offset)
+        tail = b""
+        while True:
+            data = stream.read(chunk_bytes)
+            if not data:
+                if tail:
+                    yield from _split_cities(tail, encoding, min_length, batch_size, offset + len(tail))
+                return
+            data = tail + data if tail else data
+            cut = _last_whitespace(data) + 1
+            if not cut:
+                # Название длиннее блока — читаем дальше
+                tail = data
+                continue
+            tail = data[cut:]
+            offset += cut
+            yield from _split_cities(data[:cut], encoding, min_length, batch_size, offset)
+
+def _split_cities(data: bytes, encoding: str, min_length: int, batch_size: int,
+                  position: int) -> Iterator[Tuple[Any, Optional[int]]]:
+    cities = [city for city in data.decode(encoding).split() if len(city) > min_length]
+    if len(cities) <= batch_size:
+        yield cities, position
+        return
+    for start in range(0, len(cities), batch_size):
+        end = start + batch_size
+        yield cities[start:end], position if end >= len(cities) else None
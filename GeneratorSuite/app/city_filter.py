@@ -1,4 +1,15 @@
-from typing import Generator, List
+from __future__ import annotations
+
+import sys
+
+from app import metrics
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Generator, Iterable, List, TextIO, Union
+
+# Размер блока при чтении файла или stdin (в символах)
+DEFAULT_CHUNK_SIZE = 64 * 1024
 
 def filter_cities_by_length(city_string: str, min_length: int = 5) -> Generator[str, None, None]:
     """
@@ -7,15 +18,79 @@ def filter_cities_by_length(city_string: str, min_length: int = 5) -> Generator[
     Исключительные ситуации:
     - Если city_string пустая, генератор просто ничего не вернет.
     - Если min_length < 0, выдает ValueError.
+    Если включены метрики (app.metrics), проход учитывается в замере "cities".
     """
     if min_length < 0:
         raise ValueError("Минимальная длина (min_length) не может быть отрицательной.")
 
     cities = city_string.split()
+    yield from metrics.measured("cities", _longer_than(cities, min_length))
+
+def _longer_than(cities: Iterable[str], min_length: int) -> Generator[str, None, None]:
     for city in cities:
         if len(city) > min_length:
             yield city
 
+def iter_city_tokens(source: Union[Iterable[str], TextIO],
+                     chunk_size: int = DEFAULT_CHUNK_SIZE) -> Generator[str, None, None]:
+    """
+    Лениво разбивает поток текста на названия городов (по пробельным символам, как str.split()).
+    source — итерируемый объект строк (каждая строка — законченный текст, например список строк)
+    или текстовый поток с методом read(), который читается блоками по chunk_size символов.
+    Название, разрезанное границей блока при чтении через read(), склеивается из соседних блоков.
+    Исключительные ситуации:
+    - Если chunk_size <= 0, выдает ValueError.
+    """
+    if chunk_size <= 0:
+        raise ValueError("Размер блока (chunk_size) должен быть положительным.")
+    if not hasattr(source, "read"):
+        # Элементы итерируемого объекта — законченные строки: слова между ними не склеиваются
+        for line in source:
+            yield from line.split()
+        return
+
+    tail = ""
+    for chunk in iter(lambda: source.read(chunk_size), ""):
+        if not chunk:
+            continue
+        text = tail + chunk if tail else chunk
+        tokens = text.split()
+        # Последнее слово может продолжиться в следующем блоке
+        tail = tokens.pop() if tokens and not text[-1].isspace() else ""
+        yield from tokens
+    if tail:
+        yield tail
+
+def filter_cities_from_stream(source: Union[Iterable[str], TextIO], min_length: int = 5,
+                              chunk_size: int = DEFAULT_CHUNK_SIZE) -> Generator[str, None, None]:
+    """
+    Потоковый вариант filter_cities_by_length: читает названия из source
+    (итерируемый объект строк или текстовый поток, см. iter_city_tokens)
+    и лениво возвращает названия длиной более min_length.
+    Память не зависит от объема входных данных, а next() читает ровно столько, сколько нужно.
+    Исключительные ситуации:
+    - Если min_length < 0, выдает ValueError.
+    """
+    if min_length < 0:
+        raise ValueError("Минимальная длина (min_length) не может быть отрицательной.")
+
+    yield from metrics.measured("cities", _longer_than(iter_city_tokens(source, chunk_size), min_length))
+
+def filter_cities_from_file(path: str, min_length: int = 5, encoding: str = "utf-8",
+                            chunk_size: int = DEFAULT_CHUNK_SIZE) -> Generator[str, None, None]:
+    """
+    Фильтрует названия городов из текстового файла path (или из stdin, если path == "-").
+    Файл читается блоками по chunk_size символов.
+    Исключительные ситуации:
+    - Если min_length < 0, выдает ValueError.
+    - Если файл не найден, выдает FileNotFoundError.
+    """
+    if path == "-":
+        yield from filter_cities_from_stream(sys.stdin, min_length, chunk_size)
+        return
+    with open(path, encoding=encoding) as stream:
+        yield from filter_cities_from_stream(stream, min_length, chunk_size)
+
 # --- Использование фильтра ---
 if __name__ == "__main__":
     cities_input = "Москва Питер Казань Уфа Омск Самара Ярославль Астрахань"
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from array import array
+
+from app.city_filter import DEFAULT_CHUNK_SIZE, iter_city_tokens
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterable, List, Optional
+
+# --- Индекс городов по длине названия для Задания 3 ---
+#
+# Названия один раз сортируются по длине (устойчиво, т. е. с сохранением
+# исходного порядка среди равных), а для каждой длины L запоминается
+# смещение первого названия длиной не меньше L. Запрос "длиннее k"
+# сводится к поиску смещения за O(1) и срезу списка.
+
+class CityIndex:
+    """
+    Индекс названий городов по длине.
+    Строится один раз и переиспользуется для запросов с разными порогами длины.
+    """
+
+    def __init__(self, cities: Iterable[str]):
+        names = list(cities)
+        order = sorted(range(len(names)), key=lambda i: len(names[i]))
+        self._names: List[str] = [names[i] for i in order]
+        # Позиции названий во входных данных — для выдачи в исходном порядке
+        self._positions = array("q", order)
+        max_length = len(self._names[-1]) if self._names else 0
+        # _offsets[L] — индекс первого названия длиной >= L, L = 0..max_length + 1
+        self._offsets = array("q", [0] * (max_length + 2))
+        length = 0
+        for i, name in enumerate(self._names):
+            while length <= len(name):
+                self._offsets[length] = i
+                length += 1
+        for rest in range(length, max_length + 2):
+            self._offsets[rest] = len(self._names)
+
+    @classmethod
+    def from_string(cls, city_string: str) -> "CityIndex":
+        """Строит индекс по строке с названиями городов, разделенными пробелами."""
+        return cls(city_string.split())
+
+    @classmethod
+    def from_file(cls, path: str, encoding: str = "utf-8", chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  max_workers: Optional[int] = None) -> "CityIndex":
+        """
+        Строит индекс по текстовому файлу, читая его блоками.
+        Если задан max_workers, файл в UTF-8 разбирается параллельно
+        (см. app.main_multithread.filter_cities_parallel).
+        """
+        if max_workers is not None:
+            from app.main_multithread import filter_cities_parallel
+            return cls(filter_cities_parallel(path, min_length=0, max_workers=max_workers))
+        with open(path, encoding=encoding) as stream:
+            return cls(iter_city_tokens(stream, chunk_size))
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _start(self, length: int) -> int:
+        """Индекс первого названия длиной не меньше length."""
+        return self._offsets[min(max(length, 0), len(self._offsets) - 1)]
+
+    def _select(self, start: int, stop: int, keep_order: bool) -> List[str]:
+        if not keep_order:
+            return self._names[start:stop]
+        selected = sorted(range(start, stop), key=self._positions.__getitem__)
+        return [self._names[i] for i in selected]
+
+    def count_longer_than(self, min_length: int) -> int:
+        """Возвращает количество названий длиной более min_length за O(1)."""
+        return len(self._names) - self._start(min_length + 1)
+
+    def longer_than(self, min_length: int = 5, keep_order: bool = False) -> List[str]:
+        """
+        Возвращает названия длиной более min_length (как filter_cities_by_length).
+        По умолчанию — в порядке возрастания длины (срез без копирования индекса),
+        при keep_order=True — в исходном порядке.
+        Исключительные ситуации:
+        - Если min_length < 0, выдает ValueError.
+        """
+        if min_length < 0:
+            raise ValueError("Минимальная длина (min_length) не может быть отрицательной.")
+        return self._select(self._start(min_length + 1), len(self._names), keep_order)
+
+    def between(self, shortest: int, longest: int, keep_order: bool = False) -> List[str]:
+        """
+        Возвращает названия, длина которых от shortest до longest включительно.
+        Исключительные ситуации:
+        - Если shortest < 0 или shortest > longest, выдает ValueError.
+        """
+        if shortest < 0:
+            raise ValueError("Минимальная длина (min_length) не может быть отрицательной.")
+        if shortest > longest:
+            raise ValueError("Минимальная длина не может быть больше максимальной.")
+        return self._select(self._start(shortest), self._start(longest + 1), keep_order)
+
+    def top_longest(self, n: int) -> List[str]:
+        """
+        Возвращает n самых длинных названий, самые длинные первыми.
+        Исключительные ситуации:
+        - Если n < 0, выдает ValueError.
+        """
+        if n < 0:
+            raise ValueError("Количество названий (n) не может быть отрицательным.")
+        if n == 0:
+            return []
+        return self._names[:-n - 1:-1] if n < len(self._names) else self._names[::-1]
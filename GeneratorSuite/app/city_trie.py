@@ -0,0 +1,217 @@
+from array import array
+from bisect import bisect_left
+from heapq import merge
+from itertools import groupby
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from app.city_filter import DEFAULT_CHUNK_SIZE, iter_city_tokens
+
+# --- Префиксный индекс городов для поиска по префиксу, подстроке и сходству ---
+#
+# Названия приводятся к ключам без учета регистра (str.casefold), различные
+# ключи один раз сортируются. Отсортированный массив ключей — неявное
+# префиксное дерево: все ключи с общим префиксом образуют непрерывный
+# диапазон, который находится двоичным поиском за O(log n).
+# - Префикс: диапазон ключей, O(log n + размер ответа).
+# - Подстрока: индекс триграмм (строится при первом таком запросе);
+#   проверяются только ключи из самого короткого списка триграммы подстроки.
+#   Подстроки короче 3 символов проверяются перебором ключей.
+# - Сходство (расстояние Левенштейна): обход дерева с таблицей расстояний,
+#   строки которой переиспользуются для общего префикса соседних ключей,
+#   а поддеревья, в которых расстояние уже превышено, пропускаются целиком.
+# Условия комбинируются, правило min_length (длина больше min_length)
+# проверяется для каждого названия. Без casefold=True сравнение с учетом
+# регистра выполняется по исходному названию.
+
+ORDERS = ("input", "sorted")
+_MAX_CHAR = chr(0x10FFFF)
+_GRAM = 3
+
+def edit_distance(first: str, second: str, limit: Optional[int] = None) -> int:
+    """
+    Возвращает расстояние Левенштейна между строками (вставка, удаление, замена символа).
+    Если задан limit и расстояние больше limit, возвращает limit + 1, не досчитывая таблицу.
+    """
+    row = list(range(len(second) + 1))
+    for i, char in enumerate(first, 1):
+        next_row = [i]
+        for j, symbol in enumerate(second):
+            next_row.append(min(next_row[j] + 1, row[j + 1] + 1, row[j] + (symbol != char)))
+        row = next_row
+        if limit is not None and min(row) > limit:
+            return limit + 1
+    return row[-1] if limit is None else min(row[-1], limit + 1)
+
+class CityTrie:
+    """
+    Индекс названий городов для поиска по префиксу, подстроке и сходству.
+    Строится один раз; запросы search выдают результаты лениво.
+    """
+
+    def __init__(self, cities: Iterable[str]):
+        self._names: List[str] = list(cities)
+        groups: Dict[str, List[int]] = {}
+        irregular = set()
+        for position, name in enumerate(self._names):
+            key = name.casefold()
+            groups.setdefault(key, []).append(position)
+            if len(key) != len(name):
+                irregular.add(key)
+        self._keys: List[str] = sorted(groups)
+        # Номера ключей, для которых casefold меняет длину названия (ß -> ss)
+        self._irregular = array("q", (number for number, key in enumerate(self._keys) if key in irregular))
+        # Позиции названий с ключом _keys[i] во входных данных (по возрастанию):
+        # _positions[_starts[i]:_starts[i + 1]]
+        self._starts = array("q", [0])
+        self._positions = array("q")
+        for key in self._keys:
+            self._positions.extend(groups[key])
+            self._starts.append(len(self._positions))
+        self._grams: Optional[Dict[str, array]] = None
+
+    @classmethod
+    def from_string(cls, city_string: str) -> "CityTrie":
+        """Строит индекс по строке с названиями городов, разделенными пробелами."""
+        return cls(city_string.split())
+
+    @classmethod
+    def from_file(cls, path: str, encoding: str = "utf-8", chunk_size: int = DEFAULT_CHUNK_SIZE) -> "CityTrie":
+        """Строит индекс по текстовому файлу, читая его блоками."""
+        with open(path, encoding=encoding) as stream:
+            return cls(iter_city_tokens(stream, chunk_size))
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _prefix_end(self, prefix: str, lo: int, hi: int) -> int:
+        """Индекс первого ключа в [lo, hi), который больше всех ключей, начинающихся с prefix."""
+        while prefix and prefix[-1] == _MAX_CHAR:
+            prefix = prefix[:-1]
+        if not prefix:
+            return hi
+        return bisect_left(self._keys, prefix[:-1] + chr(ord(prefix[-1]) + 1), lo, hi)
+
+    def _similar_keys(self, word: str, max_distance: int, lo: int, hi: int) -> Iterator[int]:
+        """Номера ключей в [lo, hi), расстояние Левенштейна от которых до word не больше max_distance."""
+        keys = self._keys
+        # rows[d] — строка таблицы расстояний для префикса path[:d]
+        rows = [list(range(len(word) + 1))]
+        path = ""
+        i = lo
+        while i < hi:
+            key = keys[i]
+            common = 0
+            shortest = min(len(path), len(key))
+            while common < shortest and path[common] == key[common]:
+                common += 1
+            del rows[common + 1:]
+            row = rows[-1]
+            depth = common
+            while depth < len(key) and min(row) <= max_distance:
+                char = key[depth]
+                next_row = [row[0] + 1]
+                for j, symbol in enumerate(word):
+                    next_row.append(min(next_row[j] + 1, row[j + 1] + 1, row[j] + (symbol != char)))
+                rows.append(next_row)
+                row = next_row
+                depth += 1
+            path = key[:depth]
+            if min(row) > max_distance:
+                # Ни один ключ с префиксом path не подходит
+                i = self._prefix_end(path, i + 1, hi)
+                continue
+            if row[-1] <= max_distance:
+                yield i
+            i += 1
+
+    def _gram_index(self) -> Dict[str, array]:
+        """Триграмма -> номера ключей, содержащих ее (по возрастанию)."""
+        if self._grams is None:
+            grams: Dict[str, array] = {}
+            for number, key in enumerate(self._keys):
+                for gram in {key[i:i + _GRAM] for i in range(len(key) - _GRAM + 1)}:
+                    postings = grams.get(gram)
+                    if postings is None:
+                        postings = grams[gram] = array("q")
+                    postings.append(number)
+            self._grams = grams
+        return self._grams
+
+    def _keys_with_part(self, part: str) -> Iterable[int]:
+        """Номера ключей, которые могут содержать part (проверка — part in key)."""
+        if len(part) < _GRAM:
+            return range(len(self._keys))
+        grams = self._gram_index()
+        postings = [grams.get(part[i:i + _GRAM]) for i in range(len(part) - _GRAM + 1)]
+        if not all(postings):
+            return ()
+        return min(postings, key=len)
+
+    def search(self, prefix: Optional[str] = None, contains: Optional[str] = None,
+               similar_to: Optional[str] = None, max_distance: int = 1, min_length: int = 0,
+               casefold: bool = False, order: str = "input") -> Iterator[str]:
+        """
+        Лениво выдает названия длиной более min_length, которые одновременно
+        начинаются с prefix, содержат contains и отличаются от similar_to
+        не более чем на max_distance правок (незаданные условия не проверяются).
+        casefold=True — сравнение без учета регистра.
+        order: "input" — в исходном порядке, "sorted" — по алфавиту без учета регистра
+        (равные без учета регистра — в исходном порядке).
+        Исключительные ситуации:
+        - Если min_length < 0, max_distance < 0 или order неизвестен, выдает ValueError.
+        """
+        if min_length < 0:
+            raise ValueError("Минимальная длина (min_length) не может быть отрицательной.")
+        if max_distance < 0:
+            raise ValueError("Расстояние (max_distance) не может быть отрицательным.")
+        if order not in ORDERS:
+            raise ValueError(f"Неизвестный порядок: {order}. Допустимые: {', '.join(ORDERS)}.")
+        folded = [None if text is None else text.casefold() for text in (prefix, contains, similar_to)]
+        numbers = self._matching_keys(*folded, max_distance, similar_to if not casefold else None)
+        positions, starts = self._positions, self._starts
+        if order == "sorted":
+            candidates: Iterator[int] = (position for number in numbers
+                                         for position in positions[starts[number]:starts[number + 1]])
+        else:
+            candidates = merge(*[positions[starts[number]:starts[number + 1]] for number in numbers])
+        names = self._names
+        if casefold:
+            return (names[position] for position in candidates if len(names[position]) > min_length)
+        return (names[position] for position in candidates
+                if _matches(names[position], prefix, contains, similar_to, max_distance, min_length))
+
+    def _matching_keys(self, prefix: Optional[str], contains: Optional[str], similar_to: Optional[str],
+                       max_distance: int, exact_word: Optional[str] = None) -> Iterator[int]:
+        """
+        Номера ключей (по возрастанию), удовлетворяющих условиям без учета регистра.
+        exact_word — исходный similar_to, если сходство затем проверяется с учетом регистра.
+        """
+        lo, hi = 0, len(self._keys)
+        if prefix is not None:
+            lo = bisect_left(self._keys, prefix)
+            hi = self._prefix_end(prefix, lo, hi)
+        if similar_to is not None and exact_word is not None and len(exact_word) != len(similar_to):
+            # Расстояние между ключами может быть больше расстояния между исходными строками
+            numbers: Iterable[int] = range(lo, hi)
+        elif similar_to is not None:
+            numbers = self._similar_keys(similar_to, max_distance, lo, hi)
+            if exact_word is not None and self._irregular:
+                # То же для ключей, у которых casefold меняет длину: они проверяются всегда
+                extra = [number for number in self._irregular if lo <= number < hi]
+                numbers = (number for number, _ in groupby(merge(numbers, extra)))
+        elif prefix is not None or contains is None:
+            numbers = range(lo, hi)
+        else:
+            numbers = self._keys_with_part(contains)
+        if contains is None:
+            return iter(numbers)
+        keys = self._keys
+        return (number for number in numbers if contains in keys[number])
+
+def _matches(name: str, prefix: Optional[str], contains: Optional[str], similar_to: Optional[str],
+             max_distance: int, min_length: int) -> bool:
+    """Проверяет условия поиска для названия с учетом регистра."""
+    return (len(name) > min_length
+            and (prefix is None or name.startswith(prefix))
+            and (contains is None or contains in name)
+            and (similar_to is None or edit_distance(similar_to, name, max_distance) <= max_distance))
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from itertools import product
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Generator, List, Optional, Sequence, Union, overload
+
+# --- Обобщение Задания 1: все слова длины k над алфавитом ---
+#
+# Пространство alphabet^k нумеруется в лексикографическом порядке:
+# слово с номером i — это запись i в системе счисления с основанием
+# len(alphabet). Слово собирается из двух заранее построенных таблиц:
+# "младшей" части (последние low букв) и "старшей" части (первые k - low букв),
+# поэтому i-е слово вычисляется за O(1), а перебор с любого смещения
+# сводится к склейке префикса с готовыми строками таблицы.
+
+# Максимальный размер таблицы частей слова
+TABLE_LIMIT = 65536
+
+# То же, что string.ascii_lowercase: модуль string при импорте загружает re,
+# а эта константа нужна при каждом запуске консольной версии
+ASCII_LOWERCASE = "abcdefghijklmnopqrstuvwxyz"
+
+class CombinationSpace:
+    """
+    Все слова длины k над алфавитом alphabet в лексикографическом порядке.
+    Поддерживает len(), space[i], срезы, rank/unrank и перебор с произвольного смещения.
+    """
+
+    def __init__(self, alphabet: Sequence[str] = ASCII_LOWERCASE, k: int = 2):
+        if k < 0:
+            raise ValueError("Длина слова (k) не может быть отрицательной.")
+        if not alphabet:
+            raise ValueError("Алфавит (alphabet) не может быть пустым.")
+        if len(set(alphabet)) != len(alphabet):
+            raise ValueError("Символы алфавита (alphabet) должны быть уникальными.")
+        self.alphabet = tuple(alphabet)
+        self.k = k
+        self.base = len(self.alphabet)
+        self.size = self.base ** k
+        self._rank_of = {symbol: i for i, symbol in enumerate(self.alphabet)}
+
+        # Младшая часть — наибольшее число букв, таблица для которого не превышает TABLE_LIMIT
+        low = 0
+        while low < k and self.base ** (low + 1) <= TABLE_LIMIT:
+            low += 1
+        self._low = low
+        self._low_table: List[str] = ["".join(p) for p in product(self.alphabet, repeat=low)]
+        high = k - low
+        self._high_table: Optional[List[str]] = None
+        if self.base ** high <= TABLE_LIMIT:
+            self._high_table = ["".join(p) for p in product(self.alphabet, repeat=high)]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _prefix(self, high_index: int) -> str:
+        """Первые k - low букв слова по номеру старшей части."""
+        if self._high_table is not None:
+            return self._high_table[high_index]
+        symbols = []
+        for _ in range(self.k - self._low):
+            high_index, digit = divmod(high_index, self.base)
+            symbols.append(self.alphabet[digit])
+        return "".join(reversed(symbols))
+
+    def unrank(self, index: int) -> str:
+        """
+        Возвращает слово с номером index.
+        Исключительные ситуации:
+        - Если index вне [0, len), выдает IndexError.
+        """
+        if not 0 <= index < self.size:
+            raise IndexError("Номер слова вне пространства сочетаний.")
+        high_index, low_index = divmod(index, len(self._low_table))
+        return self._prefix(high_index) + self._low_table[low_index]
+
+    def rank(self, word: str) -> int:
+        """
+        Возвращает номер слова word.
+        Исключительные ситуации:
+        - Если длина слова не равна k или в нем есть символы не из алфавита, выдает ValueError.
+        """
+        if len(word) != self.k:
+            raise ValueError(f"Длина слова должна быть равна {self.k}.")
+        index = 0
+        for symbol in word:
+            try:
+                index = index * self.base + self._rank_of[symbol]
+            except KeyError:
+                raise ValueError(f"Символ '{symbol}' не входит в алфавит.") from None
+        return index
+
+    if TYPE_CHECKING:
+        @overload
+        def __getitem__(self, item: int) -> str: ...
+        @overload
+        def __getitem__(self, item: slice) -> List[str]: ...
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(item, slice):
+            start, stop, stride = item.indices(self.size)
+            if stride == 1:
+                return list(self.iter_from(start, stop))
+            return [self.unrank(i) for i in range(start, stop, stride)]
+        return self.unrank(item + self.size if item < 0 else item)
+
+    def __contains__(self, word: object) -> bool:
+        return (isinstance(word, str) and len(word) == self.k
+                and all(symbol in self._rank_of for symbol in word))
+
+    def __iter__(self) -> Generator[str, None, None]:
+        return self.iter_from(0)
+
+    def iter_from(self, start: int = 0, stop: Optional[int] = None) -> Generator[str, None, None]:
+        """
+        Генерирует слова с номерами [start, stop) (по умолчанию — до конца пространства).
+        Позволяет продолжить перебор с любого смещения или обработать отдельный шард.
+        Исключительные ситуации:
+        - Если start < 0, выдает ValueError.
+        """
+        if start < 0:
+            raise ValueError("Начальный номер (start) не может быть отрицательным.")
+        stop = self.size if stop is None else min(stop, self.size)
+        low_size = len(self._low_table)
+        high_index, low_index = divmod(start, low_size)
+        remaining = stop - start
+        while remaining > 0:
+            block = self._low_table[low_index:low_index + remaining]
+            prefix = self._prefix(high_index)
+            if prefix:
+                yield from map(prefix.__add__, block)
+            else:
+                yield from block
+            remaining -= len(block)
+            high_index += 1
+            low_index = 0
+
+    def iter_batches(self, batch_size: int, start: int = 0,
+                     stop: Optional[int] = None) -> Generator[List[str], None, None]:
+        """
+        Генерирует слова с номерами [start, stop) списками по batch_size слов
+        (последний список может быть короче).
+        Исключительные ситуации:
+        - Если batch_size <= 0 или start < 0, выдает ValueError.
+        """
+        if batch_size <= 0:
+            raise ValueError("Размер пакета (batch_size) должен быть положительным.")
+        if start < 0:
+            raise ValueError("Начальный номер (start) не может быть отрицательным.")
+        stop = self.size if stop is None else min(stop, self.size)
+        low_size = len(self._low_table)
+        high_index, low_index = divmod(start, low_size)
+        batch: List[str] = []
+        remaining = stop - start
+        while remaining > 0:
+            block = self._low_table[low_index:low_index + min(remaining, batch_size - len(batch))]
+            prefix = self._prefix(high_index)
+            batch.extend(map(prefix.__add__, block) if prefix else block)
+            remaining -= len(block)
+            low_index += len(block)
+            if low_index == low_size:
+                high_index += 1
+                low_index = 0
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def shards(self, parts: int) -> List[range]:
+        """
+        Делит номера слов на parts последовательных диапазонов почти равной длины.
+        Исключительные ситуации:
+        - Если parts <= 0, выдает ValueError.
+        """
+        if parts <= 0:
+            raise ValueError("Количество частей (parts) должно быть положительным.")
+        bounds = [self.size * i // parts for i in range(parts + 1)]
+        return [range(start, stop) for start, stop in zip(bounds, bounds[1:]) if start < stop]
+
+    def __repr__(self) -> str:
+        return f"CombinationSpace(alphabet={''.join(self.alphabet)!r}, k={self.k})"
@@ -0,0 +1,239 @@
+import ast
+import math
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+# --- Подключаемые функции для Задания 2 ---
+#
+# Выражение вида "0.1x^2 + 5x - 2" разбирается один раз, проверяется
+# (разрешены только x, числа, арифметика и функции из _FUNCTIONS)
+# и компилируется в код Python. Результат кэшируется по тексту выражения,
+# поэтому повторные вычисления той же формулы не разбирают ее заново.
+# Многочлены вычисляются по схеме Горнера, без возведения в степень.
+
+# Разрешенные функции: имя -> имя в math (скалярный режим) и в numpy (векторный)
+_FUNCTIONS: Dict[str, Tuple[str, str]] = {
+    "sin": ("sin", "sin"),
+    "cos": ("cos", "cos"),
+    "tan": ("tan", "tan"),
+    "exp": ("exp", "exp"),
+    "log": ("log", "log"),
+    "sqrt": ("sqrt", "sqrt"),
+    "abs": ("fabs", "abs"),
+}
+_CONSTANTS = {"pi": math.pi, "e": math.e}
+
+_BIN_OPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow)
+_UNARY_OPS = (ast.UAdd, ast.USub)
+
+# Число в записи выражения; если за ним сразу идет x, имя функции или скобка,
+# подставляется знак умножения: "5x" -> "5*x"
+_NUMBER = re.compile(r"(?<![\w.])\d+\.?\d*(?:[eE][+-]?\d+)?")
+
+EXPRESSION_CACHE_SIZE = 128
+
+FunctionLike = Union[str, Callable[[float], float], None]
+
+class ExpressionError(ValueError):
+    """Исключение для некорректного выражения функции."""
+    pass
+
+def _normalize(text: str) -> str:
+    """Приводит запись вида '0.1x^2 + 5x - 2' к синтаксису Python."""
+    text = text.strip().replace("^", "**")
+
+    def insert_mul(match: re.Match) -> str:
+        following = text[match.end():].lstrip()[:1]
+        if following and (following.isalpha() or following in "_("):
+            return match.group() + "*"
+        return match.group()
+
+    return _NUMBER.sub(insert_mul, text)
+
+def _check_node(node: ast.AST) -> None:
+    """Проверяет, что выражение содержит только разрешенные конструкции."""
+    if isinstance(node, ast.Expression):
+        _check_node(node.body)
+    elif isinstance(node, ast.BinOp) and isinstance(node.op, _BIN_OPS):
+        _check_node(node.left)
+        _check_node(node.right)
+    elif isinstance(node, ast.UnaryOp) and isinstance(node.op, _UNARY_OPS):
+        _check_node(node.operand)
+    elif isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        pass
+    elif isinstance(node, ast.Name) and (node.id == "x" or node.id in _CONSTANTS):
+        pass
+    elif (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+          and node.func.id in _FUNCTIONS and len(node.args) == 1 and not node.keywords):
+        _check_node(node.args[0])
+    else:
+        raise ExpressionError(f"Недопустимая конструкция в выражении: {ast.dump(node)[:60]}")
+
+# --- Многочлены ---
+
+Poly = Dict[int, float]
+
+def _poly_mul(p: Poly, q: Poly) -> Poly:
+    result: Poly = {}
+    for i, ci in p.items():
+        for j, cj in q.items():
+            result[i + j] = result.get(i + j, 0.0) + ci * cj
+    return result
+
+def _as_polynomial(node: ast.AST) -> Optional[Poly]:
+    """
+    Пытается представить выражение многочленом от x.
+    Возвращает словарь {степень: коэффициент} или None, если это не многочлен.
+    Если константа не помещается в float, выдает ExpressionError.
+    """
+    if isinstance(node, ast.Constant):
+        try:
+            return {0: float(node.value)}
+        except OverflowError:
+            raise ExpressionError(f"Слишком большое число в выражении: {str(node.value)[:20]}...") from None
+    if isinstance(node, ast.Name):
+        return {1: 1.0} if node.id == "x" else {0: _CONSTANTS[node.id]}
+    if isinstance(node, ast.UnaryOp):
+        p = _as_polynomial(node.operand)
+        if p is None:
+            return None
+        return p if isinstance(node.op, ast.UAdd) else {k: -c for k, c in p.items()}
+    if isinstance(node, ast.BinOp):
+        left = _as_polynomial(node.left)
+        right = _as_polynomial(node.right)
+        if left is None or right is None:
+            return None
+        if isinstance(node.op, (ast.Add, ast.Sub)):
+            sign = 1.0 if isinstance(node.op, ast.Add) else -1.0
+            result = dict(left)
+            for k, c in right.items():
+                result[k] = result.get(k, 0.0) + sign * c
+            return result
+        if isinstance(node.op, ast.Mult):
+            return _poly_mul(left, right)
+        if isinstance(node.op, ast.Div):
+            # Делить можно только на ненулевую константу
+            if set(right) != {0} or right[0] == 0:
+                return None
+            return {k: c / right[0] for k, c in left.items()}
+        if isinstance(node.op, ast.Pow):
+            if set(left) == {0} and set(right) == {0}:
+                return _fold_power(left[0], right[0])
+            if set(right) != {0} or not float(right[0]).is_integer() or not 0 <= right[0] <= 64:
+                return None
+            result = {0: 1.0}
+            for _ in range(int(right[0])):
+                result = _poly_mul(result, left)
+            return result
+    return None
+
+def _fold_power(base: float, exponent: float) -> Optional[Poly]:
+    """Вычисляет степень двух констант; None, если ее нельзя свернуть в вещественное число."""
+    try:
+        value = base ** exponent
+    except OverflowError:
+        raise ExpressionError(f"Слишком большое значение степени в выражении: {base!r} ** {exponent!r}") from None
+    except ZeroDivisionError:
+        return None
+    if isinstance(value, complex):
+        return None
+    return {0: value}
+
+def _horner_source(coefficients: Tuple[float, ...]) -> str:
+    """Строит код вычисления многочлена по схеме Горнера: ((c_n*x + c_n-1)*x + ...) + c_0."""
+    if len(coefficients) == 1:
+        # Константа: умножение на x сохраняет форму массива в векторном режиме
+        return f"x * 0.0 + {coefficients[0]!r}"
+    source = repr(coefficients[-1])
+    for c in reversed(coefficients[:-1]):
+        if c > 0:
+            source = f"({source}) * x + {c!r}"
+        elif c < 0:
+            source = f"({source}) * x - {-c!r}"
+        else:
+            source = f"({source}) * x"
+    return source
+
+class CompiledFunction:
+    """
+    Скомпилированная функция одной переменной.
+    Вызывается как обычная функция для скаляров; vectorized — ее вариант для массивов numpy.
+    coefficients — коэффициенты многочлена (от младшей степени к старшей) или None.
+    """
+
+    def __init__(self, expression: str, source: str, coefficients: Optional[Tuple[float, ...]]):
+        self.expression = expression
+        self.source = source
+        self.coefficients = coefficients
+        self._code = compile(f"lambda x: {source}", f"<f(x) = {expression}>", "eval")
+        self._scalar: Callable[[float], float] = self._build(math, 0)
+        self._vectorized: Optional[Callable[[Any], Any]] = None
+
+    def __call__(self, x: float) -> float:
+        return self._scalar(x)
+
+    @property
+    def vectorized(self) -> Callable[[Any], Any]:
+        """Вариант функции для массивов numpy (numpy загружается при первом обращении)."""
+        if self._vectorized is None:
+            import numpy as np
+            self._vectorized = self._build(np, 1)
+        return self._vectorized
+
+    def _build(self, module: Any, column: int) -> Callable[[Any], Any]:
+        """Создает функцию из скомпилированного кода, беря математические функции из module."""
+        namespace: Dict[str, Any] = {name: getattr(module, names[column]) for name, names in _FUNCTIONS.items()}
+        namespace.update(_CONSTANTS)
+        namespace["__builtins__"] = {}
+        return eval(self._code, namespace)
+
+    def __reduce__(self):
+        # Для передачи в дочерние процессы пересобираем функцию по тексту выражения
+        return compile_expression, (self.expression,)
+
+    def __repr__(self) -> str:
+        return f"CompiledFunction({self.expression!r})"
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_expression(expression: str) -> CompiledFunction:
+    """
+    Разбирает и компилирует выражение от x, например "0.1x^2 + 5x - 2" или "sin(x) / (1 + x^2)".
+    Результат кэшируется по тексту выражения.
+    Исключительные ситуации:
+    - Если выражение синтаксически некорректно или содержит недопустимые имена, выдает ExpressionError.
+    - Если константа в выражении не помещается в float, выдает ExpressionError.
+    """
+    try:
+        tree = ast.parse(_normalize(expression), mode="eval")
+    except SyntaxError as e:
+        raise ExpressionError(f"Некорректное выражение '{expression}': {e.msg}") from None
+    _check_node(tree)
+
+    poly = _as_polynomial(tree.body)
+    if poly is not None:
+        degree = max((k for k, c in poly.items() if c), default=0)
+        coefficients = tuple(poly.get(k, 0.0) for k in range(degree + 1))
+        # Переполненный коэффициент схема Горнера не запишет: вычисляем выражение как есть
+        if all(math.isfinite(c) for c in coefficients):
+            return CompiledFunction(expression, _horner_source(coefficients), coefficients)
+    return CompiledFunction(expression, ast.unparse(tree.body), None)
+
+def resolve_function(func: FunctionLike, default: Callable[[float], float]) -> Callable[[float], float]:
+    """
+    Приводит аргумент func к вызываемому объекту:
+    None -> default, строка -> compile_expression(func), иначе func как есть.
+    Исключительные ситуации:
+    - Если func не строка и не вызываемый объект, выдает TypeError.
+    """
+    if func is None:
+        return default
+    if isinstance(func, str):
+        return compile_expression(func)
+    if not callable(func):
+        raise TypeError("Функция (func) должна быть вызываемым объектом или строкой-выражением.")
+    return func
+
+def vectorized_form(func: Callable[[float], float]) -> Callable[[Any], Any]:
+    """Возвращает вариант функции для массивов numpy, если он есть, иначе саму функцию."""
+    return func.vectorized if isinstance(func, CompiledFunction) else func
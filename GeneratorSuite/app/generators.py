@@ -1,51 +1,207 @@
+from __future__ import annotations
+
 import sys
-from string import ascii_lowercase
-from typing import Generator, Iterator, Tuple, List
+import time
+from array import array
+
+from app import metrics
+from app.combinations import ASCII_LOWERCASE, CombinationSpace
+from app.grid import Grid, validate_range
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Generator, List, Optional, Tuple, Union
+    from app.expressions import FunctionLike
+
+# Размер пакета по умолчанию для пакетной выдачи
+DEFAULT_BATCH_SIZE = 4096
 
 # --- Задание 1: Все сочетания из двух букв ---
 
-def generate_two_letter_combinations() -> Generator[str, None, None]:
+def generate_two_letter_combinations(batch_size: Optional[int] = None) -> Generator[Union[str, List[str]], None, None]:
     """
     Генерирует все сочетания из двух латинских букв (малых).
+    Если задан batch_size, выдает сочетания списками по batch_size штук:
+    накладные расходы на возобновление генератора платятся один раз на пакет.
+    Исключительные ситуации:
+    - Если batch_size <= 0, выдает ValueError.
     """
-    for char1 in ascii_lowercase:
-        for char2 in ascii_lowercase:
-            yield char1 + char2
+    space = CombinationSpace(ASCII_LOWERCASE, 2)
+    if batch_size is None:
+        yield from space
+    else:
+        yield from space.iter_batches(batch_size)
+
+def generate_combinations(alphabet: str = ASCII_LOWERCASE, k: int = 2,
+                          start: int = 0) -> Generator[str, None, None]:
+    """
+    Генерирует все слова длины k над алфавитом alphabet, начиная с номера start
+    (см. app.combinations.CombinationSpace).
+    Исключительные ситуации:
+    - Если k < 0, алфавит пуст или содержит повторы, выдает ValueError.
+    """
+    yield from CombinationSpace(alphabet, k).iter_from(start)
 
 # --- Задание 2: Функция f(x) = 0.1x^2 + 5x - 2 ---
 
+def _resolve(func: FunctionLike) -> Callable[[float], float]:
+    """
+    Возвращает вычисляемую функцию: f, если func не задана, иначе см. app.expressions.resolve_function.
+    Разбор выражений (ast, re) загружается только при первом использовании своей функции.
+    """
+    if func is None:
+        return f
+    from app.expressions import resolve_function
+    return resolve_function(func, f)
+
 def f(x: float) -> float:
     """
     Математическая функция f(x) = 0.1x^2 + 5x - 2.
+    Вычисляется по схеме Горнера: (0.1x + 5)x - 2.
     """
-    return 0.1 * x**2 + 5 * x - 2
+    return (0.1 * x + 5) * x - 2
+
+# Коэффициенты f от младшей степени к старшей (как CompiledFunction.coefficients)
+F_COEFFICIENTS = (-2.0, 5.0, 0.1)
 
-def generate_function_values(a: float, b: float, step: float = 0.01) -> Generator[float, None, None]:
+def generate_function_values(a: float, b: float, step: float = 0.01,
+                             func: FunctionLike = None) -> Generator[float, None, None]:
     """
     Генерирует значения функции f(x) в диапазоне [a, b] с заданным шагом.
+    func — вычисляемая функция: вызываемый объект или строка-выражение
+    (например, "0.1x^2 + 5x - 2", см. app.expressions). По умолчанию f.
+    Точки строятся по индексу (x = a + i * step, см. app.grid.Grid),
+    поэтому их количество известно заранее и не зависит от ошибок округления.
     Исключительные ситуации:
     - Если step <= 0, выдает ValueError.
     - Если a > b, выдает ValueError.
-    - Исключительные ситуации при вычислении f(x) (например, деление на ноль, если бы оно было)
-      будут вызваны напрямую Python (например, OverflowError, TypeError),
-      но в данной функции f(x) они маловероятны.
+    - Если строка-выражение некорректна, выдает ExpressionError (подкласс ValueError).
+    - Исключительные ситуации при вычислении f(x) (например, деление на ноль)
+      выводятся в stderr, а такие точки пропускаются.
     """
-    if step <= 0:
-        raise ValueError("Шаг (step) должен быть положительным.")
-    if a > b:
-        raise ValueError("Начальное значение диапазона (a) не может быть больше конечного (b).")
+    yield from generate_grid_values(Grid(a, b, step), func)
 
-    current_x = a
-    while current_x <= b:
+def generate_grid_values(grid: Grid, func: FunctionLike = None) -> Generator[float, None, None]:
+    """
+    Генерирует значения функции func (по умолчанию f) в точках сетки grid (в том числе ее среза).
+    Позволяет начать вычисление с любого индекса, не проходя сетку с начала.
+    Если включены метрики (app.metrics), проход учитывается в замере "function_values",
+    а ошибки вычисления — в счетчике "function_values.errors".
+    """
+    return metrics.measured("function_values", _iter_grid_values(grid, _resolve(func)))
+
+def _iter_grid_values(grid: Grid, function: Callable[[float], float]) -> Generator[float, None, None]:
+    for x in grid:
         try:
-            value = f(current_x)
+            value = function(x)
             yield value
         except Exception as e:
             # Обрабатываем любые возможные ошибки при вычислении функции
-            print(f"Ошибка при вычислении f({current_x}): {e}", file=sys.stderr)
+            report_error(x, e)
             # Можно решить, что делать дальше: пропустить, остановить генератор
             # В данном случае, просто пропустим это значение и продолжим
-        current_x += step
+
+def _iter_filled_values(grid: Grid, function: Callable[[float], float], fill: float) -> Generator[float, None, None]:
+    for x in grid:
+        try:
+            yield function(x)
+        except Exception as e:
+            report_error(x, e)
+            yield fill
+
+def report_error(x: float, error: Exception) -> None:
+    """Сообщает об ошибке вычисления в точке x (в stderr и в метрики)."""
+    print(f"Ошибка при вычислении f({x}): {error}", file=sys.stderr)
+    recorder = metrics.current()
+    if recorder is not None:
+        recorder.count("function_values.errors")
+
+def report_errors(count: int, first_x: float) -> None:
+    """
+    Сообщает об ошибках вычисления сразу в count точках (первая — first_x) одной строкой
+    в stderr; в метриках учитывается каждая точка. Для векторного и адаптивного режимов.
+    """
+    print(f"Ошибка при вычислении f(x) в {count} точках, первая x={first_x}", file=sys.stderr)
+    recorder = metrics.current()
+    if recorder is not None:
+        recorder.count("function_values.errors", count)
+
+def generate_function_value_batches(a: float, b: float, step: float = 0.01,
+                                    batch_size: int = DEFAULT_BATCH_SIZE,
+                                    func: FunctionLike = None,
+                                    fill: Optional[float] = None) -> Generator[array, None, None]:
+    """
+    Генерирует значения функции func (по умолчанию f) в диапазоне [a, b] пакетами
+    по batch_size точек. Каждый пакет — компактный массив array('d'):
+    его можно передать как список чисел или записать как упакованные
+    float64 (batch.tobytes()).
+    Исключительные ситуации:
+    - Если step <= 0, a > b или batch_size <= 0, выдает ValueError.
+    - Точки, в которых функция выдает исключение, пропускаются, как в generate_function_values
+      (поэтому пакет с такими точками короче batch_size). Если задано fill, такие точки
+      не пропускаются, а получают значение fill (например, nan), и номер значения
+      всегда совпадает с номером точки сетки.
+    Если включены метрики, время вычисления каждого пакета учитывается в замере "function_value_batches".
+    """
+    if batch_size <= 0:
+        raise ValueError("Размер пакета (batch_size) должен быть положительным.")
+    grid = Grid(a, b, step)
+    function = _resolve(func)
+    recorder = metrics.current()
+    for start in range(0, len(grid), batch_size):
+        started = time.perf_counter() if recorder is not None else 0.0
+        batch = _grid_value_batch(grid[start:start + batch_size], function, fill)
+        if recorder is not None:
+            recorder.record("function_value_batches", time.perf_counter() - started, len(batch))
+        if batch:
+            yield batch
+
+def _grid_value_batch(part: Grid, function: Callable[[float], float], fill: Optional[float] = None) -> array:
+    """Значения функции на участке сетки (точки с ошибками пропускаются или получают значение fill)."""
+    try:
+        return array("d", [function(x) for x in part])
+    except Exception:
+        # В пакете есть точки с ошибками — вычисляем его поточечно, пропуская их или заменяя на fill
+        if fill is None:
+            return array("d", _iter_grid_values(part, function))
+        return array("d", _iter_filled_values(part, function, fill))
+
+def _grid_point_batch(part: Grid, function: Callable[[float], float]) -> Tuple[array, array]:
+    """Точки участка сетки и значения функции в них (точки с ошибками пропускаются)."""
+    xs = array("d", part)
+    try:
+        return xs, array("d", map(function, xs))
+    except Exception:
+        pass
+    kept, ys = array("d"), array("d")
+    for x in xs:
+        try:
+            y = function(x)
+        except Exception as e:
+            report_error(x, e)
+            continue
+        kept.append(x)
+        ys.append(y)
+    return kept, ys
+
+def generate_function_point_batches(a: float, b: float, step: float = 0.01,
+                                    batch_size: int = DEFAULT_BATCH_SIZE,
+                                    func: FunctionLike = None) -> Generator[Tuple[array, array], None, None]:
+    """
+    Как generate_function_value_batches, но выдает пары массивов (xs, ys):
+    точки и значения в них. Точки, в которых функция выдает исключение,
+    пропускаются в обоих массивах, поэтому xs[i] всегда соответствует ys[i].
+    Исключительные ситуации:
+    - Если step <= 0, a > b или batch_size <= 0, выдает ValueError.
+    """
+    if batch_size <= 0:
+        raise ValueError("Размер пакета (batch_size) должен быть положительным.")
+    grid = Grid(a, b, step)
+    function = _resolve(func)
+    for start in range(0, len(grid), batch_size):
+        xs, ys = _grid_point_batch(grid[start:start + batch_size], function)
+        if ys:
+            yield xs, ys
 
 # --- Использование генераторов ---
 if __name__ == "__main__":
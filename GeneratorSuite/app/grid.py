@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import math
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterator, Union, overload
+
+# --- Сетка точек для Задания 2 ---
+#
+# Точки строятся от целого индекса: x = a + i * step. В отличие от
+# накопления current_x += step, ошибка округления не растет с номером
+# точки, а количество точек известно заранее.
+
+# Допуск при проверке, попадает ли b на сетку: (b - a) / step считается
+# целым, если отличается от целого не больше чем на max(ATOL, RTOL * q).
+_COUNT_ATOL = 1e-9
+_COUNT_RTOL = 1e-12
+
+def validate_range(a: float, b: float, step: float) -> None:
+    """
+    Проверяет параметры диапазона [a, b] и шага.
+    Исключительные ситуации:
+    - Если step <= 0, выдает ValueError.
+    - Если a > b, выдает ValueError.
+    """
+    if step <= 0:
+        raise ValueError("Шаг (step) должен быть положительным.")
+    if a > b:
+        raise ValueError("Начальное значение диапазона (a) не может быть больше конечного (b).")
+
+def point_count(a: float, b: float, step: float) -> int:
+    """
+    Возвращает количество точек сетки a + i * step, не превышающих b.
+    Исключительные ситуации:
+    - Некорректные a, b, step приводят к ValueError (см. validate_range).
+    """
+    validate_range(a, b, step)
+    q = (b - a) / step
+    return math.floor(q + max(_COUNT_ATOL, _COUNT_RTOL * q)) + 1
+
+class Grid:
+    """
+    Равномерная сетка x = a + i * step на отрезке [a, b].
+    Поддерживает len(), доступ по индексу grid[i] и срезы grid[i:j],
+    которые возвращают новую сетку с теми же значениями x.
+    """
+
+    def __init__(self, a: float, b: float, step: float = 0.01):
+        self.a = a
+        self.b = b
+        self.step = step
+        self.indices = range(point_count(a, b, step))
+
+    @classmethod
+    def _from_indices(cls, a: float, b: float, step: float, indices: range) -> "Grid":
+        grid = cls.__new__(cls)
+        grid.a = a
+        grid.b = b
+        grid.step = step
+        grid.indices = indices
+        return grid
+
+    def x(self, index: int) -> float:
+        """Возвращает координату точки с индексом index исходной сетки (без учета среза)."""
+        return self.a + index * self.step
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    if TYPE_CHECKING:
+        @overload
+        def __getitem__(self, item: int) -> float: ...
+        @overload
+        def __getitem__(self, item: slice) -> "Grid": ...
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[float, "Grid"]:
+        if isinstance(item, slice):
+            return Grid._from_indices(self.a, self.b, self.step, self.indices[item])
+        try:
+            return self.x(self.indices[item])
+        except IndexError:
+            raise IndexError("Индекс точки вне сетки.") from None
+
+    def __iter__(self) -> Iterator[float]:
+        a, step = self.a, self.step
+        for i in self.indices:
+            yield a + i * step
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Grid):
+            return NotImplemented
+        return (self.a, self.step, self.indices) == (other.a, other.step, other.indices)
+
+    def __hash__(self) -> int:
+        return hash((self.a, self.step, self.indices))
+
+    def __repr__(self) -> str:
+        return f"Grid(a={self.a}, b={self.b}, step={self.step}, indices={self.indices})"
@@ -1,3 +1,20 @@
+import mmap
+import os
+import re
+import sys
+import time
+from array import array
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import TYPE_CHECKING, Any, Callable, Deque, Generator, Iterable, List, Optional, Tuple, TypeVar
+
+from app.grid import Grid
+
+# Пул процессов (и multiprocessing) загружается только при первом использовании
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+    from app.expressions import FunctionLike
+
 class AppError(Exception):
     """Базовый класс для всех исключений приложения."""
     pass
@@ -12,4 +29,222 @@ class PetNotFoundError(AppError):
 
 class DatabaseError(AppError):
     """Исключение для ошибок, связанных с базой данных."""
-    pass
\ No newline at end of file
+    pass
+
+T = TypeVar("T")
+
+def iter_ordered(executor: Executor, function: Callable[..., T], calls: Iterable[Tuple[Any, ...]],
+                 window: int) -> Generator[T, None, None]:
+    """
+    Выполняет function(*args) для каждого набора аргументов из calls на executor
+    и генерирует результаты в исходном порядке.
+    Одновременно в работе держится не более window задач, поэтому память
+    не растет вместе с количеством задач.
+    """
+    calls = iter(calls)
+    pending: Deque[Future] = deque()
+
+    def submit_next() -> None:
+        args = next(calls, None)
+        if args is not None:
+            pending.append(executor.submit(function, *args))
+
+    for _ in range(window):
+        submit_next()
+    try:
+        while pending:
+            result = pending.popleft().result()
+            submit_next()
+            yield result
+    finally:
+        # Если потребитель остановился раньше, отменяем еще не начатые задачи
+        for future in pending:
+            future.cancel()
+
+# --- Задание 2: параллельное вычисление значений функции ---
+#
+# Сетка [a, b] делится на диапазоны индексов (шарды), каждый шард считается
+# в отдельном процессе, результаты собираются обратно в исходном порядке.
+
+DEFAULT_SHARD_SIZE = 100_000
+
+def split_into_shards(count: int, shard_size: int) -> List[range]:
+    """
+    Делит индексы 0..count-1 на последовательные диапазоны длиной не более shard_size.
+    Исключительные ситуации:
+    - Если shard_size <= 0, выдает ValueError.
+    """
+    if shard_size <= 0:
+        raise ValueError("Размер шарда (shard_size) должен быть положительным.")
+    return [range(start, min(start + shard_size, count)) for start in range(0, count, shard_size)]
+
+def compute_shard(a: float, b: float, step: float, start: int, stop: int, func: "FunctionLike") -> array:
+    """
+    Вычисляет значения func(x) для индексов [start, stop) сетки Grid(a, b, step).
+    Выполняется в дочернем процессе, поэтому объявлена на уровне модуля;
+    func должна передаваться между процессами (строка-выражение или функция модуля).
+    Результат возвращается компактным массивом array('d').
+    """
+    from app.generators import generate_grid_values
+    return array("d", generate_grid_values(Grid(a, b, step)[start:stop], func))
+
+class ShardedSweepExecutor:
+    """
+    Параллельно вычисляет значения generate_function_values на ProcessPoolExecutor.
+    Пример:
+        with ShardedSweepExecutor(max_workers=4) as executor:
+            values = executor.collect(-5, 7, 0.01)
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, shard_size: int = DEFAULT_SHARD_SIZE):
+        if max_workers is not None and max_workers <= 0:
+            raise ValueError("Количество процессов (max_workers) должно быть положительным.")
+        if shard_size <= 0:
+            raise ValueError("Размер шарда (shard_size) должен быть положительным.")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.shard_size = shard_size
+        self._pool: Optional["ProcessPoolExecutor"] = None
+
+    def _get_pool(self) -> "ProcessPoolExecutor":
+        if self._pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def iter_shards(self, a: float, b: float, step: float = 0.01,
+                    func: "FunctionLike" = None) -> Generator[array, None, None]:
+        """
+        Генерирует результаты шардов в исходном порядке по мере их готовности.
+        Одновременно в работе держится не более 2 * max_workers шардов,
+        поэтому память не растет вместе с длиной диапазона.
+        Исключительные ситуации:
+        - Если step <= 0 или a > b, выдает ValueError.
+        """
+        grid = Grid(a, b, step)
+        shards = split_into_shards(len(grid), self.shard_size)
+        calls = ((a, b, step, shard.start, shard.stop, func) for shard in shards)
+        yield from iter_ordered(self._get_pool(), compute_shard, calls, 2 * self.max_workers)
+
+    def iter_values(self, a: float, b: float, step: float = 0.01,
+                    func: "FunctionLike" = None) -> Generator[float, None, None]:
+        """Генерирует значения func(x) (по умолчанию f) по одному в исходном порядке (потоковый режим)."""
+        for shard_values in self.iter_shards(a, b, step, func):
+            yield from shard_values
+
+    def collect(self, a: float, b: float, step: float = 0.01, func: "FunctionLike" = None) -> array:
+        """Вычисляет все значения func(x) (по умолчанию f) и возвращает их одним массивом array('d')."""
+        result = array("d")
+        for shard_values in self.iter_shards(a, b, step, func):
+            result.extend(shard_values)
+        return result
+
+    def shutdown(self) -> None:
+        """Останавливает пул процессов."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self) -> "ShardedSweepExecutor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.shutdown()
+
+# --- Задание 3: параллельная фильтрация большого файла городов ---
+#
+# Файл в UTF-8 отображается в память (mmap) и делится на диапазоны байтов,
+# границы которых сдвигаются на ближайший пробельный ASCII-символ. В UTF-8
+# такие байты не встречаются внутри многобайтовых символов, поэтому каждый
+# диапазон декодируется независимо. Дочерние процессы сами отображают файл
+# в память и получают только границы диапазона, данные между процессами не копируются.
+# Длина названия считается в символах Unicode (len(city) > min_length),
+# как в filter_cities_by_length: "Ярославль" — 9 символов, хотя 18 байтов.
+
+DEFAULT_RANGE_BYTES = 16 * 1024 * 1024
+
+# Байты, которые str.split() считает пробельными и которые в UTF-8 однобайтовые
+_WHITESPACE_BYTE = re.compile(rb"[ \t\n\r\x0b\x0c\x1c-\x1f]")
+
+def split_file_ranges(path: str, parts: int) -> List[Tuple[int, int]]:
+    """
+    Делит файл на не более чем parts диапазонов байтов [start, stop),
+    границы которых приходятся на пробельные символы.
+    Исключительные ситуации:
+    - Если parts <= 0, выдает ValueError.
+    """
+    if parts <= 0:
+        raise ValueError("Количество диапазонов (parts) должно быть положительным.")
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        boundaries = [0]
+        for i in range(1, parts):
+            position = max(size * i // parts, boundaries[-1])
+            match = _WHITESPACE_BYTE.search(mapped, position)
+            boundary = match.start() if match else size
+            if boundary >= size:
+                break
+            if boundary > boundaries[-1]:
+                boundaries.append(boundary)
+    boundaries.append(size)
+    return list(zip(boundaries, boundaries[1:]))
+
+def _filter_file_range(path: str, start: int, stop: int, min_length: int) -> List[str]:
+    """
+    Фильтрует названия городов в диапазоне байтов [start, stop) файла path.
+    Выполняется в дочернем процессе, поэтому объявлена на уровне модуля.
+    """
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        text = str(mapped[start:stop], "utf-8")
+    return [city for city in text.split() if len(city) > min_length]
+
+def filter_cities_parallel(path: str, min_length: int = 5, max_workers: Optional[int] = None,
+                           range_bytes: int = DEFAULT_RANGE_BYTES) -> Generator[str, None, None]:
+    """
+    Фильтрует названия городов длиной более min_length из файла path в UTF-8
+    на нескольких процессах и возвращает их в исходном порядке.
+    Файл делится на диапазоны не больше range_bytes байтов (но не меньше
+    одного диапазона на процесс).
+    Исключительные ситуации:
+    - Если min_length < 0, выдает ValueError.
+    - Если файл не в кодировке UTF-8, выдает UnicodeDecodeError.
+    """
+    if min_length < 0:
+        raise ValueError("Минимальная длина (min_length) не может быть отрицательной.")
+    if range_bytes <= 0:
+        raise ValueError("Размер диапазона (range_bytes) должен быть положительным.")
+    workers = max_workers or os.cpu_count() or 1
+    parts = max(workers, -(-os.path.getsize(path) // range_bytes))
+    ranges = split_file_ranges(path, parts)
+    if not ranges:
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        calls = ((path, start, stop, min_length) for start, stop in ranges)
+        for cities in iter_ordered(executor, _filter_file_range, calls, 2 * workers):
+            yield from cities
+
+# --- Сравнение синхронного и параллельного вычисления ---
+if __name__ == "__main__":
+    from app.generators import generate_function_values
+
+    a_param, b_param, step_param = -5000.0, 5000.0, 0.001
+
+    started = time.perf_counter()
+    sync_values = array("d", generate_function_values(a_param, b_param, step_param))
+    sync_time = time.perf_counter() - started
+    print(f"Синхронно: {len(sync_values)} значений за {sync_time:.2f} с")
+
+    with ShardedSweepExecutor() as executor:
+        started = time.perf_counter()
+        parallel_values = executor.collect(a_param, b_param, step_param)
+        parallel_time = time.perf_counter() - started
+    print(f"multiprocessing ({executor.max_workers} процессов): "
+          f"{len(parallel_values)} значений за {parallel_time:.2f} с")
+
+    if parallel_values != sync_values:
+        print("Ошибка: результаты параллельного и синхронного вычисления различаются.", file=sys.stderr)
+    else:
+        print(f"Ускорение: {sync_time / parallel_time:.2f}x")
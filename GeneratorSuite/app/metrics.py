@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import time
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Generator, Iterable, List, Optional, TypeVar
+    T = TypeVar("T")
+
+# --- Метрики горячих участков (по запросу) ---
+#
+# Пока метрики выключены, current() возвращает None и инструментированный
+# код идет по обычному пути: проверка выполняется один раз на вызов
+# генератора или на пакет, а не на каждый элемент. Включаются метрики
+# контекстным менеджером collect_metrics() (или enable()/disable()),
+# после чего консоль, UI и тесты читают их через snapshot().
+#
+# Имена метрик:
+# - счетчики (count): количество событий, например "function_values.errors";
+# - замеры (record): длительность операции и число обработанных элементов,
+#   например "function_values" (весь проход генератора) или "job.batch" (один пакет);
+# - показатели (gauge): текущее и максимальное значение, например "scheduler.pending".
+#
+# Время прохода генератора — это время от первого до последнего элемента,
+# включая работу потребителя между обращениями к next().
+
+class MetricsRecorder:
+    """Потокобезопасный набор счетчиков, замеров и показателей."""
+
+    def __init__(self):
+        from threading import Lock # Нужен только при включенных метриках
+        self._lock = Lock()
+        self._counters: Dict[str, int] = {}
+        self._timings: Dict[str, List[float]] = {} # [количество, сумма, минимум, максимум, элементы]
+        self._gauges: Dict[str, List[float]] = {} # [текущее, максимум]
+        self.started = time.perf_counter()
+        self.profile = None # pstats.Stats, если включен режим profile
+        self.memory: Optional[Dict[str, Any]] = None # Итоги tracemalloc, если включен режим trace_memory
+
+    def count(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def record(self, name: str, seconds: float, items: int = 0) -> None:
+        """Добавляет замер операции name длительностью seconds, обработавшей items элементов."""
+        with self._lock:
+            timing = self._timings.get(name)
+            if timing is None:
+                self._timings[name] = [1, seconds, seconds, seconds, items]
+            else:
+                timing[0] += 1
+                timing[1] += seconds
+                timing[2] = min(timing[2], seconds)
+                timing[3] = max(timing[3], seconds)
+                timing[4] += items
+
+    def gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            gauge = self._gauges.get(name)
+            if gauge is None:
+                self._gauges[name] = [value, value]
+            else:
+                gauge[0] = value
+                gauge[1] = max(gauge[1], value)
+
+    def counter(self, name: str) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Возвращает текущие значения метрик:
+        {"elapsed_s", "counters", "timings": {имя: {count, total_s, mean_s, min_s, max_s, items, items_per_s}},
+         "gauges": {имя: {value, max}}, "cache": {hits, misses, hit_rate}}.
+        """
+        with self._lock:
+            timings = {}
+            for name, (count, total, shortest, longest, items) in self._timings.items():
+                timings[name] = {
+                    "count": count,
+                    "total_s": total,
+                    "mean_s": total / count,
+                    "min_s": shortest,
+                    "max_s": longest,
+                    "items": items,
+                    "items_per_s": items / total if total > 0 else None,
+                }
+            hits = self._counters.get("cache.hits", 0)
+            misses = self._counters.get("cache.misses", 0)
+            return {
+                "elapsed_s": time.perf_counter() - self.started,
+                "counters": dict(self._counters),
+                "timings": timings,
+                "gauges": {name: {"value": value, "max": peak} for name, (value, peak) in self._gauges.items()},
+                "cache": {"hits": hits, "misses": misses,
+                          "hit_rate": hits / (hits + misses) if hits + misses else None},
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
+            self._gauges.clear()
+            self.started = time.perf_counter()
+
+    def profile_report(self, limit: int = 20) -> str:
+        """Возвращает текст отчета cProfile (сортировка по собственному времени) или пустую строку."""
+        if self.profile is None:
+            return ""
+        import io
+        stream = io.StringIO()
+        self.profile.stream = stream
+        self.profile.sort_stats("tottime").print_stats(limit)
+        return stream.getvalue()
+
+# Активный набор метрик; None — метрики выключены
+_active: Optional[MetricsRecorder] = None
+
+def current() -> Optional[MetricsRecorder]:
+    """Возвращает активный набор метрик или None, если метрики выключены."""
+    return _active
+
+def enable(recorder: Optional[MetricsRecorder] = None) -> MetricsRecorder:
+    """Включает сбор метрик (во всех потоках) и возвращает активный набор."""
+    global _active
+    _active = recorder if recorder is not None else MetricsRecorder()
+    return _active
+
+def disable() -> None:
+    """Выключает сбор метрик."""
+    global _active
+    _active = None
+
+class collect_metrics:
+    """
+    Контекстный менеджер: включает сбор метрик на время блока with и возвращает набор метрик.
+    profile=True — дополнительно профилирует текущий поток через cProfile (см. profile_report),
+    trace_memory=True — отслеживает выделения памяти через tracemalloc (итоги в recorder.memory).
+    По выходе из блока восстанавливается предыдущий активный набор метрик.
+    Пример:
+        with collect_metrics() as metrics:
+            list(generate_function_values(-5, 7))
+        print(metrics.snapshot()["timings"]["function_values"]["items_per_s"])
+    """
+
+    def __init__(self, profile: bool = False, trace_memory: bool = False):
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self._previous: Optional[MetricsRecorder] = None
+        self._recorder: Optional[MetricsRecorder] = None
+        self._profiler = None
+
+    def __enter__(self) -> MetricsRecorder:
+        self._previous = _active
+        self._recorder = enable()
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+        if self.profile:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self._recorder
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        recorder = self._recorder
+        if self._profiler is not None:
+            import pstats
+            self._profiler.disable()
+            recorder.profile = pstats.Stats(self._profiler)
+            self._profiler = None
+        if self.trace_memory:
+            import tracemalloc
+            current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics("lineno")[:10]
+            tracemalloc.stop()
+            recorder.memory = {"current_bytes": current_bytes, "peak_bytes": peak_bytes,
+                               "top": [str(stat) for stat in top]}
+        if self._previous is not None:
+            enable(self._previous)
+        else:
+            disable()
+
+def measured(name: str, iterable: Iterable[T]) -> Iterable[T]:
+    """
+    Если метрики включены, возвращает генератор, который считает элементы iterable
+    и по завершении добавляет замер name; иначе возвращает iterable без изменений.
+    """
+    recorder = _active
+    return iterable if recorder is None else _measure(recorder, name, iterable)
+
+def _measure(recorder: MetricsRecorder, name: str, iterable: Iterable[T]) -> Generator[T, None, None]:
+    items = 0
+    started = time.perf_counter()
+    try:
+        for item in iterable:
+            items += 1
+            yield item
+    finally:
+        recorder.record(name, time.perf_counter() - started, items)
+
+def format_snapshot(snapshot: Dict[str, Any]) -> str:
+    """Форматирует snapshot() для вывода в консоль или окно UI."""
+    lines = [f"Время сбора: {snapshot['elapsed_s']:.2f} с"]
+    for name, timing in sorted(snapshot["timings"].items()):
+        rate = f", {timing['items_per_s']:.0f} эл./с" if timing["items_per_s"] else ""
+        lines.append(f"{name}: {timing['count']} раз, {timing['items']} эл., "
+                     f"в среднем {timing['mean_s'] * 1000:.3f} мс (макс. {timing['max_s'] * 1000:.3f} мс){rate}")
+    for name, value in sorted(snapshot["counters"].items()):
+        lines.append(f"{name}: {value}")
+    for name, gauge in sorted(snapshot["gauges"].items()):
+        lines.append(f"{name}: {gauge['value']:g} (макс. {gauge['max']:g})")
+    cache = snapshot["cache"]
+    if cache["hit_rate"] is not None:
+        lines.append(f"Кэш: попаданий {cache['hits']}, промахов {cache['misses']}, доля {cache['hit_rate']:.0%}")
+    return "\n".join(lines)
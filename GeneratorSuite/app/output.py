@@ -0,0 +1,102 @@
+import json
+import sys
+from array import array
+from typing import BinaryIO, Iterable, Optional, Sequence, Tuple
+
+# --- Потоковый вывод результатов пакетами ---
+#
+# Каждый пакет результатов преобразуется в байты целиком и записывается
+# одной операцией write в буферизованный двоичный поток, поэтому вывод
+# миллионов значений упирается в скорость диска или канала, а не в print.
+#
+# Форматы:
+# - text   — по одному значению в строке;
+# - csv    — строка заголовка и строки значений (для функции — столбцы x,y);
+# - ndjson — по одному JSON-объекту в строке ({"x": ..., "y": ...}, {"word": ...}, {"city": ...});
+# - binary — значения функции как упакованные float64 (порядок байтов платформы,
+#   как array('d').tobytes()), строки — в UTF-8, каждая завершается байтом 0.
+
+FORMATS = ("text", "csv", "ndjson", "binary")
+OUTPUT_BUFFER_SIZE = 1024 * 1024
+
+def open_output(path: Optional[str]) -> BinaryIO:
+    """Открывает файл path для записи (None или "-" — стандартный вывод) с большим буфером."""
+    if path is None or path == "-":
+        return sys.stdout.buffer
+    return open(path, "wb", buffering=OUTPUT_BUFFER_SIZE)
+
+def _check_format(fmt: str) -> None:
+    if fmt not in FORMATS:
+        raise ValueError(f"Неизвестный формат вывода: {fmt}. Допустимые: {', '.join(FORMATS)}.")
+
+def _number_formatter(precision: Optional[int]):
+    return repr if precision is None else f"{{:.{precision}f}}".format
+
+def _csv_field(text: str) -> str:
+    if any(symbol in text for symbol in ',"\r\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+def encode_strings(batch: Sequence[str], fmt: str, field: str) -> bytes:
+    """Преобразует пакет строк в байты формата fmt; field — имя поля в csv/ndjson."""
+    _check_format(fmt)
+    if not batch:
+        return b""
+    if fmt == "binary":
+        return "\0".join(batch).encode("utf-8") + b"\0"
+    if fmt == "csv":
+        lines = map(_csv_field, batch)
+    elif fmt == "ndjson":
+        prefix = '{"' + field + '": '
+        lines = (prefix + json.dumps(item, ensure_ascii=False) + "}" for item in batch)
+    else:
+        lines = batch
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+def encode_points(xs: Sequence[float], ys: array, fmt: str, precision: Optional[int] = None) -> bytes:
+    """
+    Преобразует пакет точек функции в байты формата fmt.
+    text и binary содержат только значения ys, csv и ndjson — пары x, y.
+    precision — количество знаков после запятой для text/csv (None — без округления, repr).
+    """
+    _check_format(fmt)
+    if not len(ys):
+        return b""
+    if fmt == "binary":
+        return ys.tobytes()
+    number = _number_formatter(precision)
+    if fmt == "text":
+        lines = map(number, ys)
+    elif fmt == "csv":
+        lines = (number(x) + "," + number(y) for x, y in zip(xs, ys))
+    else:
+        lines = ('{"x": ' + repr(x) + ', "y": ' + _json_number(y) + "}" for x, y in zip(xs, ys))
+    return ("\n".join(lines) + "\n").encode("ascii")
+
+def _json_number(value: float) -> str:
+    # inf и nan не являются числами JSON
+    return repr(value) if value - value == 0 else "null"
+
+def header(fmt: str, fields: Sequence[str]) -> bytes:
+    """Строка заголовка для csv (для остальных форматов — пустая)."""
+    _check_format(fmt)
+    return (",".join(fields) + "\n").encode("ascii") if fmt == "csv" else b""
+
+def write_string_batches(stream: BinaryIO, batches: Iterable[Sequence[str]], fmt: str, field: str) -> int:
+    """Записывает пакеты строк в stream в формате fmt и возвращает количество записанных строк."""
+    stream.write(header(fmt, (field,)))
+    count = 0
+    for batch in batches:
+        stream.write(encode_strings(batch, fmt, field))
+        count += len(batch)
+    return count
+
+def write_point_batches(stream: BinaryIO, batches: Iterable[Tuple[array, array]], fmt: str,
+                        precision: Optional[int] = None) -> int:
+    """Записывает пакеты точек (xs, ys) в stream в формате fmt и возвращает количество точек."""
+    stream.write(header(fmt, ("x", "y")))
+    count = 0
+    for xs, ys in batches:
+        stream.write(encode_points(xs, ys, fmt, precision))
+        count += len(ys)
+    return count
@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+from functools import lru_cache, reduce
+from itertools import islice
+from operator import itemgetter
+from typing import (
+    TYPE_CHECKING, Any, Callable, Generator, Iterable, List, Optional, Sequence, TextIO, Tuple, Union
+)
+
+from app.generators import DEFAULT_BATCH_SIZE
+
+if TYPE_CHECKING:
+    from app.expressions import FunctionLike
+
+Stage = Tuple[str, Any]
+
+# --- Ленивые цепочки генераторов ---
+#
+# Pipeline описывает источник пакетов (списков или array('d')) и цепочку стадий.
+# Ничего не вычисляется до вызова завершающей операции (collect, count, argmin, sink, ...).
+# Пример:
+#     Pipeline.cities(text).filter(lambda city: len(city) > 5).dedupe(str.casefold).take(3).collect()
+#     Pipeline.sweep(-5, 7, 0.01).filter(lambda point: point[1] > 0).argmin()
+#
+# Соседние поэлементные стадии (map, filter, dedupe) сливаются в одно списковое
+# включение, которое компилируется один раз на набор стадий: каждый пакет
+# проходится один раз, без промежуточных списков и генераторов на каждую стадию.
+# take(n) прекращает чтение источника, как только набрано n элементов; если перед
+# take стоят только map, ограничение применяется до них, и лишние элементы не вычисляются.
+# Pipeline неизменяем: каждая стадия возвращает новый объект, поэтому общую
+# часть цепочки можно переиспользовать. Повторный запуск заново читает источник
+# (источник из одноразового итератора можно пройти только один раз).
+
+_ELEMENTWISE = ("map", "filter", "dedupe")
+
+def chunked(items: Iterable[Any], size: int) -> Generator[List[Any], None, None]:
+    """
+    Собирает элементы items в списки по size штук (последний может быть короче).
+    Исключительные ситуации:
+    - Если size <= 0, выдает ValueError.
+    """
+    if size <= 0:
+        raise ValueError("Размер пакета (batch_size) должен быть положительным.")
+    items = iter(items)
+    while True:
+        batch = list(islice(items, size))
+        if not batch:
+            return
+        yield batch
+
+def limit_batches(batches: Iterable[Sequence[Any]], limit: Optional[int]) -> Generator[Sequence[Any], None, None]:
+    """
+    Обрезает поток пакетов так, чтобы в сумме было не более limit элементов (None — без ограничения).
+    Следующий пакет не запрашивается, как только набрано limit элементов.
+    """
+    if limit is None:
+        yield from batches
+        return
+    remaining = limit
+    if remaining <= 0:
+        return
+    for batch in batches:
+        if len(batch) >= remaining:
+            yield batch[:remaining]
+            return
+        remaining -= len(batch)
+        yield batch
+
+@lru_cache(maxsize=64)
+def _fused_code(signature: Tuple[Tuple[str, bool], ...]):
+    """
+    Компилирует функцию пакета для цепочки поэлементных стадий signature
+    (вид стадии, есть ли функция). Пример для filter, map:
+        lambda batch: [v1 for v in batch if f0(v) for v1 in (f1(v),)]
+    """
+    clauses = []
+    current = "v"
+    for i, (kind, has_function) in enumerate(signature):
+        if kind == "map":
+            clauses.append(f"for v{i} in (f{i}({current}),)")
+            current = f"v{i}"
+        elif kind == "filter":
+            clauses.append(f"if f{i}({current})")
+        else:
+            key = current
+            if has_function:
+                clauses.append(f"for k{i} in (f{i}({current}),)")
+                key = f"k{i}"
+            # set.add возвращает None, поэтому новый ключ добавляется и проходит фильтр
+            clauses.append(f"if not ({key} in s{i} or a{i}({key}))")
+    source = f"lambda batch: [{current} for v in batch {' '.join(clauses)}]"
+    return compile(source, "<pipeline>", "eval")
+
+def _fuse(stages: Sequence[Stage]) -> Callable[[Sequence[Any]], List[Any]]:
+    """Сливает поэлементные стадии в одну функцию пакета (состояние dedupe — новое на каждый запуск)."""
+    namespace = {"__builtins__": {}}
+    for i, (kind, function) in enumerate(stages):
+        if function is not None:
+            namespace[f"f{i}"] = function
+        if kind == "dedupe":
+            seen = set()
+            namespace[f"s{i}"] = seen
+            namespace[f"a{i}"] = seen.add
+    signature = tuple((kind, function is not None) for kind, function in stages)
+    return eval(_fused_code(signature), namespace)
+
+def _apply(function: Callable[[Sequence[Any]], List[Any]],
+           batches: Iterable[Sequence[Any]]) -> Generator[List[Any], None, None]:
+    for batch in batches:
+        result = function(batch)
+        if result:
+            yield result
+
+class Pipeline:
+    """
+    Ленивая цепочка стадий над пакетами результатов.
+    Источники: from_iterable, from_batches, combinations, values, sweep, cities, city_file.
+    Стадии: map, filter, dedupe, take. Завершающие операции: batches, collect, count,
+    first, argmin, argmax, reduce, sink.
+    """
+
+    def __init__(self, source: Callable[[], Iterable[Sequence[Any]]], stages: Tuple[Stage, ...] = (),
+                 value_key: Optional[Callable[[Any], Any]] = None):
+        """
+        source — функция без аргументов, возвращающая итерируемый объект пакетов;
+        value_key — ключ сравнения по умолчанию для argmin/argmax.
+        """
+        self._source = source
+        self._stages = stages
+        self._value_key = value_key
+
+    # --- Источники ---
+
+    @classmethod
+    def from_batches(cls, batches: Iterable[Sequence[Any]]) -> Pipeline:
+        """Источник из готовых пакетов (списков, array и т. п.)."""
+        return cls(lambda: batches)
+
+    @classmethod
+    def from_iterable(cls, items: Iterable[Any], batch_size: int = DEFAULT_BATCH_SIZE) -> Pipeline:
+        """Источник из отдельных элементов, собираемых в пакеты по batch_size."""
+        if batch_size <= 0:
+            raise ValueError("Размер пакета (batch_size) должен быть положительным.")
+        return cls(lambda: chunked(items, batch_size))
+
+    @classmethod
+    def from_iterable_factory(cls, factory: Callable[[], Iterable[Any]],
+                              batch_size: int = DEFAULT_BATCH_SIZE) -> Pipeline:
+        """Источник из элементов, которые factory() создает заново при каждом запуске."""
+        if batch_size <= 0:
+            raise ValueError("Размер пакета (batch_size) должен быть положительным.")
+        return cls(lambda: chunked(factory(), batch_size))
+
+    @classmethod
+    def combinations(cls, alphabet: Optional[str] = None, k: int = 2,
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> Pipeline:
+        """Слова длины k над алфавитом alphabet (по умолчанию малые латинские буквы), см. CombinationSpace."""
+        from app.combinations import ASCII_LOWERCASE, CombinationSpace
+        if batch_size <= 0:
+            raise ValueError("Размер пакета (batch_size) должен быть положительным.")
+        space = CombinationSpace(ASCII_LOWERCASE if alphabet is None else alphabet, k)
+        return cls(lambda: space.iter_batches(batch_size))
+
+    @classmethod
+    def values(cls, a: float, b: float, step: float = 0.01, func: FunctionLike = None,
+               batch_size: int = DEFAULT_BATCH_SIZE) -> Pipeline:
+        """Значения функции func (по умолчанию f) на [a, b] пакетами array('d'), см. generate_function_value_batches."""
+        from app.generators import generate_function_value_batches
+        from app.grid import validate_range
+        validate_range(a, b, step)
+        return cls(lambda: generate_function_value_batches(a, b, step, batch_size, func))
+
+    @classmethod
+    def sweep(cls, a: float, b: float, step: float = 0.01, func: FunctionLike = None,
+              batch_size: int = DEFAULT_BATCH_SIZE) -> Pipeline:
+        """
+        Точки функции func (по умолчанию f) на [a, b] как пары (x, y).
+        argmin() и argmax() без key сравнивают значения y.
+        Точки, в которых функция выдает исключение, пропускаются.
+        """
+        from app.generators import generate_function_point_batches
+        from app.grid import validate_range
+        validate_range(a, b, step)
+
+        def points():
+            for xs, ys in generate_function_point_batches(a, b, step, batch_size, func):
+                yield list(zip(xs, ys))
+        return cls(points, value_key=itemgetter(1))
+
+    @classmethod
+    def cities(cls, source: Union[str, Iterable[str], TextIO], batch_size: int = DEFAULT_BATCH_SIZE) -> Pipeline:
+        """
+        Названия городов из строки (через пробел), итерируемого объекта строк
+        или текстового потока (читается блоками, см. iter_city_tokens).
+        """
+        if isinstance(source, str):
+            return cls.from_iterable(source.split(), batch_size)
+        from app.city_filter import iter_city_tokens
+        return cls.from_iterable_factory(lambda: iter_city_tokens(source), batch_size)
+
+    @classmethod
+    def city_file(cls, path: str, encoding: str = "utf-8", batch_size: int = DEFAULT_BATCH_SIZE) -> Pipeline:
+        """Названия городов из текстового файла path; файл открывается при запуске и закрывается по его окончании."""
+        from app.city_filter import iter_city_tokens
+
+        def tokens():
+            with open(path, encoding=encoding) as stream:
+                yield from iter_city_tokens(stream)
+        return cls.from_iterable_factory(tokens, batch_size)
+
+    # --- Стадии ---
+
+    def _then(self, kind: str, argument: Any) -> Pipeline:
+        return Pipeline(self._source, self._stages + ((kind, argument),), self._value_key)
+
+    def map(self, function: Callable[[Any], Any]) -> Pipeline:
+        """Заменяет каждый элемент на function(элемент)."""
+        return self._then("map", function)
+
+    def filter(self, predicate: Callable[[Any], Any]) -> Pipeline:
+        """Оставляет элементы, для которых predicate истинен."""
+        return self._then("filter", predicate)
+
+    def dedupe(self, key: Optional[Callable[[Any], Any]] = None) -> Pipeline:
+        """Оставляет первое вхождение каждого элемента (или каждого значения key(элемент))."""
+        return self._then("dedupe", key)
+
+    def take(self, n: int) -> Pipeline:
+        """
+        Оставляет не более n первых элементов; источник дальше не читается.
+        Исключительные ситуации:
+        - Если n < 0, выдает ValueError.
+        """
+        if n < 0:
+            raise ValueError("Количество элементов (n) не может быть отрицательным.")
+        return self._then("take", n)
+
+    # --- Выполнение ---
+
+    def batches(self) -> Generator[Sequence[Any], None, None]:
+        """Запускает цепочку и выдает непустые пакеты результатов."""
+        batches = self._source()
+        elementwise: List[Stage] = []
+        for kind, argument in self._stages:
+            if kind in _ELEMENTWISE:
+                elementwise.append((kind, argument))
+                continue
+            # take: если перед ним только map, ограничиваем вход, чтобы не вычислять лишнее
+            if all(stage_kind == "map" for stage_kind, _ in elementwise):
+                batches = limit_batches(batches, argument)
+                if elementwise:
+                    batches = _apply(_fuse(elementwise), batches)
+            else:
+                batches = limit_batches(_apply(_fuse(elementwise), batches), argument)
+            elementwise = []
+        if elementwise:
+            batches = _apply(_fuse(elementwise), batches)
+        for batch in batches:
+            if len(batch):
+                yield batch
+
+    def __iter__(self) -> Generator[Any, None, None]:
+        for batch in self.batches():
+            yield from batch
+
+    def collect(self) -> List[Any]:
+        """Возвращает все результаты списком."""
+        result: List[Any] = []
+        for batch in self.batches():
+            result.extend(batch)
+        return result
+
+    def count(self) -> int:
+        """Возвращает количество результатов."""
+        return sum(len(batch) for batch in self.batches())
+
+    def first(self, default: Any = None) -> Any:
+        """Возвращает первый результат (или default, если результатов нет); источник дальше не читается."""
+        for batch in self.take(1).batches():
+            return batch[0]
+        return default
+
+    def _extreme(self, choose: Callable[..., Any], key: Optional[Callable[[Any], Any]]) -> Any:
+        key = key if key is not None else self._value_key
+        options = {} if key is None else {"key": key}
+        # Лучший элемент каждого пакета, затем лучший из них (min/max возвращают первый из равных)
+        winners = [choose(batch, **options) for batch in self.batches()]
+        return choose(winners, **options) if winners else None
+
+    def argmin(self, key: Optional[Callable[[Any], Any]] = None) -> Any:
+        """
+        Возвращает элемент с наименьшим значением key(элемент) (для sweep — точку (x, y)
+        с наименьшим y), первый из равных; None, если результатов нет.
+        """
+        return self._extreme(min, key)
+
+    def argmax(self, key: Optional[Callable[[Any], Any]] = None) -> Any:
+        """Как argmin, но возвращает элемент с наибольшим значением."""
+        return self._extreme(max, key)
+
+    def reduce(self, function: Callable[[Any, Any], Any], initial: Any) -> Any:
+        """Сворачивает результаты: function(...function(initial, x0)..., xn)."""
+        value = initial
+        for batch in self.batches():
+            value = reduce(function, batch, value)
+        return value
+
+    def sink(self, consumer: Callable[[Sequence[Any]], Any]) -> int:
+        """Передает каждый пакет результатов в consumer (например, stream.write) и возвращает количество результатов."""
+        count = 0
+        for batch in self.batches():
+            consumer(batch)
+            count += len(batch)
+        return count
+
+    def __repr__(self) -> str:
+        stages = "".join(f".{kind}(...)" if kind != "take" else f".take({argument})"
+                         for kind, argument in self._stages)
+        return f"Pipeline(...){stages}"
@@ -0,0 +1,254 @@
+import multiprocessing
+import threading
+from array import array
+from multiprocessing.connection import Connection
+from typing import Any, Dict, Generator, Iterable, List, Optional, Union
+
+from app.city_index import CityIndex
+from app.combinations import ASCII_LOWERCASE, CombinationSpace
+from app.generators import DEFAULT_BATCH_SIZE, generate_function_value_batches
+
+# --- Вычисления в отдельных процессах для UI ---
+#
+# Задачи 1-3 выполняются в процессах-воркерах, поэтому вычисления не держат
+# GIL процесса с интерфейсом. Каждый воркер связан с главным процессом
+# собственным каналом (Pipe): туда отправляется описание задачи, обратно
+# приходят пакеты результатов в двоичном виде — числа как упакованные
+# float64 (array('d').tobytes()), строки как UTF-8 с таблицей смещений
+# (как в app.store): количество строк n и n + 1 смещений uint64, затем данные,
+# строка i занимает [offsets[i], offsets[i + 1]) — поэтому строки могут содержать любые символы.
+# Сообщение начинается с однобайтового тега, задача завершается тегом _END.
+# Процессы запускаются методом "spawn" (fork небезопасен в процессе с потоками Qt)
+# и переиспользуются между задачами.
+
+DEFAULT_MAX_WORKERS = 3 # По одному процессу на вкладку
+SHUTDOWN_TIMEOUT = 5.0
+
+# Теги сообщений от воркера
+_FLOATS = b"D"
+_STRINGS = b"S"
+_ERROR = b"E"
+_END = b"."
+
+# Сообщение воркеру об отмене текущей задачи (None — завершение работы)
+_CANCEL = "cancel"
+
+TASKS = ("combinations", "function_values", "cities")
+
+Batch = Union[List[str], array]
+
+class RemoteTaskError(RuntimeError):
+    """Исключение, если задача в процессе-воркере завершилась ошибкой."""
+    pass
+
+def _task_batches(task: str, params: Dict[str, Any], batch_size: int) -> Iterable[Batch]:
+    """Создает генератор пакетов для задачи (выполняется в процессе-воркере)."""
+    if task == "combinations":
+        space = CombinationSpace(params.get("alphabet", ASCII_LOWERCASE), params.get("k", 2))
+        return space.iter_batches(batch_size)
+    if task == "function_values":
+        return generate_function_value_batches(params["a"], params["b"], params.get("step", 0.01),
+                                               batch_size, params.get("func"))
+    if task == "cities":
+        cities = CityIndex.from_string(params["text"]).longer_than(params.get("min_length", 5), keep_order=True)
+        return (cities[i:i + batch_size] for i in range(0, len(cities), batch_size))
+    raise ValueError(f"Неизвестная задача: {task}")
+
+def _encode(batch: Batch) -> bytes:
+    if isinstance(batch, array):
+        return _FLOATS + batch.tobytes()
+    encoded = [item.encode("utf-8") for item in batch]
+    header = array("Q", [len(encoded), 0])
+    position = 0
+    for item in encoded:
+        position += len(item)
+        header.append(position)
+    return b"".join([_STRINGS, header.tobytes(), *encoded])
+
+def _decode(message: bytes) -> Batch:
+    view = memoryview(message)[1:]
+    if message[:1] == _FLOATS:
+        values = array("d")
+        values.frombytes(view)
+        return values
+    offsets = array("Q")
+    offsets.frombytes(view[:8])
+    count = offsets.pop()
+    offsets.frombytes(view[8:8 * (count + 2)])
+    data = view[8 * (count + 2):]
+    return [str(data[offsets[i]:offsets[i + 1]], "utf-8") for i in range(count)]
+
+def _worker_main(conn: Connection) -> None:
+    """Цикл процесса-воркера: выполняет задачи по одной, пока не получит None."""
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        if request == _CANCEL: # Отмена уже завершенной задачи
+            continue
+        task, params, batch_size, limit = request
+        stop = False
+        try:
+            sent = 0
+            for batch in _task_batches(task, params, batch_size):
+                if conn.poll():
+                    message = conn.recv()
+                    stop = message is None
+                    break
+                if limit is not None:
+                    batch = batch[:limit - sent]
+                if len(batch):
+                    conn.send_bytes(_encode(batch))
+                    sent += len(batch)
+                if limit is not None and sent >= limit:
+                    break
+        except Exception as e:
+            conn.send_bytes(_ERROR + str(e).encode("utf-8"))
+        conn.send_bytes(_END)
+        if stop:
+            return
+
+class _Worker:
+    """Процесс-воркер и конец канала связи с ним."""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def stop(self, timeout: float) -> None:
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+
+class ProcessBackend:
+    """
+    Пул процессов-воркеров для задач 1-3.
+    run(task, limit, **params) возвращает генератор пакетов (списков строк или array('d')),
+    читаемых из канала воркера; закрытие генератора до конца отменяет задачу в воркере.
+    Процессы запускаются по мере необходимости, не более max_workers;
+    если все заняты, генератор ждет освобождения воркера.
+    Функция func для "function_values" должна поддерживать pickle (текст выражения,
+    CompiledFunction или функция уровня модуля).
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, batch_size: int = DEFAULT_BATCH_SIZE):
+        if max_workers <= 0:
+            raise ValueError("Количество процессов (max_workers) должно быть положительным.")
+        if batch_size <= 0:
+            raise ValueError("Размер пакета (batch_size) должен быть положительным.")
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self._context = multiprocessing.get_context("spawn")
+        self._workers: List[_Worker] = []
+        self._idle: List[_Worker] = []
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def run(self, task: str, limit: Optional[int] = None, **params: Any) -> Generator[Batch, None, None]:
+        """
+        Выполняет задачу task ("combinations", "function_values" или "cities") в процессе-воркере.
+        Параметры: combinations — alphabet, k; function_values — a, b, step, func;
+        cities — text, min_length. limit ограничивает количество результатов.
+        Исключительные ситуации:
+        - Если задача неизвестна или limit < 0, выдает ValueError.
+        - Если задача завершилась ошибкой в воркере, генератор выдает RemoteTaskError.
+        """
+        if task not in TASKS:
+            raise ValueError(f"Неизвестная задача: {task}")
+        if limit is not None and limit < 0:
+            raise ValueError("Количество результатов (limit) не может быть отрицательным.")
+        return self._run(task, params, limit)
+
+    def _run(self, task: str, params: Dict[str, Any], limit: Optional[int]) -> Generator[Batch, None, None]:
+        worker = self._acquire()
+        finished = False
+        healthy = True
+        try:
+            worker.conn.send((task, params, self.batch_size, limit))
+            error = None
+            while True:
+                message = worker.conn.recv_bytes()
+                tag = message[:1]
+                if tag == _END:
+                    finished = True
+                    break
+                if tag == _ERROR:
+                    error = message[1:].decode("utf-8")
+                    continue
+                yield _decode(message)
+            if error is not None:
+                raise RemoteTaskError(error)
+        except (EOFError, OSError):
+            healthy = False
+            raise
+        finally:
+            if not finished and healthy:
+                healthy = self._cancel(worker)
+            self._release(worker, healthy)
+
+    @staticmethod
+    def _cancel(worker: _Worker) -> bool:
+        """Отменяет задачу воркера и дочитывает канал до конца задачи; False — если воркер недоступен."""
+        try:
+            worker.conn.send(_CANCEL)
+            while worker.conn.recv_bytes()[:1] != _END:
+                pass
+            return True
+        except (EOFError, OSError):
+            return False
+
+    def _acquire(self) -> _Worker:
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Процессы-воркеры остановлены.")
+                if self._idle:
+                    return self._idle.pop()
+                if len(self._workers) < self.max_workers:
+                    worker = _Worker(self._context)
+                    self._workers.append(worker)
+                    return worker
+                self._condition.wait()
+
+    def _release(self, worker: _Worker, healthy: bool) -> None:
+        with self._condition:
+            if healthy and not self._closed:
+                self._idle.append(worker)
+            else:
+                if worker in self._workers:
+                    self._workers.remove(worker)
+                if worker.process.is_alive():
+                    worker.process.terminate()
+            self._condition.notify()
+
+    @property
+    def worker_count(self) -> int:
+        """Количество запущенных процессов-воркеров."""
+        return len(self._workers)
+
+    def shutdown(self, timeout: float = SHUTDOWN_TIMEOUT) -> None:
+        """Завершает процессы-воркеры (незавершившиеся за timeout секунд принудительно)."""
+        with self._condition:
+            self._closed = True
+            workers, self._workers, self._idle = self._workers, [], []
+            self._condition.notify_all()
+        for worker in workers:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+        for worker in workers:
+            worker.stop(timeout)
+
+    def __enter__(self) -> "ProcessBackend":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.shutdown()
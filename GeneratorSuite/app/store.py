@@ -0,0 +1,327 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from app.combinations import ASCII_LOWERCASE, CombinationSpace
+from app.expressions import CompiledFunction, FunctionLike
+from app.generators import DEFAULT_BATCH_SIZE, f, generate_function_value_batches
+from app.grid import Grid, point_count
+
+# --- Компактное хранилище результатов на диске ---
+#
+# Файл состоит из заголовка фиксированного размера, строки метаданных и данных.
+# Все числа записываются в порядке байтов little-endian, данные выровнены на 8 байт,
+# поэтому файл можно отобразить в память (mmap) и читать без копирования:
+#
+#   заголовок (_HEADER): магическое слово, версия, вид данных, количество элементов,
+#     смещение данных, смещение таблицы (для строк), a, b, step (для значений), длина метаданных;
+#   метаданные в UTF-8: для значений — идентификатор функции, для строк — JSON-объект;
+#   значения функции (KIND_VALUES): count чисел float64, i-е значение соответствует
+#     точке x = a + i * step (точки с ошибкой вычисления хранятся как nan);
+#   строки (KIND_STRINGS): названия в UTF-8 подряд, затем таблица из count + 1
+#     смещений uint64 от начала данных (строка i занимает [offsets[i], offsets[i + 1])).
+#
+# Заголовок записывается последним, поэтому незавершенный файл не открывается.
+
+MAGIC = b"GSRS"
+VERSION = 1
+KIND_VALUES = 1
+KIND_STRINGS = 2
+
+_HEADER = struct.Struct("<4sHBxQQQdddI")
+_ALIGNMENT = 8
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+class StoreFormatError(ValueError):
+    """Исключение, если файл не является хранилищем результатов или поврежден."""
+    pass
+
+def function_id(func: FunctionLike = None) -> str:
+    """
+    Возвращает идентификатор функции для заголовка: текст выражения для строк
+    и CompiledFunction, "модуль:имя" для прочих вызываемых объектов (f по умолчанию).
+    """
+    if func is None:
+        func = f
+    if isinstance(func, str):
+        return func
+    if isinstance(func, CompiledFunction):
+        return func.expression
+    module = getattr(func, "__module__", None) or "?"
+    name = getattr(func, "__qualname__", None) or type(func).__qualname__
+    return f"{module}:{name}"
+
+@contextmanager
+def _creating(path: str) -> Iterator[BinaryIO]:
+    """Открывает path для записи; если запись прервана исключением, удаляет неполный файл."""
+    stream = open(path, "wb")
+    try:
+        with stream:
+            yield stream
+    except BaseException:
+        os.remove(path)
+        raise
+
+def _padding(position: int) -> bytes:
+    return b"\0" * (-position % _ALIGNMENT)
+
+def _write_header(stream: BinaryIO, kind: int, count: int, data_offset: int, index_offset: int,
+                  a: float, b: float, step: float, meta: bytes) -> None:
+    stream.seek(0)
+    stream.write(_HEADER.pack(MAGIC, VERSION, kind, count, data_offset, index_offset, a, b, step, len(meta)))
+
+def _start(stream: BinaryIO, meta: bytes) -> int:
+    """Резервирует место под заголовок (нулями), записывает метаданные и возвращает смещение данных."""
+    stream.write(b"\0" * _HEADER.size + meta)
+    end = _HEADER.size + len(meta)
+    stream.write(_padding(end))
+    return end + len(_padding(end))
+
+def _write_float64(stream: BinaryIO, batch: Any) -> int:
+    """Записывает пакет float64 (array('d'), numpy-массив) без копирования; возвращает количество чисел."""
+    view = memoryview(batch)
+    if view.format != "d":
+        batch = array("d", batch)
+        view = memoryview(batch)
+    if not _LITTLE_ENDIAN:
+        batch = array("d", view)
+        batch.byteswap()
+        view = memoryview(batch)
+    stream.write(view.cast("B"))
+    return len(view)
+
+def write_values(path: str, batches: Iterable[Any], a: float, b: float, step: float, func_id: str) -> int:
+    """
+    Записывает в файл path значения функции на сетке [a, b] с шагом step
+    пакетами float64 (array('d') или numpy-массивы) и возвращает количество значений.
+    Исключительные ситуации:
+    - Если step <= 0 или a > b, выдает ValueError.
+    - Если количество значений не совпадает с количеством точек сетки
+      (например, точки с ошибками были пропущены), выдает ValueError.
+    """
+    expected = point_count(a, b, step)
+    meta = func_id.encode("utf-8")
+    with _creating(path) as stream:
+        data_offset = _start(stream, meta)
+        count = 0
+        for batch in batches:
+            count += _write_float64(stream, batch)
+        if count != expected:
+            raise ValueError(f"Количество значений ({count}) не совпадает с количеством точек сетки ({expected}).")
+        _write_header(stream, KIND_VALUES, count, data_offset, 0, a, b, step, meta)
+    return count
+
+def write_function_values(path: str, a: float, b: float, step: float = 0.01, func: FunctionLike = None,
+                          batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Вычисляет значения функции func (по умолчанию f) на [a, b] с шагом step и записывает их в файл path.
+    Точки, в которых функция выдает исключение, сохраняются как nan.
+    Возвращает количество значений.
+    """
+    batches = generate_function_value_batches(a, b, step, batch_size, func, fill=float("nan"))
+    return write_values(path, batches, a, b, step, function_id(func))
+
+def write_strings(path: str, batches: Iterable[Sequence[str]], meta: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Записывает в файл path пакеты строк и словарь метаданных meta (JSON)
+    и возвращает количество строк. Память на запись — 8 байт на строку (таблица смещений).
+    """
+    encoded_meta = json.dumps(meta or {}, ensure_ascii=False).encode("utf-8")
+    offsets = array("Q", [0])
+    with _creating(path) as stream:
+        data_offset = _start(stream, encoded_meta)
+        position = 0
+        for batch in batches:
+            for item in batch:
+                data = item.encode("utf-8")
+                stream.write(data)
+                position += len(data)
+                offsets.append(position)
+        stream.write(_padding(position))
+        if not _LITTLE_ENDIAN:
+            offsets.byteswap()
+        stream.write(offsets.tobytes())
+        index_offset = data_offset + position + len(_padding(position))
+        _write_header(stream, KIND_STRINGS, len(offsets) - 1, data_offset, index_offset, 0.0, 0.0, 0.0, encoded_meta)
+    return len(offsets) - 1
+
+def write_combinations(path: str, alphabet: str = ASCII_LOWERCASE, k: int = 2,
+                       batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Записывает в файл path все слова длины k над алфавитом alphabet и возвращает их количество."""
+    space = CombinationSpace(alphabet, k)
+    return write_strings(path, space.iter_batches(batch_size),
+                         {"kind": "combinations", "alphabet": "".join(space.alphabet), "k": k})
+
+def write_cities(path: str, cities: Iterable[str], min_length: Optional[int] = None) -> int:
+    """
+    Записывает в файл path названия городов (например, результат filter_cities_by_length)
+    и возвращает их количество. min_length сохраняется в метаданных.
+    """
+    return write_strings(path, (cities,), {"kind": "cities", "min_length": min_length})
+
+class _StoreFile:
+    """Файл хранилища, отображенный в память только для чтения."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as stream:
+            size = os.fstat(stream.fileno()).st_size
+            if size < _HEADER.size:
+                raise StoreFormatError(f"Файл {path} не является хранилищем результатов.")
+            self._mmap = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, self.kind, self.count, self.data_offset, self.index_offset,
+             self.a, self.b, self.step, meta_size) = _HEADER.unpack_from(self._mmap)
+            if magic != MAGIC:
+                raise StoreFormatError(f"Файл {path} не является хранилищем результатов или запись не завершена.")
+            if version != VERSION:
+                raise StoreFormatError(f"Неподдерживаемая версия хранилища: {version}.")
+            self.meta = self._mmap[_HEADER.size:_HEADER.size + meta_size].decode("utf-8")
+            self._view = memoryview(self._mmap)
+        except BaseException:
+            self._mmap.close()
+            raise
+
+    def section(self, start: int, size: int) -> memoryview:
+        if start + size > len(self._mmap):
+            raise StoreFormatError(f"Файл {self.path} поврежден: данные обрезаны.")
+        return self._view[start:start + size]
+
+    def close(self) -> None:
+        """Закрывает отображение; срезы memoryview, полученные из хранилища, должны быть освобождены."""
+        self._view.release()
+        self._mmap.close()
+
+class ValueStore:
+    """
+    Значения функции из хранилища без загрузки в память.
+    values — memoryview чисел float64 поверх отображенного файла (срезы не копируют данные),
+    x(i) — точка i-го значения, as_numpy() — numpy.memmap тех же данных.
+    """
+
+    def __init__(self, path: str):
+        self._file = _StoreFile(path)
+        if self._file.kind != KIND_VALUES:
+            self._file.close()
+            raise StoreFormatError(f"Файл {path} не содержит значений функции.")
+        self.path = path
+        self.a, self.b, self.step = self._file.a, self._file.b, self._file.step
+        self.function_id = self._file.meta
+        data = self._file.section(self._file.data_offset, self._file.count * 8)
+        if _LITTLE_ENDIAN:
+            self.values: Union[memoryview, array] = data.cast("d")
+        else:
+            # На платформах big-endian данные приходится копировать с перестановкой байтов
+            self.values = array("d", data.tobytes())
+            self.values.byteswap()
+            data.release()
+
+    @property
+    def grid(self) -> Grid:
+        """Сетка, на которой вычислены значения."""
+        return Grid(self.a, self.b, self.step)
+
+    def x(self, index: int) -> float:
+        """Точка, в которой вычислено значение с номером index."""
+        return self.grid.x(index)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, item):
+        return self.values[item]
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.values)
+
+    def as_numpy(self):
+        """Возвращает значения как numpy.memmap (только для чтения, данные не загружаются в память)."""
+        import numpy as np
+        if not len(self):
+            return np.empty(0, dtype="<f8")
+        return np.memmap(self.path, dtype="<f8", mode="r", offset=self._file.data_offset, shape=(len(self),))
+
+    def close(self) -> None:
+        if isinstance(self.values, memoryview):
+            self.values.release()
+        self._file.close()
+
+    def __enter__(self) -> "ValueStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+class StringStore:
+    """
+    Строки (сочетания, названия городов) из хранилища без загрузки в память.
+    store[i] декодирует одну строку, store[i:j] — список строк, raw(i) — байты строки
+    (memoryview без копирования). meta — словарь метаданных.
+    """
+
+    def __init__(self, path: str):
+        self._file = _StoreFile(path)
+        if self._file.kind != KIND_STRINGS:
+            self._file.close()
+            raise StoreFormatError(f"Файл {path} не содержит строк.")
+        self.path = path
+        self.meta: Dict[str, Any] = json.loads(self._file.meta)
+        count = self._file.count
+        index = self._file.section(self._file.index_offset, (count + 1) * 8)
+        if _LITTLE_ENDIAN:
+            self._offsets: Union[memoryview, array] = index.cast("Q")
+        else:
+            self._offsets = array("Q", index.tobytes())
+            self._offsets.byteswap()
+            index.release()
+        self._data = self._file.section(self._file.data_offset, self._offsets[count])
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def raw(self, index: int) -> memoryview:
+        """Байты строки с номером index в UTF-8 (без копирования)."""
+        index = range(len(self))[index]
+        return self._data[self._offsets[index]:self._offsets[index + 1]]
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(item, slice):
+            offsets, data = self._offsets, self._data
+            return [str(data[offsets[i]:offsets[i + 1]], "utf-8") for i in range(len(self))[item]]
+        return str(self.raw(item), "utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        for start in range(0, len(self), DEFAULT_BATCH_SIZE):
+            yield from self[start:start + DEFAULT_BATCH_SIZE]
+
+    def close(self) -> None:
+        self._data.release()
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        self._file.close()
+
+    def __enter__(self) -> "StringStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+def open_store(path: str) -> Union[ValueStore, StringStore]:
+    """
+    Открывает хранилище path для чтения: ValueStore для значений функции, StringStore для строк.
+    Исключительные ситуации:
+    - Если файл не является хранилищем, запись не завершена или файл поврежден, выдает StoreFormatError.
+    """
+    opened = _StoreFile(path)
+    kind = opened.kind
+    opened.close()
+    if kind == KIND_VALUES:
+        return ValueStore(path)
+    if kind == KIND_STRINGS:
+        return StringStore(path)
+    raise StoreFormatError(f"Неизвестный вид данных в хранилище: {kind}.")
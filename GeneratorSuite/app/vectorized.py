@@ -0,0 +1,90 @@
+from typing import Callable, Generator
+
+import numpy as np
+
+from app.expressions import FunctionLike, resolve_function, vectorized_form
+from app.generators import f, report_errors
+from app.grid import Grid
+
+# --- Векторизованный (NumPy) режим для Задания 2 ---
+#
+# Значения считаются сразу для целого блока точек сетки, поэтому накладные
+# расходы интерпретатора платятся один раз на блок, а не на каждую точку.
+# Точки берутся из той же сетки app.grid.Grid (x = a + i * step), что и
+# у скалярного генератора generate_function_values, поэтому значения
+# совпадают с ним с точностью RTOL/ATOL.
+
+DEFAULT_CHUNK_SIZE = 65536
+RTOL = 1e-9
+ATOL = 1e-9
+
+def grid_x_array(grid: Grid) -> np.ndarray:
+    """Возвращает координаты точек сетки (или ее среза) массивом numpy.float64."""
+    indices = grid.indices
+    return grid.a + np.arange(indices.start, indices.stop, indices.step, dtype=np.float64) * grid.step
+
+def _evaluate_chunk(x: np.ndarray, function: Callable[[float], float]) -> np.ndarray:
+    """
+    Вычисляет function для массива точек и отбрасывает точки, где скалярная функция выдает исключение.
+    Если функция не умеет работать с массивами, вычисляет блок поэлементно.
+    """
+    try:
+        with np.errstate(all="ignore"):
+            values = np.asarray(vectorized_form(function)(x), dtype=np.float64)
+        if values.shape != x.shape:
+            raise TypeError("f вернула результат неподходящей формы")
+        # NumPy не выдает исключений (деление на ноль дает inf, log(-1) — nan), поэтому
+        # нечисловые результаты перепроверяются скалярной функцией: inf и nan, которые
+        # она возвращает сама, сохраняются, а точки, где она выдает исключение, пропускаются
+        suspect = np.flatnonzero(~np.isfinite(values)).tolist()
+    except Exception:
+        values = np.empty_like(x)
+        suspect = range(x.size)
+
+    valid = np.ones(x.size, dtype=bool)
+    for i in suspect:
+        try:
+            values[i] = function(float(x[i]))
+        except Exception:
+            valid[i] = False
+    if not valid.all():
+        # Как и скалярный генератор, пропускаем точки с ошибками вычисления
+        bad = x[~valid]
+        report_errors(bad.size, float(bad[0]))
+        values = values[valid]
+    return values
+
+def generate_function_value_chunks(a: float, b: float, step: float = 0.01,
+                                   chunk_size: int = DEFAULT_CHUNK_SIZE,
+                                   func: FunctionLike = None) -> Generator[np.ndarray, None, None]:
+    """
+    Генерирует значения функции func (по умолчанию f) в диапазоне [a, b] блоками по chunk_size точек.
+    Каждый блок — массив numpy.float64. Для строки-выражения используется
+    ее векторный вариант (см. app.expressions).
+    Исключительные ситуации:
+    - Если step <= 0 или a > b, выдает ValueError.
+    - Если chunk_size <= 0, выдает ValueError.
+    - Точки, в которых f(x) выдает исключение, пропускаются, как в generate_function_values;
+      значения inf и nan, которые функция возвращает сама, сохраняются.
+    """
+    if chunk_size <= 0:
+        raise ValueError("Размер блока (chunk_size) должен быть положительным.")
+    grid = Grid(a, b, step)
+    function = resolve_function(func, f)
+
+    for start in range(0, len(grid), chunk_size):
+        values = _evaluate_chunk(grid_x_array(grid[start:start + chunk_size]), function)
+        if values.size:
+            yield values
+
+def function_values_array(a: float, b: float, step: float = 0.01, func: FunctionLike = None) -> np.ndarray:
+    """
+    Возвращает все значения функции func (по умолчанию f) в диапазоне [a, b] одним массивом numpy.float64.
+    Исключительные ситуации:
+    - Если step <= 0 или a > b, выдает ValueError.
+    """
+    return grid_values_array(Grid(a, b, step), func)
+
+def grid_values_array(grid: Grid, func: FunctionLike = None) -> np.ndarray:
+    """Возвращает значения функции func (по умолчанию f) в точках сетки grid одним массивом numpy.float64."""
+    return _evaluate_chunk(grid_x_array(grid), resolve_function(func, f))
@@ -1,9 +1,10 @@
 import sys
-from string import ascii_lowercase
-from typing import Generator, Iterator, Tuple, List
 
-from app.generators import generate_two_letter_combinations, generate_function_values, f
-from app.city_filter import filter_cities_by_length
+# Импортируется только то, что нужно консольной версии: консоль запускается
+# из скриптов очень часто, поэтому время запуска важно (см. tests/test_startup.py).
+# Разбор выражений, NumPy, пулы процессов и UI загружаются только при использовании.
+from app.generators import generate_two_letter_combinations, generate_function_value_batches
+from app.city_index import CityIndex
 
 def main_console():
     """
@@ -13,13 +14,9 @@ def main_console():
 
     # --- Задание 1 ---
     print("\n--- Задание 1: Первые 50 сочетаний из двух букв ---")
-    combinations_gen = generate_two_letter_combinations()
-    count = 0
-    for combination in combinations_gen:
-        if count >= 50:
-            break
-        print(combination, end=" ")
-        count += 1
+    # Берем сразу пакет из 50 сочетаний и печатаем его одной записью
+    combinations_gen = generate_two_letter_combinations(batch_size=50)
+    print(" ".join(next(combinations_gen, [])), end=" ")
     print("\n" + "="*50)
 
     # --- Задание 2 ---
@@ -30,14 +27,10 @@ def main_console():
         b_param = 7.0
         step_param = 0.01
 
-        func_gen = generate_function_values(a=a_param, b=b_param, step=step_param)
+        func_gen = generate_function_value_batches(a=a_param, b=b_param, step=step_param, batch_size=20)
         print(f"Диапазон: [{a_param}, {b_param}], Шаг: {step_param}")
-        count = 0
-        for value in func_gen:
-            if count >= 20:
-                break
-            print(f"{count+1}: {value:.4f}") # Форматируем вывод
-            count += 1
+        values = next(func_gen, [])
+        print("\n".join(f"{i+1}: {value:.4f}" for i, value in enumerate(values))) # Форматируем вывод
     except ValueError as ve:
         print(f"Ошибка в параметрах генератора: {ve}", file=sys.stderr)
     except Exception as e:
@@ -51,7 +44,9 @@ def main_console():
     print(f"Входная строка: '{cities_input}'")
 
     try:
-        city_gen = filter_cities_by_length(cities_input, min_length=min_len_city)
+        # Индекс строится один раз; запрос с другим порогом длины не требует повторного разбора строки
+        city_index = CityIndex.from_string(cities_input)
+        city_gen = iter(city_index.longer_than(min_length=min_len_city, keep_order=True))
 
         # Извлекаем первые три значения с помощью next()
         print(f"Фильтр: длина > {min_len_city} символов")
@@ -73,5 +68,294 @@ def main_console():
         print(f"Произошла непредвиденная ошибка при фильтрации городов: {e}", file=sys.stderr)
     print("="*50)
 
+# --- Командная строка ---
+#
+# Без аргументов main.py выполняет демонстрацию (main_console). С командой
+# combinations, values или cities результаты потоково записываются в stdout
+# или файл (--output) в формате text, csv, ndjson или binary (см. app/output.py).
+# Примеры:
+#   python main.py values -a -1000 -b 1000 --step 0.0001 --format binary -o values.f64
+#   python main.py values -a -1000 -b 1000 --adaptive 0.001 --format csv -o plot.csv
+#   python main.py combinations --alphabet abc -k 5 --format csv
+#   python main.py cities --input cities.txt --min-length 8 --format ndjson
+#   python main.py cities --input cities.txt --like Масква --ignore-case --sorted
+#   python main.py --metrics values --limit 1000000 > /dev/null
+#   python main.py values -a -1e6 -b 1e6 --step 0.001 -o values.csv --format csv --checkpoint values.json
+
+DEFAULT_CLI_BATCH_SIZE = 65536
+
+def build_parser():
+    """Создает разбор аргументов командной строки (argparse загружается только здесь)."""
+    import argparse
+    from app.combinations import ASCII_LOWERCASE
+    from app.output import FORMATS
+
+    parser = argparse.ArgumentParser(prog="main.py", description="GeneratorSuite: генераторы последовательностей.")
+    parser.add_argument("--metrics", action="store_true", help="вывести метрики в stderr")
+    parser.add_argument("--profile", action="store_true", help="вместе с --metrics: профиль cProfile")
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--format", choices=FORMATS, default="text", help="формат вывода (по умолчанию text)")
+    common.add_argument("-o", "--output", default=None, help="файл для вывода (по умолчанию stdout)")
+    common.add_argument("--limit", type=int, default=None, help="вывести не более N результатов")
+    common.add_argument("--batch-size", type=int, default=DEFAULT_CLI_BATCH_SIZE, help="размер пакета записи")
+    common.add_argument("--checkpoint", default=None, metavar="PATH",
+                        help="сохранять прогресс в PATH и продолжать с него после прерывания (нужен -o)")
+    common.add_argument("--checkpoint-interval", type=float, default=5.0, metavar="SEC",
+                        help="интервал сохранения контрольной точки (по умолчанию 5 с)")
+
+    commands = parser.add_subparsers(dest="command")
+    combinations = commands.add_parser("combinations", parents=[common], help="слова длины k над алфавитом")
+    combinations.add_argument("--alphabet", default=ASCII_LOWERCASE, help="алфавит (по умолчанию a-z)")
+    combinations.add_argument("-k", type=int, default=2, help="длина слова (по умолчанию 2)")
+    combinations.add_argument("--start", type=int, default=0, help="номер первого слова")
+
+    values = commands.add_parser("values", parents=[common], help="значения функции на [a, b]")
+    values.add_argument("-a", type=float, default=-5.0, help="начало диапазона (по умолчанию -5)")
+    values.add_argument("-b", type=float, default=7.0, help="конец диапазона (по умолчанию 7)")
+    values.add_argument("--step", type=float, default=0.01, help="шаг (по умолчанию 0.01)")
+    values.add_argument("--func", default=None, help='выражение от x, например "sin(x) / x" (по умолчанию f)')
+    values.add_argument("--precision", type=int, default=None,
+                        help="знаков после запятой для text/csv (по умолчанию без округления)")
+    values.add_argument("--adaptive", type=float, default=None, metavar="TOL",
+                        help="адаптивная выборка вместо шага: ошибка ломаной не больше TOL")
+    values.add_argument("--max-points", type=int, default=None, help="вместе с --adaptive: не более N точек")
+
+    cities = commands.add_parser("cities", parents=[common], help="названия городов длиннее min-length")
+    source = cities.add_mutually_exclusive_group()
+    source.add_argument("--input", default="-", help='файл с названиями через пробел ("-" - stdin, по умолчанию)')
+    source.add_argument("--text", default=None, help="строка с названиями через пробел")
+    cities.add_argument("--min-length", type=int, default=5, help="минимальная длина (по умолчанию 5)")
+    cities.add_argument("--encoding", default="utf-8", help="кодировка файла (по умолчанию utf-8)")
+    cities.add_argument("--workers", type=int, default=None,
+                        help="разбирать файл (--input, только UTF-8) параллельно на N процессах")
+    cities.add_argument("--prefix", default=None, help="только названия, начинающиеся с PREFIX")
+    cities.add_argument("--contains", default=None, help="только названия, содержащие подстроку")
+    cities.add_argument("--like", default=None, metavar="WORD", help="только названия, похожие на WORD")
+    cities.add_argument("--max-distance", type=int, default=1, help="вместе с --like: не более N правок (по умолчанию 1)")
+    cities.add_argument("--ignore-case", action="store_true", help="сравнивать без учета регистра")
+    cities.add_argument("--sorted", action="store_true", help="выводить по алфавиту")
+    return parser
+
+def _run_command(args) -> int:
+    """Выполняет команду CLI и возвращает количество записанных результатов."""
+    from app import output
+
+    if args.limit is not None and args.limit < 0:
+        raise ValueError("Количество результатов (--limit) не может быть отрицательным.")
+    if args.batch_size <= 0:
+        raise ValueError("Размер пакета (--batch-size) должен быть положительным.")
+    if args.checkpoint is not None:
+        return _run_checkpointed(args)
+    stream = output.open_output(args.output)
+    try:
+        if args.command == "combinations":
+            from app.combinations import CombinationSpace
+            space = CombinationSpace(args.alphabet, args.k)
+            stop = None if args.limit is None else args.start + args.limit
+            count = output.write_string_batches(stream, space.iter_batches(args.batch_size, args.start, stop),
+                                                args.format, "word")
+        elif args.command == "values":
+            if args.adaptive is not None:
+                points = _adaptive_point_batches(args)
+            else:
+                from app.generators import generate_function_point_batches
+                points = generate_function_point_batches(args.a, args.b, args.step, args.batch_size, args.func)
+            if args.limit is not None:
+                points = _limited_points(points, args.limit)
+            count = output.write_point_batches(stream, points, args.format, args.precision)
+        else:
+            if args.text is not None:
+                from app.city_filter import filter_cities_by_length
+                cities = filter_cities_by_length(args.text, args.min_length)
+            elif args.workers is not None:
+                from app.main_multithread import filter_cities_parallel
+                cities = filter_cities_parallel(args.input, args.min_length, max_workers=args.workers)
+            else:
+                from app.city_filter import filter_cities_from_file
+                cities = filter_cities_from_file(args.input, args.min_length, args.encoding)
+            if _searching(args):
+                from app.city_trie import CityTrie
+                cities = CityTrie(cities).search(args.prefix, args.contains, args.like, args.max_distance,
+                                                 casefold=args.ignore_case,
+                                                 order="sorted" if args.sorted else "input")
+            from app.pipeline import Pipeline
+            pipeline = Pipeline.from_iterable(cities, args.batch_size)
+            if args.limit is not None:
+                pipeline = pipeline.take(args.limit)
+            count = output.write_string_batches(stream, pipeline.batches(), args.format, "city")
+        stream.flush()
+        return count
+    finally:
+        if stream is not sys.stdout.buffer:
+            stream.close()
+
+def _searching(args) -> bool:
+    return args.prefix is not None or args.contains is not None or args.like is not None or args.sorted
+
+def _resumable_job(args):
+    """Задача команды с явным курсором (см. app/checkpoint.py)."""
+    from app.checkpoint import ResumableJob
+
+    if args.command == "combinations":
+        stop = None if args.limit is None else args.start + args.limit
+        return ResumableJob.combinations(args.alphabet, args.k, args.start, stop)
+    if args.command == "values":
+        if args.adaptive is not None:
+            raise ValueError("--checkpoint нельзя использовать вместе с --adaptive.")
+        return ResumableJob.function_values(args.a, args.b, args.step, args.func, points=True)
+    if args.text is not None or args.input == "-" or args.workers is not None or _searching(args):
+        raise ValueError("С --checkpoint города читаются только из файла (--input), без поиска и --workers.")
+    return ResumableJob.city_file(args.input, args.min_length, args.encoding)
+
+def _run_checkpointed(args) -> int:
+    """
+    Выполняет команду с контрольной точкой args.checkpoint и возвращает количество записанных результатов.
+    Если контрольная точка уже есть, файл вывода обрезается до размера на момент ее сохранения
+    и запись продолжается с первого незаписанного результата. После завершения контрольная точка удаляется.
+    """
+    import os
+    from app import output
+    from app.checkpoint import ResumableJob, remove_checkpoint
+
+    if args.output is None or args.output == "-":
+        raise ValueError("Для --checkpoint нужен файл вывода (-o).")
+    job = _resumable_job(args)
+    options = {"format": args.format, "precision": getattr(args, "precision", None),
+               "output": os.path.abspath(args.output)}
+    count = 0
+    if os.path.exists(args.checkpoint):
+        saved = ResumableJob.load(args.checkpoint)
+        if (saved.kind, saved.params, saved.extra.get("options")) != (job.kind, job.params, options):
+            raise ValueError(f"Контрольная точка {args.checkpoint} создана для другой команды или других параметров.")
+        job, count, written = saved, saved.extra["count"], saved.extra["output_bytes"]
+        stream = open(args.output, "r+b", buffering=output.OUTPUT_BUFFER_SIZE)
+        stream.truncate(written)
+        stream.seek(written)
+    else:
+        stream = output.open_output(args.output)
+        fields = {"combinations": ("word",), "values": ("x", "y"), "cities": ("city",)}[args.command]
+        stream.write(output.header(args.format, fields))
+        written = stream.tell()
+    job.extra["options"] = options
+
+    def save() -> None:
+        # Сначала на диск попадают данные, затем контрольная точка, которая на них ссылается.
+        # written — размер вывода на момент последнего commit: пакет, записанный,
+        # но не отмеченный обработанным, при продолжении обрезается и записывается заново
+        stream.flush()
+        os.fsync(stream.fileno())
+        job.extra.update(count=count, output_bytes=written)
+        job.save(args.checkpoint)
+
+    completed = False
+    try:
+        for batch in job.batches(args.batch_size):
+            size = len(batch[1]) if args.command == "values" else len(batch)
+            if args.limit is not None and count + size > args.limit:
+                size = args.limit - count
+                batch = (batch[0][:size], batch[1][:size]) if args.command == "values" else batch[:size]
+            if args.command == "values":
+                stream.write(output.encode_points(batch[0], batch[1], args.format, args.precision))
+            else:
+                field = "word" if args.command == "combinations" else "city"
+                stream.write(output.encode_strings(batch, args.format, field))
+            job.commit(size)
+            count += size
+            written = stream.tell()
+            if args.limit is not None and count >= args.limit:
+                break
+            if job.due(args.checkpoint_interval):
+                save()
+        completed = True
+    finally:
+        try:
+            if completed:
+                stream.flush()
+                remove_checkpoint(args.checkpoint)
+            else:
+                # Прерывание (в том числе Ctrl+C) - сохраняем позицию последнего записанного результата
+                save()
+        finally:
+            stream.close()
+    return count
+
+def _adaptive_point_batches(args):
+    """Точки адаптивной выборки (app/adaptive.py) пакетами по args.batch_size."""
+    from app.adaptive import DEFAULT_MAX_POINTS, adaptive_points
+    max_points = DEFAULT_MAX_POINTS if args.max_points is None else args.max_points
+    xs, ys, _ = adaptive_points(args.a, args.b, args.adaptive, args.func, max_points)
+    size = args.batch_size
+    return ((xs[start:start + size], ys[start:start + size]) for start in range(0, len(ys), size))
+
+def _limited_points(points, limit):
+    """Как app.pipeline.limit_batches, но для пакетов точек (xs, ys)."""
+    for xs, ys in points:
+        if limit <= 0:
+            return
+        if len(ys) > limit:
+            xs, ys = xs[:limit], ys[:limit]
+        limit -= len(ys)
+        yield xs, ys
+
+def _execute(args) -> int:
+    """Выполняет демонстрацию или команду и возвращает код завершения."""
+    try:
+        if args.command is None:
+            main_console()
+        else:
+            _run_command(args)
+    except ValueError as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 2
+    except BrokenPipeError:
+        # Потребитель (например, head) закрыл канал раньше времени - это не ошибка.
+        # Перенаправляем stdout в devnull, чтобы сброс буфера при выходе не выдал ошибку повторно.
+        import os
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    except OSError as e:
+        print(f"Ошибка ввода-вывода: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        # С --checkpoint позиция уже сохранена, команду можно повторить для продолжения
+        print("Прервано.", file=sys.stderr)
+        return 130
+    return 0
+
+def _check_args(parser, args) -> None:
+    """Отклоняет сочетания параметров, при которых один из них был бы молча проигнорирован."""
+    if args.command == "cities" and args.workers is not None:
+        import codecs
+        if args.text is not None or args.input == "-":
+            parser.error("--workers разбирает только файл (--input ФАЙЛ), а не --text или stdin.")
+        try:
+            encoding = codecs.lookup(args.encoding).name
+        except LookupError:
+            parser.error(f"Неизвестная кодировка: {args.encoding}.")
+        if encoding != "utf-8":
+            parser.error("--workers разбирает файл только в кодировке UTF-8, --encoding с ним задать нельзя.")
+
+def run_cli(argv) -> int:
+    """
+    Точка входа командной строки; возвращает код завершения.
+    Без команды выполняет демонстрацию main_console.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    _check_args(parser, args)
+    if not args.metrics:
+        return _execute(args)
+    from app.metrics import collect_metrics, format_snapshot
+    with collect_metrics(profile=args.profile) as recorder:
+        code = _execute(args)
+    # Метрики и профиль выводятся в stderr, чтобы не смешиваться с результатами
+    print(format_snapshot(recorder.snapshot()), file=sys.stderr)
+    print(recorder.profile_report(), file=sys.stderr, end="")
+    return code
+
 if __name__ == "__main__":
-    main_console()
+    # Демонстрация без аргументов не загружает argparse
+    if len(sys.argv) == 1:
+        main_console()
+    else:
+        sys.exit(run_cli(sys.argv[1:]))
@@ -1,12 +1,15 @@
 import sys
-from PySide6.QtWidgets import QApplication
-from ui.main_window import MainWindow
 
 def main_ui():
     """
     Главная функция для запуска UI версии.
+    PySide6 и окно импортируются здесь, а не при импорте модуля.
     """
+    from PySide6.QtWidgets import QApplication
+    from ui.main_window import MainWindow
+
     app = QApplication(sys.argv)
+    app.setApplicationName("GeneratorSuite") # Имя каталога данных программы (контрольные точки)
     window = MainWindow()
     window.show()
     sys.exit(app.exec())
@@ -0,0 +1,12 @@
+import os
+
+import pytest
+
+@pytest.fixture(scope="session")
+def qt_app():
+    """Приложение Qt без окон на экране (QT_QPA_PLATFORM=offscreen); одно на весь запуск тестов."""
+    QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    app.setApplicationName("GeneratorSuite")
+    return app
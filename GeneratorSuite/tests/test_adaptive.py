@@ -0,0 +1,69 @@
+import math
+
+import pytest
+
+from app.adaptive import adaptive_points, generate_adaptive_values
+from app.expressions import compile_expression
+from app.generators import f
+from app.metrics import collect_metrics
+
+def _max_interpolation_error(xs, ys, function, samples=50):
+    """Наибольшее отклонение ломаной через (xs, ys) от функции на промежуточных точках."""
+    error = 0.0
+    for x0, y0, x1, y1 in zip(xs, ys, xs[1:], ys[1:]):
+        for i in range(1, samples):
+            t = i / samples
+            x = x0 + (x1 - x0) * t
+            error = max(error, abs(function(x) - (y0 + (y1 - y0) * t)))
+    return error
+
+def test_polynomial_error_guaranteed():
+    """Проверяет, что для многочленов ошибка ломаной не превышает tolerance."""
+    for func, tolerance in ((None, 1e-2), ("x^3 - 4*x", 1e-3), ("x^4 / 100 - x^2", 1e-2)):
+        function = compile_expression(func) if func else f
+        xs, ys, error = adaptive_points(-5, 7, tolerance, func)
+        assert error <= tolerance
+        assert list(xs) == sorted(xs) and xs[0] == -5 and xs[-1] == 7
+        assert list(ys) == [function(x) for x in xs]
+        assert _max_interpolation_error(xs, ys, function) <= tolerance * (1 + 1e-9)
+
+def test_fewer_points_than_uniform_grid():
+    """Проверяет, что точки сгущаются там, где функция изгибается, и их намного меньше, чем при шаге 0.01."""
+    xs, ys, error = adaptive_points(-20, 20, 1e-3, "sin(x) / (1 + x^2)")
+    assert error <= 1e-3
+    assert len(xs) < 4001 // 5
+    left = sum(1 for x in xs if x < -15)
+    middle = sum(1 for x in xs if -2.5 <= x < 2.5)
+    assert middle > 3 * left
+
+def test_budget_and_determinism():
+    """Проверяет ограничение количества точек и повторяемость результата."""
+    xs, ys, error = adaptive_points(-1000, 1000, 1e-6, max_points=100)
+    assert len(xs) == 100 and error > 1e-6
+    again = adaptive_points(-1000, 1000, 1e-6, max_points=100)
+    assert (list(again[0]), list(again[1]), again[2]) == (list(xs), list(ys), error)
+    assert list(generate_adaptive_values(-1000, 1000, 1e-6, max_points=100)) == list(zip(xs, ys))
+    xs, ys, error = adaptive_points(1, 1, 0.1)
+    assert (list(xs), list(ys), error) == ([1.0], [f(1)], 0.0)
+
+def test_undefined_points_skipped(capsys):
+    """Проверяет, что точки, где функция не определена, пропускаются, а граница области уточняется."""
+    with collect_metrics() as recorder:
+        xs, ys, _ = adaptive_points(0, 4, 1e-3, "log(x - 1)")
+    errors = recorder.counter("function_values.errors")
+    assert errors > 0
+    assert f"Ошибка при вычислении f(x) в {errors} точках" in capsys.readouterr().err
+    assert all(x > 1 for x in xs) and xs[0] - 1 < 1e-9
+    assert all(y == math.log(x - 1) for x, y in zip(xs, ys))
+
+def test_invalid_arguments():
+    """Проверяет ValueError для неверных параметров."""
+    for args in ((5, 1, 0.1), (0, 1, 0), (0, 1, -1.0)):
+        with pytest.raises(ValueError):
+            adaptive_points(*args)
+    with pytest.raises(ValueError):
+        adaptive_points(0, 1, 0.1, initial_points=1)
+    with pytest.raises(ValueError):
+        adaptive_points(0, 1, 0.1, max_points=5, initial_points=10)
+    with pytest.raises(ValueError):
+        next(generate_adaptive_values(0, 1, 0))
@@ -0,0 +1,80 @@
+import math
+import random
+
+import pytest
+
+from app.analysis import (find_maximum, find_minimum, find_roots, grid_maximum, grid_minimum,
+                          polynomial_coefficients, threshold_crossings)
+from app.expressions import compile_expression
+from app.grid import Grid
+
+def _scan(a, b, step, func):
+    """Точки (x, y) полного прохода сетки; точки с ошибками пропускаются."""
+    function = compile_expression(func)
+    points = []
+    for x in Grid(a, b, step):
+        try:
+            points.append((x, function(x)))
+        except Exception:
+            pass
+    return points
+
+def _scan_crossings(points, level):
+    return [points[i][0] for i in range(1, len(points)) if (points[i - 1][1] < level) != (points[i][1] < level)]
+
+def test_default_function_closed_form():
+    """Проверяет корни и экстремумы f(x) = 0.1x^2 + 5x - 2."""
+    assert polynomial_coefficients() == (-2.0, 5.0, 0.1)
+    roots = find_roots(-100, 100)
+    assert roots == pytest.approx([-25 - math.sqrt(645), -25 + math.sqrt(645)])
+    assert find_minimum(-100, 100) == pytest.approx((-25.0, -64.5))
+    assert find_maximum(-5, 7) == (7, pytest.approx(37.9))
+    assert find_roots(-5, 7, step=0.01) == [pytest.approx(0.4)]
+    assert find_roots(1, 2) == []
+
+def test_grid_queries_match_full_scan():
+    """Проверяет на случайных многочленах, что ответы на сетке совпадают с полным проходом."""
+    rng = random.Random(7)
+    for _ in range(100):
+        coefficients = [round(rng.uniform(-3, 3), 2) for _ in range(rng.randint(1, 5))]
+        expression = " + ".join(f"({c})*x^{k}" for k, c in enumerate(coefficients))
+        a = round(rng.uniform(-5, 0), 2)
+        b = round(a + rng.uniform(0.5, 6), 2)
+        step = rng.choice([0.01, 0.003, 0.1])
+        points = _scan(a, b, step, expression)
+        level = rng.choice([0.0, points[len(points) // 2][1]])
+        assert grid_minimum(a, b, step, expression) == min(points, key=lambda p: p[1])
+        assert grid_maximum(a, b, step, expression) == max(points, key=lambda p: p[1])
+        assert threshold_crossings(a, b, step, expression, level) == _scan_crossings(points, level)
+
+def test_arbitrary_functions():
+    """Проверяет метод Брента для функций, не являющихся многочленами, в том числе с разрывами."""
+    assert find_roots(-4, 4, "sin(x)") == pytest.approx([-math.pi, 0.0, math.pi], abs=1e-12)
+    x, y = find_maximum(-1, 3, "exp(-(x - 1)^2)")
+    assert x == pytest.approx(1.0, abs=1e-7) and y == pytest.approx(1.0)
+    assert find_roots(-6, 6, "1/x") == []
+    for expression in ("sin(3x) / (1 + x^2)", "1/x", "tan(x)", "log(x)"):
+        points = _scan(-6, 6, 0.001, expression)
+        assert grid_minimum(-6, 6, 0.001, expression) == min(points, key=lambda p: p[1])
+        for level in (0.0, 0.1):
+            assert threshold_crossings(-6, 6, 0.001, expression, level) == _scan_crossings(points, level)
+
+def test_crossings_near_domain_edge():
+    """Проверяет пересечение уровня между границей области определения и первой точкой просмотра."""
+    for a, b, step, expression, level in ((-18.70163, 9.60547, 0.01, "log(x)", -3.9051),
+                                          (-11.8, 14.2, 0.01, "log(2 - x)", -3.85),
+                                          (-13.1, 15.1, 0.003, "sqrt(x) - 1", -0.88)):
+        expected = _scan_crossings(_scan(a, b, step, expression), level)
+        assert len(expected) == 1
+        assert threshold_crossings(a, b, step, expression, level) == expected
+    assert find_roots(-18.70163, 9.60547, "log(x)", -3.9051) == pytest.approx([math.exp(-3.9051)])
+
+def test_invalid_arguments():
+    """Проверяет обработку некорректных параметров и функций, не определенных на отрезке."""
+    with pytest.raises(ValueError):
+        grid_minimum(1, 0, 0.1)
+    with pytest.raises(ValueError):
+        threshold_crossings(0, 1, 0)
+    with pytest.raises(ValueError):
+        find_roots(0, 1, "sin(x)", samples=1)
+    assert grid_minimum(0, 1, 0.5, "log(x - 5)") is None
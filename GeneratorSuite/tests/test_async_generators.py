@@ -0,0 +1,69 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from app.async_generators import (
+    afilter_cities_by_length, agenerate_function_values, agenerate_two_letter_combinations
+)
+from app.city_filter import filter_cities_by_length
+from app.generators import generate_function_values, generate_two_letter_combinations
+
+CITIES = "Москва Питер Казань Уфа Омск Самара Ярославль Астрахань"
+
+async def _collect(agen):
+    return [item async for item in agen]
+
+@pytest.mark.asyncio
+async def test_async_generators_match_sync():
+    """Проверяет, что асинхронные генераторы выдают то же, что и синхронные."""
+    assert await _collect(agenerate_two_letter_combinations(chunk_size=100)) == \
+        list(generate_two_letter_combinations())
+    assert await _collect(agenerate_function_values(-5, 7, 0.01, chunk_size=97)) == \
+        list(generate_function_values(-5, 7, 0.01))
+    assert await _collect(afilter_cities_by_length(CITIES, 5, chunk_size=3)) == \
+        list(filter_cities_by_length(CITIES, 5))
+    assert await _collect(afilter_cities_by_length("", 5)) == []
+
+@pytest.mark.asyncio
+async def test_async_function_values_on_process_pool():
+    """Проверяет вычисление блоков на ProcessPoolExecutor."""
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        values = await _collect(agenerate_function_values(0, 3, 1, func="x^2", chunk_size=2, executor=executor))
+    assert values == [0.0, 1.0, 4.0, 9.0]
+
+@pytest.mark.asyncio
+async def test_async_prefetch_is_bounded_and_cancellation():
+    """Проверяет, что вперед вычисляется не более prefetch блоков и что отмена останавливает генерацию."""
+    submitted = []
+
+    class CountingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            submitted.append(args)
+            return super().submit(fn, *args, **kwargs)
+
+    with CountingExecutor(max_workers=1) as executor:
+        agen = agenerate_function_values(-1000, 1000, 0.01, chunk_size=10, executor=executor, prefetch=3)
+        assert await agen.__anext__() == next(generate_function_values(-1000, 1000, 0.01))
+        assert len(submitted) == 4 # 3 блока предвыборки + 1 вместо полученного
+        await agen.aclose()
+
+        async def consume():
+            async for _ in agenerate_function_values(-1000, 1000, 0.001, chunk_size=10, executor=executor):
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+@pytest.mark.asyncio
+async def test_async_invalid_params():
+    """Проверяет обработку некорректных параметров."""
+    with pytest.raises(ValueError, match="Шаг \\(step\\) должен быть положительным."):
+        await _collect(agenerate_function_values(0, 1, 0))
+    with pytest.raises(ValueError):
+        await _collect(afilter_cities_by_length(CITIES, -1))
+    with pytest.raises(ValueError):
+        await _collect(agenerate_two_letter_combinations(prefetch=0))
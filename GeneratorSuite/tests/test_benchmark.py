@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from app.benchmark import CASES, compare_results, main, run_benchmarks, run_case
+
+def test_run_case_counts_items():
+    """Проверяет, что все режимы задачи обрабатывают одинаковое количество элементов."""
+    for task, (_, modes) in CASES.items():
+        counts = {mode: run_case(task, mode, size=500, workers=1, repeat=1)["items"]
+                  for mode in modes if mode not in ("multiprocess", "vectorized")}
+        assert len(set(counts.values())) == 1, (task, counts)
+    result = run_case("function_values", "sync", size=500, repeat=2)
+    assert result["items"] == 500
+    assert result["throughput_per_s"] > 0 and result["ns_per_item"] > 0
+    with pytest.raises(ValueError):
+        run_case("function_values", "unknown", size=10)
+
+def test_run_benchmarks_report_and_speedup():
+    """Проверяет структуру отчета: параллельные режимы для каждого числа воркеров, ускорение относительно sync."""
+    report = run_benchmarks(tasks=["cities"], sizes=[200], workers=[1, 2], repeat=1, isolate=False,
+                            modes=["sync", "threaded"])
+    assert report["meta"]["format_version"] == 1
+    cases = [(r["mode"], r["workers"]) for r in report["results"]]
+    assert cases == [("sync", 1), ("threaded", 1), ("threaded", 2)]
+    assert report["results"][0]["speedup"] == 1.0
+    json.dumps(report)
+
+def test_compare_results_finds_regressions():
+    """Проверяет, что падение пропускной способности больше допустимого считается регрессией."""
+    def report(throughput):
+        return {"results": [{"task": "cities", "mode": "sync", "size": 10, "workers": 1,
+                             "throughput_per_s": throughput}]}
+    assert compare_results(report(100.0), report(90.0), tolerance=0.2) == []
+    assert len(compare_results(report(100.0), report(50.0), tolerance=0.2)) == 1
+    assert compare_results({"results": []}, report(50.0)) == []
+
+def test_cli_writes_json(tmp_path, capsys):
+    """Проверяет, что CLI записывает результаты и возвращает 1 при регрессии."""
+    output = tmp_path / "result.json"
+    args = ["--tasks", "combinations", "--modes", "sync", "--sizes", "100", "--repeat", "1", "--no-isolate"]
+    assert main(args + ["--output", str(output)]) == 0
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report["results"][0]["items"] == 100
+    report["results"][0]["throughput_per_s"] *= 1000
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(report), encoding="utf-8")
+    assert main(args + ["--output", str(output), "--baseline", str(baseline)]) == 1
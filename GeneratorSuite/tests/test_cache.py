@@ -0,0 +1,87 @@
+import pytest
+
+from app.cache import SweepCache, cached_function_values, lattice_position
+from app.generators import generate_function_values
+
+def test_cache_hit_returns_same_values():
+    """Проверяет, что повторный запрос обслуживается из кэша и дает те же значения."""
+    cache = SweepCache()
+    expected = list(generate_function_values(-5.0, 7.0, 0.01))
+    assert list(cache.function_values(-5.0, 7.0, 0.01)) == expected
+    assert list(cache.function_values(-5.0, 7.0, 0.01)) == expected
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.points_computed == len(expected)
+
+def test_cache_reuses_overlapping_range():
+    """Проверяет, что при расширении диапазона досчитываются только новые точки."""
+    cache = SweepCache()
+    list(cache.function_values(0.0, 1.0, 0.1))
+    values = list(cache.function_values(-0.5, 1.5, 0.1))
+    assert values == pytest.approx(list(generate_function_values(-0.5, 1.5, 0.1)), rel=1e-12)
+    assert cache.points_reused == 11
+    assert cache.points_computed == 11 + 10
+    assert cache.stats()["lattices"] == 1
+
+def test_cache_separates_functions_and_lattices():
+    """Проверяет, что разные функции и сдвинутые решетки не смешиваются."""
+    cache = SweepCache()
+    list(cache.function_values(0.0, 1.0, 0.5))
+    assert list(cache.function_values(0.0, 1.0, 0.5, func="x^2")) == [0.0, 0.25, 1.0]
+    list(cache.function_values(0.25, 1.25, 0.5))
+    assert cache.hits == 0
+    assert lattice_position(0.25, 0.5) == (0, 0.5)
+
+def test_cache_lru_eviction():
+    """Проверяет, что объем кэша ограничен и вытесняются давно не использованные решетки."""
+    cache = SweepCache(max_bytes=8 * 150)
+    list(cache.function_values(0.0, 99.0, 1.0))
+    list(cache.function_values(0.0, 99.0, 1.0, func="2x"))
+    assert cache.nbytes <= cache.max_bytes
+    assert cache.stats()["lattices"] == 1
+    list(cache.function_values(0.0, 99.0, 1.0, func="2x"))
+    assert cache.hits == 1
+
+def test_cache_skips_failed_points():
+    """Проверяет, что участки с ошибками вычисления не кэшируются."""
+    cache = SweepCache()
+    def faulty(x):
+        if x == 1.0:
+            raise ZeroDivisionError("Имитация ошибки")
+        return x
+    assert list(cache.function_values(0.0, 2.0, 1.0, func=faulty)) == [0.0, 2.0]
+    assert list(cache.function_values(0.0, 2.0, 1.0, func=faulty)) == [0.0, 2.0]
+    assert cache.hits == 0
+
+def test_cached_function_values_invalid_params():
+    """Проверяет обработку некорректных параметров."""
+    with pytest.raises(ValueError, match="Шаг \\(step\\) должен быть положительным."):
+        list(cached_function_values(-5, 7, 0, cache=SweepCache()))
+
+def test_cache_batches_compute_only_new_points():
+    """Проверяет пакетную выдачу: при расширении и сужении диапазона вычисляются только новые точки."""
+    cache = SweepCache()
+    batches = list(cache.function_value_batches(0.0, 10.0, 0.01, batch_size=300))
+    assert max(len(batch) for batch in batches) == 300
+    assert [v for batch in batches for v in batch] == list(generate_function_values(0.0, 10.0, 0.01))
+    list(cache.function_value_batches(-1.0, 10.0, 0.01))
+    assert (cache.points_computed, cache.points_reused) == (1001 + 100, 1001)
+    shrunk = [v for batch in cache.function_value_batches(2.0, 5.0, 0.01) for v in batch]
+    assert len(shrunk) == 301 and cache.points_computed == 1101
+    with pytest.raises(ValueError):
+        list(cache.function_value_batches(0.0, 1.0, 0.1, batch_size=0))
+
+def test_cache_errors_counted_and_unhashable_function():
+    """Проверяет счетчик ошибок в метриках и вычисление без кэша для нехешируемой функции."""
+    from app.metrics import collect_metrics
+
+    class Scaled(list):
+        def __call__(self, x):
+            return self[0] / x
+
+    cache = SweepCache()
+    with collect_metrics() as recorder:
+        assert list(cache.function_values(-1, 1, 1, func=lambda x: 1 / x)) == [-1.0, 1.0]
+        assert list(cache.function_values(1, 3, 1, func=Scaled([6]))) == [6.0, 3.0, 2.0]
+        assert list(cache.function_values(1, 3, 1, func=Scaled([6]))) == [6.0, 3.0, 2.0]
+    assert recorder.counter("function_values.errors") == 1
+    assert cache.stats()["lattices"] == 1 and cache.hits == 0
@@ -0,0 +1,120 @@
+import json
+import random
+
+import pytest
+
+from app.cache import SweepCache
+from app.checkpoint import CheckpointError, ResumableJob, load_checkpoint, save_checkpoint
+from app.combinations import CombinationSpace
+from app.generators import generate_function_values
+
+def _items(batch):
+    """Элементы пакета (для пакета точек — пары (x, y))."""
+    return list(zip(*batch)) if isinstance(batch, tuple) else list(batch)
+
+def _run_interrupted(make, path, seed):
+    """
+    Выполняет задачу, прерывая ее в случайных местах (в том числе посреди пакета),
+    каждый раз сохраняя и загружая контрольную точку. Возвращает все обработанные элементы.
+    """
+    rng = random.Random(seed)
+    job, results = make(), []
+    while True:
+        interrupted = False
+        for batch in job.batches(rng.choice([1, 7, 300, 5000])):
+            items = _items(batch)
+            if rng.random() < 0.1:
+                count = rng.randint(0, len(items))
+                results += items[:count]
+                job.commit(count)
+                interrupted = True
+                break
+            results += items
+        job.save(path)
+        job = ResumableJob.load(path, cache=job.cache)
+        if not interrupted:
+            assert job.finished and job.progress() == 1.0
+            return results
+
+def test_resume_never_repeats_or_loses_results(tmp_path):
+    """Проверяет, что прерванные и продолженные задачи выдают те же результаты, что и непрерывные."""
+    cities = tmp_path / "cities.txt"
+    rng = random.Random(1)
+    names = ["".join(rng.choice("абвгдabc") for _ in range(rng.randint(1, 12))) for _ in range(2000)]
+    cities.write_text("".join(name + rng.choice([" ", "\n", "\t "]) for name in names), encoding="utf-8")
+    cache = SweepCache()
+    makers = [
+        lambda: ResumableJob.combinations("abc", 6, 7, 700),
+        lambda: ResumableJob.function_values(-3, 3, 0.001, "log(x) + 1/(x - 1)"),
+        lambda: ResumableJob.function_values(-3, 3, 0.001, "log(x)", points=True),
+        lambda: ResumableJob.function_values(-3, 3, 0.001, "log(x) + 1/(x - 1)", cache=cache),
+        lambda: ResumableJob.city_file(str(cities), 3, chunk_bytes=16),
+    ]
+    for number, make in enumerate(makers):
+        expected = [item for batch in make().batches(1000) for item in _items(batch)]
+        for seed in range(5):
+            assert _run_interrupted(make, str(tmp_path / "job.json"), seed) == expected
+    assert expected == [name for name in names if len(name) > 3]
+
+def test_cursor_and_state():
+    """Проверяет курсор, частичную обработку пакета и состояние задачи."""
+    job = ResumableJob.combinations("ab", 3)
+    batches = job.batches(3)
+    assert next(batches) == ["aaa", "aab", "aba"]
+    job.commit(2)
+    assert (job.cursor, job.skip) == (0, 2)
+    with pytest.raises(ValueError):
+        job.commit(2)
+    assert next(batches) == ["abb", "baa", "bab"]
+    assert (job.cursor, job.skip) == (3, 0)
+    batches.close()
+    state = json.loads(json.dumps(job.state()))
+    assert list(ResumableJob.from_state(state).batches(10)) == [CombinationSpace("ab", 3)[3:]]
+    values = ResumableJob.function_values(-5, 7, 0.01)
+    assert [value for batch in values.batches(100) for value in batch] == list(generate_function_values(-5, 7, 0.01))
+
+def test_city_file_batch_size(tmp_path):
+    """Проверяет, что пакеты городов не длиннее batch_size и задача продолжается посреди блока файла."""
+    path = tmp_path / "cities.txt"
+    names = [f"город{i}" for i in range(50)]
+    path.write_text(" ".join(names), encoding="utf-8")
+    job = ResumableJob.city_file(str(path), 3)
+    batches = job.batches(7)
+    assert [len(next(batches)) for _ in range(2)] == [7, 7]
+    job.commit(3)
+    batches.close()
+    assert (job.cursor, job.skip) == (0, 10)
+    resumed = ResumableJob.from_state(job.state())
+    rest = list(resumed.batches(7))
+    assert max(len(batch) for batch in rest) == 7
+    assert [city for batch in rest for city in batch] == names[10:]
+    assert resumed.finished
+
+def test_checkpoint_file(tmp_path):
+    """Проверяет атомарную запись и ошибки чтения контрольной точки."""
+    path = str(tmp_path / "job.json")
+    job = ResumableJob.function_values(0, 1, 0.1, "x^2")
+    job.extra["count"] = 5
+    job.save(path)
+    assert load_checkpoint(path)["params"]["func"] == "x^2"
+    assert ResumableJob.load(path).extra == {"count": 5}
+    assert [entry.name for entry in tmp_path.iterdir()] == ["job.json"]
+    (tmp_path / "job.json").write_text("{broken", encoding="utf-8")
+    with pytest.raises(CheckpointError):
+        ResumableJob.load(path)
+    save_checkpoint(path, {"version": 99})
+    with pytest.raises(CheckpointError):
+        load_checkpoint(path)
+
+def test_invalid_params(tmp_path):
+    """Проверяет ValueError для неверных параметров."""
+    with pytest.raises(ValueError):
+        ResumableJob.function_values(1, 0, 0.1)
+    with pytest.raises(ValueError):
+        ResumableJob.function_values(0, 1, 0.1, func=abs)
+    with pytest.raises(ValueError):
+        ResumableJob.city_file(str(tmp_path / "cities.txt"), encoding="utf-16")
+    with pytest.raises(ValueError):
+        ResumableJob("unknown", {})
+    with pytest.raises(ValueError):
+        next(ResumableJob.combinations().batches(0))
@@ -1,6 +1,8 @@
+import io
+
 import pytest
 
-from app.city_filter import filter_cities_by_length
+from app.city_filter import filter_cities_by_length, filter_cities_from_stream, filter_cities_from_file
 
 def test_filter_cities_by_length_exact_match():
     """Проверяет, что города ровно 5 символов не включаются."""
@@ -27,3 +29,41 @@ def test_filter_cities_by_length_invalid_min_length():
     cities_str = "Москва"
     with pytest.raises(ValueError, match="Минимальная длина \(min_length\) не может быть отрицательной."):
         list(filter_cities_by_length(cities_str, min_length=-1))
+
+def test_filter_cities_from_stream_tokens_across_chunks():
+    """Проверяет склейку названий, разрезанных границей блока."""
+    stream = io.StringIO("Москва Питер Казань Уфа Омск Самара Ярославль Астрахань")
+    filtered_cities = list(filter_cities_from_stream(stream, min_length=5, chunk_size=4))
+    assert filtered_cities == ["Москва", "Казань", "Самара", "Ярославль", "Астрахань"]
+
+def test_filter_cities_from_stream_lines():
+    """Проверяет фильтрацию итерируемого объекта строк."""
+    lines = ["Омск Уфа\n", "Рязань\n", "", "  Воронеж"]
+    assert list(filter_cities_from_stream(lines, min_length=5)) == ["Рязань", "Воронеж"]
+
+def test_filter_cities_from_stream_lines_without_newlines():
+    """Проверяет, что строки без завершающего перевода строки не склеиваются."""
+    lines = ["Москва", "Казань", "Ярославль"]
+    assert list(filter_cities_from_stream(lines, min_length=5)) == lines
+
+def test_filter_cities_from_stream_is_lazy():
+    """Проверяет, что next() читает только необходимую часть входных данных."""
+    read_sizes = []
+
+    class CountingStream(io.StringIO):
+        def read(self, size=-1):
+            read_sizes.append(size)
+            return super().read(size)
+
+    stream = CountingStream("Москва " * 1000)
+    city_gen = filter_cities_from_stream(stream, min_length=5, chunk_size=16)
+    assert next(city_gen) == "Москва"
+    assert len(read_sizes) == 1
+
+def test_filter_cities_from_file(tmp_path):
+    """Проверяет фильтрацию файла и обработку недопустимой минимальной длины."""
+    path = tmp_path / "cities.txt"
+    path.write_text("Омск Рязань\nЯрославль Уфа\n", encoding="utf-8")
+    assert list(filter_cities_from_file(str(path), min_length=5, chunk_size=3)) == ["Рязань", "Ярославль"]
+    with pytest.raises(ValueError):
+        list(filter_cities_from_file(str(path), min_length=-1))
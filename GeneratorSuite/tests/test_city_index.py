@@ -0,0 +1,46 @@
+import pytest
+
+from app.city_filter import filter_cities_by_length
+from app.city_index import CityIndex
+
+CITIES = "Москва Питер Казань Уфа Омск Самара Ярославль Астрахань"
+
+def test_longer_than_matches_filter():
+    """Проверяет, что запрос к индексу совпадает с filter_cities_by_length для любых порогов."""
+    index = CityIndex.from_string(CITIES)
+    for min_length in range(0, 12):
+        expected = list(filter_cities_by_length(CITIES, min_length=min_length))
+        assert index.longer_than(min_length, keep_order=True) == expected
+        assert sorted(index.longer_than(min_length)) == sorted(expected)
+        assert index.count_longer_than(min_length) == len(expected)
+
+def test_longer_than_sorted_by_length():
+    """Проверяет порядок по возрастанию длины."""
+    index = CityIndex.from_string(CITIES)
+    assert index.longer_than(5) == ["Москва", "Казань", "Самара", "Ярославль", "Астрахань"]
+
+def test_between_and_top_longest():
+    """Проверяет выборку по диапазону длин и самые длинные названия."""
+    index = CityIndex.from_string(CITIES)
+    assert index.between(4, 5, keep_order=True) == ["Питер", "Омск"]
+    assert index.between(20, 30) == []
+    assert index.top_longest(2) == ["Астрахань", "Ярославль"]
+    assert len(index.top_longest(100)) == len(index)
+    assert index.top_longest(0) == []
+
+def test_empty_index_and_invalid_params():
+    """Проверяет пустой индекс и некорректные параметры."""
+    index = CityIndex([])
+    assert index.longer_than(0) == []
+    assert index.top_longest(3) == []
+    with pytest.raises(ValueError):
+        index.longer_than(-1)
+    with pytest.raises(ValueError):
+        index.between(5, 4)
+
+def test_from_file(tmp_path):
+    """Проверяет построение индекса из файла."""
+    path = tmp_path / "cities.txt"
+    path.write_text(CITIES.replace(" ", "\n"), encoding="utf-8")
+    assert CityIndex.from_file(str(path), chunk_size=5).longer_than(8) == ["Ярославль", "Астрахань"]
+    assert CityIndex.from_file(str(path), max_workers=2).longer_than(8) == ["Ярославль", "Астрахань"]
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from app.city_filter import filter_cities_by_length
+from app.city_trie import CityTrie, edit_distance
+
+CITIES = "Москва Питер Казань Уфа Омск Самара Ярославль Астрахань москва Мосальск Моршанск Кострома Сочи"
+
+def _scan(names, prefix=None, contains=None, similar_to=None, max_distance=1, min_length=0, casefold=False):
+    """Поиск полным перебором названий."""
+    fold = str.casefold if casefold else str
+    return [name for name in names
+            if len(name) > min_length
+            and (prefix is None or fold(name).startswith(fold(prefix)))
+            and (contains is None or fold(contains) in fold(name))
+            and (similar_to is None or edit_distance(fold(similar_to), fold(name)) <= max_distance)]
+
+def test_prefix_contains_similar():
+    """Проверяет поиск по префиксу, подстроке и сходству с учетом и без учета регистра."""
+    index = CityTrie.from_string(CITIES)
+    assert list(index.search(prefix="Мо")) == ["Москва", "Мосальск", "Моршанск"]
+    assert list(index.search(prefix="мо", casefold=True, order="sorted")) == \
+        ["Моршанск", "Мосальск", "Москва", "москва"]
+    assert list(index.search(contains="ань")) == ["Казань", "Астрахань"]
+    assert list(index.search(contains="ОС", casefold=True, min_length=6)) == ["Ярославль", "Мосальск", "Кострома"]
+    assert list(index.search(similar_to="Масква")) == ["Москва"]
+    assert list(index.search(similar_to="Масква", casefold=True)) == ["Москва", "москва"]
+    assert list(index.search(prefix="Мо", contains="ск", similar_to="Мосанск", max_distance=2)) == \
+        ["Мосальск", "Моршанск"]
+    assert list(index.search(min_length=5)) == list(filter_cities_by_length(CITIES, 5))
+    assert list(index.search(prefix="Я", contains="xyz")) == []
+
+def test_matches_full_scan():
+    """Проверяет на случайных словарях, что поиск совпадает с полным перебором (в том числе для ß)."""
+    rng = random.Random(3)
+    alphabet = "aAbBcß"
+    word = lambda: "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 6)))
+    for _ in range(200):
+        names = [word() for _ in range(rng.randint(0, 40))]
+        index = CityTrie(names)
+        for _ in range(5):
+            query = dict(prefix=rng.choice([None, word()[:2]]), contains=rng.choice([None, word()[:3]]),
+                         similar_to=rng.choice([None, word()]), max_distance=rng.randint(0, 2),
+                         min_length=rng.randint(0, 3), casefold=rng.random() < 0.5)
+            expected = _scan(names, **query)
+            assert list(index.search(**query)) == expected
+            assert list(index.search(**query, order="sorted")) == sorted(expected, key=str.casefold)
+
+def test_lazy_results():
+    """Проверяет, что результаты в алфавитном порядке выдаются лениво."""
+    index = CityTrie(f"город{i:06d}" for i in range(100000))
+    results = index.search(prefix="город", order="sorted")
+    assert [next(results) for _ in range(2)] == ["город000000", "город000001"]
+
+def test_edit_distance():
+    """Проверяет расстояние Левенштейна и ограничение limit."""
+    assert edit_distance("Москва", "Масква") == 1
+    assert edit_distance("", "abc") == 3
+    assert edit_distance("kitten", "sitting") == 3
+    assert edit_distance("kitten", "sitting", limit=1) == 2
+
+def test_invalid_params(tmp_path):
+    """Проверяет некорректные параметры и построение индекса из файла."""
+    index = CityTrie([])
+    assert list(index.search(prefix="a")) == [] and len(index) == 0
+    for query in (dict(min_length=-1), dict(max_distance=-1), dict(order="length")):
+        with pytest.raises(ValueError):
+            index.search(**query)
+    path = tmp_path / "cities.txt"
+    path.write_text(CITIES.replace(" ", "\n"), encoding="utf-8")
+    assert list(CityTrie.from_file(str(path), chunk_size=5).search(prefix="Ка")) == ["Казань"]
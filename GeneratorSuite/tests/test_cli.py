@@ -0,0 +1,110 @@
+import json
+from array import array
+
+import pytest
+
+from app.output import encode_points, encode_strings
+from main import run_cli
+
+def _run(tmp_path, *argv):
+    path = tmp_path / "out"
+    assert run_cli([*argv, "-o", str(path)]) == 0
+    return path.read_bytes()
+
+def test_values_formats(tmp_path):
+    """Проверяет вывод значений функции во всех форматах."""
+    argv = ("values", "-a", "0", "-b", "1", "--step", "0.5")
+    assert _run(tmp_path, *argv, "--precision", "3").decode() == "-2.000\n0.525\n3.100\n"
+    assert _run(tmp_path, *argv, "--format", "csv", "--precision", "1").decode() == "x,y\n0.0,-2.0\n0.5,0.5\n1.0,3.1\n"
+    rows = [json.loads(line) for line in _run(tmp_path, *argv, "--format", "ndjson").decode().splitlines()]
+    assert [row["x"] for row in rows] == [0.0, 0.5, 1.0]
+    values = array("d")
+    values.frombytes(_run(tmp_path, *argv, "--format", "binary"))
+    assert list(values) == [row["y"] for row in rows]
+
+def test_values_limit_and_errors(tmp_path, capsys):
+    """Проверяет --limit и пропуск точек, в которых функция выдает исключение."""
+    assert _run(tmp_path, "values", "-a", "0", "-b", "10", "--step", "1", "--limit", "3",
+                "--batch-size", "2").decode().count("\n") == 3
+    output = _run(tmp_path, "values", "-a", "-1", "-b", "1", "--step", "1", "--func", "1/x", "--format", "csv")
+    assert output.decode() == "x,y\n-1.0,-1.0\n1.0,1.0\n"
+    assert "f(0.0)" in capsys.readouterr().err
+
+def test_values_adaptive(tmp_path):
+    """Проверяет адаптивную выборку значений (--adaptive, --max-points)."""
+    output = _run(tmp_path, "values", "-a", "-1000", "-b", "1000", "--adaptive", "0.01", "--max-points", "500",
+                  "--format", "csv", "--batch-size", "64").decode().splitlines()
+    assert len(output) == 501 and output[1].startswith("-1000.0,") and output[-1].startswith("1000.0,")
+    assert run_cli(["values", "--adaptive", "0", "-o", str(tmp_path / "out")]) == 2
+
+def test_combinations_and_cities(tmp_path):
+    """Проверяет вывод сочетаний и городов."""
+    assert _run(tmp_path, "combinations", "--alphabet", "ab", "-k", "2").decode() == "aa\nab\nba\nbb\n"
+    assert _run(tmp_path, "combinations", "-k", "3", "--start", "1", "--limit", "2").decode() == "aab\naac\n"
+    output = _run(tmp_path, "cities", "--text", "Москва Питер Ярославль", "--format", "ndjson")
+    assert [json.loads(line)["city"] for line in output.decode().splitlines()] == ["Москва", "Ярославль"]
+    source = tmp_path / "cities.txt"
+    source.write_text("Москва Питер\nЯрославль", encoding="utf-8")
+    output = _run(tmp_path, "cities", "--input", str(source), "--format", "binary", "--limit", "1")
+    assert output == "Москва".encode() + b"\0"
+
+def test_cities_search(tmp_path):
+    """Проверяет поиск городов по префиксу и сходству (--prefix, --like, --ignore-case, --sorted)."""
+    text = ("--text", "Москва москва Мосальск Казань")
+    assert _run(tmp_path, "cities", *text, "--prefix", "Мо").decode() == "Москва\nМосальск\n"
+    output = _run(tmp_path, "cities", *text, "--like", "масква", "--ignore-case", "--sorted")
+    assert output.decode() == "Москва\nмосква\n"
+
+def test_checkpoint_resume(tmp_path, monkeypatch):
+    """Проверяет, что прерванная команда с --checkpoint продолжается без повторов и пропусков."""
+    import app.checkpoint
+
+    argv = ["values", "-a", "0", "-b", "10", "--step", "0.001", "--format", "csv", "--batch-size", "100"]
+    expected = _run(tmp_path, *argv)
+    output, checkpoint = str(tmp_path / "part.csv"), str(tmp_path / "job.json")
+    argv += ["-o", output, "--checkpoint", checkpoint, "--checkpoint-interval", "0"]
+    calls = 0
+    original = app.checkpoint.ResumableJob.commit
+    def interrupted(job, count):
+        nonlocal calls
+        calls += 1
+        if calls == 37:
+            raise KeyboardInterrupt
+        original(job, count)
+    monkeypatch.setattr(app.checkpoint.ResumableJob, "commit", interrupted)
+    assert run_cli(argv) == 130
+    # Данные после последней контрольной точки обрезаются при продолжении
+    with open(output, "ab") as stream:
+        stream.write(b"garbage")
+    assert run_cli(argv) == 0
+    assert (tmp_path / "part.csv").read_bytes() == expected
+    assert not (tmp_path / "job.json").exists()
+    assert run_cli(["values", "--checkpoint", checkpoint]) == 2
+
+def test_invalid_arguments(tmp_path, capsys):
+    """Проверяет, что некорректные параметры дают код завершения 2 и сообщение в stderr."""
+    assert run_cli(["values", "--step", "0", "-o", str(tmp_path / "out")]) == 2
+    assert "Шаг" in capsys.readouterr().err
+    assert run_cli(["cities", "--text", "a", "--min-length", "-1", "-o", str(tmp_path / "out")]) == 2
+    with pytest.raises(SystemExit):
+        run_cli(["values", "--format", "xml"])
+
+def test_encoders():
+    """Проверяет экранирование строк в csv и JSON-значения inf/nan."""
+    assert encode_strings(['a,b', 'say "hi"'], "csv", "city") == b'"a,b"\n"say ""hi"""\n'
+    assert encode_strings([], "text", "city") == b""
+    assert encode_points([0.0, 1.0], array("d", [float("inf"), 2.0]), "ndjson") == \
+        b'{"x": 0.0, "y": null}\n{"x": 1.0, "y": 2.0}\n'
+    with pytest.raises(ValueError):
+        encode_strings(["a"], "xml", "city")
+
+def test_cities_workers_conflicts(tmp_path, capsys):
+    """Проверяет, что --workers не сочетается со stdin, --text и кодировкой, отличной от UTF-8."""
+    source = tmp_path / "cities.txt"
+    source.write_text("Москва Питер Ярославль", encoding="utf-8")
+    for extra in (("--input", "-"), ("--text", "Москва"), ("--input", str(source), "--encoding", "cp1251")):
+        with pytest.raises(SystemExit) as error:
+            run_cli(["cities", "--workers", "2", *extra])
+        assert error.value.code == 2 and "--workers" in capsys.readouterr().err
+    output = _run(tmp_path, "cities", "--input", str(source), "--workers", "2", "--encoding", "UTF8")
+    assert output.decode() == "Москва\nЯрославль\n"
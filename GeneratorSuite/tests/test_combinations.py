@@ -0,0 +1,64 @@
+from itertools import product
+from string import ascii_lowercase
+
+import pytest
+
+from app.combinations import CombinationSpace
+from app.generators import generate_combinations, generate_two_letter_combinations
+
+def test_space_matches_itertools_product():
+    """Проверяет порядок и количество слов для разных алфавитов и длин."""
+    for alphabet, k in (("ab", 0), ("ab", 3), ("xyz", 4), (ascii_lowercase, 2)):
+        space = CombinationSpace(alphabet, k)
+        expected = ["".join(p) for p in product(alphabet, repeat=k)]
+        assert len(space) == len(expected)
+        assert list(space) == expected
+
+def test_rank_unrank_roundtrip():
+    """Проверяет прямой доступ к i-му слову и обратное преобразование."""
+    space = CombinationSpace(ascii_lowercase, 5)
+    for index in (0, 1, 12345, len(space) - 1):
+        assert space.rank(space[index]) == index
+    assert space[-1] == "zzzzz"
+    assert space.rank("aaaba") == 26
+    with pytest.raises(IndexError):
+        space[len(space)]
+    with pytest.raises(ValueError):
+        space.rank("abc")
+    with pytest.raises(ValueError):
+        space.rank("abcd!")
+
+def test_iter_from_offset_and_slices():
+    """Проверяет перебор с произвольного смещения и срезы."""
+    space = CombinationSpace("abc", 3)
+    full = list(space)
+    assert list(space.iter_from(5)) == full[5:]
+    assert list(space.iter_from(5, 11)) == full[5:11]
+    assert space[4:9] == full[4:9]
+    assert space[::7] == full[::7]
+    assert list(generate_combinations("abc", 3, start=20)) == full[20:]
+
+def test_large_space_uses_computed_prefix():
+    """Проверяет пространство, для старшей части которого таблица не строится."""
+    space = CombinationSpace(ascii_lowercase, 8)
+    index = space.rank("generato")
+    assert space[index] == "generato"
+    assert list(space.iter_from(index, index + 3)) == ["generato", "generatp", "generatq"]
+
+def test_shards_cover_space():
+    """Проверяет разбиение пространства на шарды для параллельной обработки."""
+    space = CombinationSpace("abcd", 3)
+    shards = space.shards(5)
+    assert [i for shard in shards for i in shard] == list(range(len(space)))
+    joined = [word for shard in shards for word in space.iter_from(shard.start, shard.stop)]
+    assert joined == list(space)
+
+def test_space_invalid_params():
+    """Проверяет обработку некорректных параметров."""
+    with pytest.raises(ValueError):
+        CombinationSpace("", 2)
+    with pytest.raises(ValueError):
+        CombinationSpace("aa", 2)
+    with pytest.raises(ValueError):
+        CombinationSpace("ab", -1)
+    assert list(generate_two_letter_combinations())[:3] == ["aa", "ab", "ac"]
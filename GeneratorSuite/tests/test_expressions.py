@@ -0,0 +1,53 @@
+import pytest
+
+from app.expressions import ExpressionError, compile_expression, resolve_function
+from app.generators import f
+
+def test_compile_expression_polynomial_uses_horner():
+    """Проверяет, что многочлен распознается и вычисляется без возведения в степень."""
+    func = compile_expression("0.1x^2 + 5x - 2")
+    assert func.coefficients == pytest.approx((-2.0, 5.0, 0.1))
+    assert "**" not in func.source
+    for x in (-5.0, 0.0, 3.5, 100.0):
+        assert func(x) == pytest.approx(f(x))
+
+def test_compile_expression_is_cached():
+    """Проверяет, что повторная компиляция того же выражения берется из кэша."""
+    assert compile_expression("sin(x) / (1 + x^2)") is compile_expression("sin(x) / (1 + x^2)")
+
+def test_compile_expression_non_polynomial():
+    """Проверяет вычисление выражений с функциями."""
+    func = compile_expression("sqrt(x) + 2exp(0)")
+    assert func.coefficients is None
+    assert func(4.0) == pytest.approx(4.0)
+
+def test_compile_expression_vectorized():
+    """Проверяет векторный вариант выражения."""
+    np = pytest.importorskip("numpy")
+    func = compile_expression("3 * (x + 1)^2")
+    x = np.array([0.0, 1.0, 2.0])
+    np.testing.assert_allclose(func.vectorized(x), [3.0, 12.0, 27.0])
+
+@pytest.mark.parametrize("expression", ["__import__('os')", "x.real", "y + 1", "x +", "lambda: 1"])
+def test_compile_expression_rejects_invalid(expression):
+    """Проверяет, что недопустимые выражения отклоняются."""
+    with pytest.raises(ExpressionError):
+        compile_expression(expression)
+
+@pytest.mark.parametrize("expression", ["x + 1" + "9" * 400, "sin(x) + 1" + "0" * 400, "10.0^400 * x"])
+def test_compile_expression_rejects_overflow(expression):
+    """Проверяет, что слишком большие константы дают ExpressionError, а не OverflowError."""
+    with pytest.raises(ExpressionError):
+        compile_expression(expression)
+
+def test_compile_expression_folds_constant_power():
+    """Проверяет свертку степени констант."""
+    assert compile_expression("2^10 + x").coefficients == (1024.0, 1.0)
+    assert compile_expression("1e200x^2 * 1e200").coefficients is None
+
+def test_resolve_function():
+    """Проверяет приведение аргумента func к вызываемому объекту."""
+    assert resolve_function(None, f) is f
+    assert resolve_function(abs, f) is abs
+    with pytest.raises(TypeError):
+        resolve_function(42, f)
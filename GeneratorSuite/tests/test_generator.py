@@ -2,7 +2,9 @@ import pytest
 from string import ascii_lowercase
 from typing import List
 
-from app.generators import generate_two_letter_combinations, generate_function_values, f
+from app.generators import (
+    generate_two_letter_combinations, generate_function_values, generate_function_value_batches, f
+)
 
 # --- Тесты для Задания 1 ---
 
@@ -22,6 +24,12 @@ def test_generate_two_letter_combinations_elements_format():
     assert first_combination[0] in ascii_lowercase
     assert first_combination[1] in ascii_lowercase
 
+def test_generate_two_letter_combinations_batches():
+    """Проверяет пакетную выдачу сочетаний."""
+    batches = list(generate_two_letter_combinations(batch_size=100))
+    assert [len(batch) for batch in batches] == [100] * 6 + [76]
+    assert [item for batch in batches for item in batch] == list(generate_two_letter_combinations())
+
 # --- Тесты для Задания 2 ---
 def test_generate_function_values_edge_cases():
     """Тестирует граничные случаи для генератора значений функции."""
@@ -50,48 +58,38 @@ def test_generate_function_values_invalid_params():
 
 def test_generate_function_values_error_in_f():
     """
-    Тестирует обработку ошибок внутри самой функции f(x).
-    Для этого нужно временно подменить функцию f.
+    Тестирует обработку ошибок внутри вычисляемой функции.
+    Функция передается аргументом func, подменять f в модуле не нужно.
     """
-    # Сохраняем оригинальную функцию f
-    original_f = f
-    # Заменяем f на функцию, которая вызывает ошибку
     def faulty_f(x):
-        if x == 10.0:
+        if round(x, 6) == 10.0:
             raise TypeError("Имитация ошибки в f(x)")
-        return original_f(x)
-
-    # Временно подменяем f в модуле app.generators
-    # Этот подход может быть хрупким, зависит от импортов.
-    # Альтернатива - передавать функцию как аргумент.
-    import sys
-    from importlib import reload
-
-    # Пытаемся найти модуль и подменить функцию
-    try:
-        # Прямая подмена (может не работать, если модуль app.generators импортирован иначе)
-        # app.generators.f = faulty_f 
-        # Лучше использовать pytest-mock (monkeypatch)
-        # В данном примере, для простоты, предположим, что прямой доступ работает
-        # Если нет, используйте: monkeypatch.setitem(sys.modules['app.generators'].__dict__, 'f', faulty_f)
-
-        # Для примера, создадим заглушку, которая возвращает None, если вызывает ошибку
-        # (реальная обработка ошибок в generate_function_values уже есть)
-        # Это больше для демонстрации, как можно тестировать обработку исключений
-
-        # Если бы generate_function_values не ловила ошибки, мы бы ожидали их здесь
-        # with pytest.raises(TypeError):
-        #    list(generate_function_values(a=9.99, b=10.01, step=0.01)) # Предполагается, что f(10.0) вызовет ошибку
-
-        # Тестируем существующий механизм обработки ошибок
-        # Если f выбросит ошибку, генератор должен продолжить работу
-        # и не выдать саму ошибку (а только сообщение в stderr, которое сложнее проверить юнит-тестом)
-        # Мы можем проверить, что генератор не останавливается
-        gen_with_error = generate_function_values(a=9.99, b=10.01, step=0.01) # Предполагая f(10.0) может вызвать ошибку
-        values = list(gen_with_error) # Если есть ошибка, она будет поймана и проигнорирована
-        assert len(values) > 0 # Проверяем, что генератор не остановился
-
-    finally:
-        # Восстанавливаем оригинальную функцию f
-        # app.generators.f = original_f
-        pass # Если не подменяли напрямую, ничего не делаем
+        return f(x)
+
+    values = list(generate_function_values(a=9.99, b=10.01, step=0.01, func=faulty_f))
+    # Точка x = 10.0 пропускается, генератор продолжает работу
+    assert values == [f(9.99), f(9.99 + 2 * 0.01)]
+
+def test_generate_function_values_expression():
+    """Проверяет вычисление по строке-выражению."""
+    values = list(generate_function_values(a=0.0, b=2.0, step=1.0, func="x^2 - 1"))
+    assert values == pytest.approx([-1.0, 0.0, 3.0])
+    default = list(generate_function_values(a=-5.0, b=7.0, step=0.5))
+    assert list(generate_function_values(a=-5.0, b=7.0, step=0.5, func="0.1x^2 + 5x - 2")) == pytest.approx(default)
+
+def test_generate_function_value_batches():
+    """Проверяет пакетную выдачу значений функции и пропуск ошибочных точек."""
+    batches = list(generate_function_value_batches(a=-5.0, b=7.0, step=0.01, batch_size=500))
+    assert [len(batch) for batch in batches] == [500, 500, 201]
+    assert [v for batch in batches for v in batch] == list(generate_function_values(a=-5.0, b=7.0, step=0.01))
+    assert len(batches[0].tobytes()) == 500 * 8
+
+    def faulty_f(x):
+        if x == 1.0:
+            raise ZeroDivisionError("Имитация ошибки в f(x)")
+        return x
+    batches = list(generate_function_value_batches(a=0.0, b=3.0, step=1.0, batch_size=2, func=faulty_f))
+    assert [list(batch) for batch in batches] == [[0.0], [2.0, 3.0]]
+
+    with pytest.raises(ValueError):
+        list(generate_function_value_batches(a=0.0, b=1.0, step=0.1, batch_size=0))
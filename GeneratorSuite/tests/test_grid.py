@@ -0,0 +1,36 @@
+import pytest
+
+from app.grid import Grid, point_count
+from app.generators import generate_function_values, generate_grid_values, f
+
+def test_point_count_includes_endpoint():
+    """Проверяет, что конец отрезка b попадает в сетку независимо от округления."""
+    assert point_count(5.0, 5.0, 0.01) == 1
+    assert point_count(1.0, 1.1, 0.5) == 1
+    assert point_count(0.0, 0.3, 0.1) == 4
+    assert point_count(-5.0, 7.0, 0.001) == 12001
+
+def test_grid_len_and_indexing():
+    """Проверяет len(), доступ по индексу и отрицательные индексы."""
+    grid = Grid(-5.0, 7.0, 0.01)
+    assert len(grid) == 1201
+    assert grid[0] == -5.0
+    assert grid[100] == -5.0 + 100 * 0.01
+    assert grid[-1] == pytest.approx(7.0)
+    with pytest.raises(IndexError):
+        grid[1201]
+
+def test_grid_slicing_keeps_coordinates():
+    """Проверяет, что срез сетки дает те же координаты, что и исходная сетка."""
+    grid = Grid(0.0, 1.0, 0.1)
+    part = grid[3:6]
+    assert len(part) == 3
+    assert list(part) == [grid[3], grid[4], grid[5]]
+    assert list(grid[::5]) == [grid[0], grid[5], grid[10]]
+
+def test_generate_grid_values_from_offset():
+    """Проверяет вычисление значений начиная с произвольного индекса."""
+    grid = Grid(-5.0, 7.0, 0.01)
+    values = list(generate_grid_values(grid[1000:1003]))
+    assert values == [f(grid[i]) for i in (1000, 1001, 1002)]
+    assert len(list(generate_function_values(-5.0, 7.0, 0.01))) == len(grid)
@@ -0,0 +1,62 @@
+import pytest
+
+from app.generators import generate_function_values
+from app.city_filter import filter_cities_by_length
+from app.main_multithread import (
+    ShardedSweepExecutor, filter_cities_parallel, split_file_ranges, split_into_shards
+)
+
+CITIES = "Москва Питер Казань Уфа Омск Самара Ярославль Астрахань"
+
+def test_split_into_shards_covers_all_indices():
+    """Проверяет, что шарды покрывают все индексы без пропусков и пересечений."""
+    shards = split_into_shards(10, 4)
+    assert shards == [range(0, 4), range(4, 8), range(8, 10)]
+    assert split_into_shards(0, 4) == []
+    with pytest.raises(ValueError):
+        split_into_shards(10, 0)
+
+def test_executor_matches_sequential_order():
+    """Проверяет, что параллельный результат совпадает с последовательным и сохраняет порядок."""
+    expected = list(generate_function_values(a=-5.0, b=7.0, step=0.01))
+    with ShardedSweepExecutor(max_workers=2, shard_size=100) as executor:
+        assert list(executor.collect(-5.0, 7.0, 0.01)) == expected
+        assert list(executor.iter_values(-5.0, 7.0, 0.01)) == expected
+        assert list(executor.collect(0.0, 2.0, 1.0, func="x^2")) == [0.0, 1.0, 4.0]
+
+def test_executor_invalid_params():
+    """Проверяет обработку некорректных параметров исполнителя."""
+    with pytest.raises(ValueError):
+        ShardedSweepExecutor(max_workers=0)
+    with ShardedSweepExecutor(max_workers=1) as executor:
+        with pytest.raises(ValueError, match="Шаг \\(step\\) должен быть положительным."):
+            executor.collect(-5, 7, 0)
+
+def test_split_file_ranges_aligned_to_whitespace(tmp_path):
+    """Проверяет, что диапазоны байтов покрывают файл и не разрезают названия."""
+    path = tmp_path / "cities.txt"
+    data = (CITIES + "\n") * 10
+    path.write_text(data, encoding="utf-8")
+    ranges = split_file_ranges(str(path), 7)
+    raw = path.read_bytes()
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(raw)
+    assert all(stop == next_start for (_, stop), (next_start, _) in zip(ranges, ranges[1:]))
+    tokens = [city for start, stop in ranges for city in raw[start:stop].decode("utf-8").split()]
+    assert tokens == data.split()
+
+def test_filter_cities_parallel_matches_filter(tmp_path):
+    """Проверяет, что параллельная фильтрация совпадает с filter_cities_by_length (длина в символах)."""
+    path = tmp_path / "cities.txt"
+    data = (CITIES + "\n") * 50
+    path.write_text(data, encoding="utf-8")
+    for min_length in (0, 5, 8):
+        result = list(filter_cities_parallel(str(path), min_length=min_length, max_workers=2, range_bytes=64))
+        assert result == list(filter_cities_by_length(data, min_length=min_length))
+
+def test_filter_cities_parallel_empty_file_and_invalid_params(tmp_path):
+    """Проверяет пустой файл и недопустимую минимальную длину."""
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    assert list(filter_cities_parallel(str(path), max_workers=1)) == []
+    with pytest.raises(ValueError):
+        list(filter_cities_parallel(str(path), min_length=-1))
@@ -0,0 +1,52 @@
+from app import metrics
+from app.cache import SweepCache
+from app.city_filter import filter_cities_by_length
+from app.generators import generate_function_value_batches, generate_function_values
+from app.metrics import MetricsRecorder, collect_metrics, format_snapshot
+
+CITIES = "Москва Питер Казань Уфа Омск Самара Ярославль Астрахань"
+
+def test_metrics_disabled_by_default():
+    """Проверяет, что без collect_metrics метрики не собираются и генераторы не оборачиваются."""
+    assert metrics.current() is None
+    values = [1, 2, 3]
+    assert metrics.measured("test", values) is values
+
+def test_collect_metrics_records_generators_and_errors():
+    """Проверяет замеры генераторов, счетчик ошибок f(x) и попадания в кэш."""
+    with collect_metrics() as recorder:
+        assert len(list(generate_function_values(-5, 7, 0.01))) == 1201
+        assert list(generate_function_values(-1, 1, 1, func=lambda x: 1 / x)) == [-1.0, 1.0]
+        assert sum(len(batch) for batch in generate_function_value_batches(0, 9, 1, batch_size=4)) == 10
+        assert len(list(filter_cities_by_length(CITIES, 5))) == 5
+        cache = SweepCache()
+        list(cache.function_values(0, 1, 0.1))
+        list(cache.function_values(0, 1, 0.1))
+    assert metrics.current() is None
+    snapshot = recorder.snapshot()
+    timing = snapshot["timings"]["function_values"]
+    assert timing["count"] == 2 and timing["items"] == 1203
+    assert timing["items_per_s"] > 0
+    assert snapshot["timings"]["function_value_batches"]["count"] == 3
+    assert snapshot["timings"]["cities"]["items"] == 5
+    assert snapshot["counters"]["function_values.errors"] == 1
+    assert snapshot["cache"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+    assert "function_values" in format_snapshot(snapshot)
+
+def test_recorder_gauges_and_reset():
+    """Проверяет показатели (текущее и максимальное значение) и сброс метрик."""
+    recorder = MetricsRecorder()
+    recorder.gauge("queue", 3)
+    recorder.gauge("queue", 1)
+    recorder.record("op", 0.5, items=10)
+    assert recorder.snapshot()["gauges"]["queue"] == {"value": 1, "max": 3}
+    assert recorder.snapshot()["timings"]["op"]["items_per_s"] == 20
+    recorder.reset()
+    assert recorder.snapshot()["timings"] == {}
+
+def test_collect_metrics_profile_and_memory():
+    """Проверяет режимы cProfile и tracemalloc."""
+    with collect_metrics(profile=True, trace_memory=True) as recorder:
+        list(generate_function_values(-5, 7, 0.01))
+    assert "_iter_grid_values" in recorder.profile_report()
+    assert recorder.memory["peak_bytes"] > 0
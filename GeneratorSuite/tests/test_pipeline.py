@@ -0,0 +1,68 @@
+import io
+
+import pytest
+
+from app.generators import generate_function_values
+from app.pipeline import Pipeline, chunked, limit_batches
+
+CITIES = "Москва Питер Казань Уфа Омск Самара Ярославль Астрахань москва Самара"
+
+def test_cities_filter_dedupe_take():
+    """Проверяет цепочку: источник городов, фильтр по длине, удаление повторов, первые N."""
+    pipeline = Pipeline.cities(CITIES, batch_size=3).filter(lambda city: len(city) > 5)
+    assert pipeline.dedupe(str.casefold).take(3).collect() == ["Москва", "Казань", "Самара"]
+    assert pipeline.dedupe().collect() == ["Москва", "Казань", "Самара", "Ярославль", "Астрахань", "москва"]
+    assert pipeline.count() == 7
+    assert Pipeline.cities(io.StringIO("Уфа Омск\nСочи")).map(len).reduce(lambda a, b: a + b, 0) == 11
+    assert Pipeline.cities(["Москва", "Казань"]).collect() == ["Москва", "Казань"]
+
+def test_sweep_threshold_argmin_argmax():
+    """Проверяет поиск минимума и максимума по точкам функции с фильтром по порогу."""
+    values = list(generate_function_values(-5, 7, 0.01))
+    assert Pipeline.sweep(-5, 7, 0.01).argmax() == (7.0, max(values))
+    x, y = Pipeline.sweep(-5, 7, 0.01).filter(lambda point: point[1] > 0).argmin()
+    assert y == min(v for v in values if v > 0) and x == pytest.approx(0.4)
+    assert Pipeline.values(-5, 7, 0.01).argmin() == min(values)
+    assert Pipeline.values(0, 1, 1).filter(lambda v: v > 100).argmin() is None
+
+def test_take_stops_early():
+    """Проверяет, что take не читает источник дальше нужного, а map перед take не вычисляется лишний раз."""
+    calls = []
+    def tracked(word):
+        calls.append(word)
+        return word.upper()
+    assert Pipeline.combinations(k=3).map(tracked).take(5).collect() == ["AAA", "AAB", "AAC", "AAD", "AAE"]
+    assert len(calls) == 5
+    pulled = []
+    def source():
+        for batch in (["a", "b"], ["c", "d"], ["e"]):
+            pulled.append(batch)
+            yield batch
+    pipeline = Pipeline(source).filter(lambda item: item != "a").take(2)
+    assert pipeline.collect() == ["b", "c"] and len(pulled) == 2
+    assert Pipeline(source).take(0).collect() == [] and len(pulled) == 2
+    assert Pipeline.combinations("ab", 2).take(3).map(str.upper).take(2).collect() == ["AA", "AB"]
+    with pytest.raises(ValueError):
+        Pipeline.combinations().take(-1)
+
+def test_pipeline_is_reusable():
+    """Проверяет, что стадии не меняют исходную цепочку, а повторный запуск дает тот же результат."""
+    base = Pipeline.combinations("ab", 2)
+    upper = base.map(str.upper)
+    assert base.collect() == ["aa", "ab", "ba", "bb"]
+    assert upper.dedupe(lambda word: word[0]).collect() == ["AA", "BA"]
+    assert upper.dedupe(lambda word: word[0]).collect() == ["AA", "BA"]
+    assert base.first() == "aa" and base.filter(lambda word: False).first("нет") == "нет"
+    written = io.StringIO()
+    assert base.sink(lambda batch: written.write("".join(batch))) == 4
+    assert written.getvalue() == "aaabbabb"
+
+def test_helpers():
+    """Проверяет разбиение на пакеты и ограничение количества элементов."""
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(limit_batches([[1, 2], [3, 4]], 3)) == [[1, 2], [3]]
+    assert list(limit_batches([[1, 2]], None)) == [[1, 2]]
+    with pytest.raises(ValueError):
+        list(chunked([1], 0))
+    with pytest.raises(ValueError):
+        Pipeline.values(1, 0)
@@ -0,0 +1,58 @@
+import pytest
+
+from app.city_filter import filter_cities_by_length
+from app.generators import generate_function_values, generate_two_letter_combinations
+from app.process_backend import ProcessBackend, RemoteTaskError
+
+CITIES = "Москва Питер Казань Уфа Омск Самара Ярославль Астрахань"
+
+@pytest.fixture(scope="module")
+def backend():
+    with ProcessBackend(max_workers=2, batch_size=100) as backend:
+        yield backend
+
+def _flatten(batches):
+    return [item for batch in batches for item in batch]
+
+def test_backend_results_match_sync_generators(backend):
+    """Проверяет, что результаты из процесса-воркера совпадают с обычными генераторами."""
+    assert _flatten(backend.run("combinations")) == list(generate_two_letter_combinations())
+    assert _flatten(backend.run("function_values", a=-5.0, b=7.0, step=0.01)) == \
+        list(generate_function_values(-5.0, 7.0, 0.01))
+    assert _flatten(backend.run("cities", text=CITIES, min_length=5)) == \
+        list(filter_cities_by_length(CITIES, min_length=5))
+    assert _flatten(backend.run("function_values", a=0.0, b=2.0, step=1.0, func="x^2")) == [0.0, 1.0, 4.0]
+
+def test_backend_limit_and_cancel(backend):
+    """Проверяет ограничение количества результатов и отмену задачи закрытием генератора."""
+    assert _flatten(backend.run("combinations", limit=150)) == list(generate_two_letter_combinations())[:150]
+    batches = backend.run("function_values", a=-1000.0, b=1000.0, step=0.001)
+    assert len(next(batches)) == 100
+    batches.close()
+    # Воркер после отмены готов к следующей задаче
+    assert _flatten(backend.run("combinations", limit=3)) == ["aa", "ab", "ac"]
+    assert backend.worker_count <= 2
+
+def test_backend_errors(backend):
+    """Проверяет обработку неизвестной задачи и ошибки в воркере."""
+    with pytest.raises(ValueError, match="Неизвестная задача"):
+        backend.run("unknown")
+    with pytest.raises(RemoteTaskError, match="Шаг"):
+        _flatten(backend.run("function_values", a=0.0, b=1.0, step=0.0))
+    assert _flatten(backend.run("combinations", limit=1)) == ["aa"]
+    with pytest.raises(ValueError):
+        ProcessBackend(max_workers=0)
+
+def test_backend_shutdown():
+    """Проверяет, что после остановки процессы завершены и новые задачи не принимаются."""
+    backend = ProcessBackend(max_workers=1)
+    assert _flatten(backend.run("combinations", limit=2)) == ["aa", "ab"]
+    backend.shutdown()
+    assert backend.worker_count == 0
+    with pytest.raises(RuntimeError):
+        next(backend.run("combinations"))
+
+def test_backend_strings_with_separators(backend):
+    """Проверяет, что строки с переводом строки и пустые строки передаются без искажений."""
+    assert _flatten(backend.run("combinations", alphabet="a\n", k=2)) == ["aa", "a\n", "\na", "\n\n"]
+    assert _flatten(backend.run("combinations", alphabet="яb", k=0)) == [""]
@@ -0,0 +1,33 @@
+import pytest
+
+from app.benchmark import compare_results, import_profile
+
+# Модули, которые консольная версия не должна загружать при запуске
+CONSOLE_FORBIDDEN = (
+    "typing", "re", "ast", "numpy", "asyncio", "multiprocessing", "concurrent.futures.process",
+    "PySide6", "app.expressions", "app.cache", "app.main_multithread", "app.process_backend",
+)
+
+def test_console_startup_imports_only_what_it_needs():
+    """Проверяет (через -X importtime), что при запуске консольной версии не загружаются тяжелые модули."""
+    profile = import_profile("main")
+    assert profile["total_us"] is not None
+    assert "app.generators" in profile["modules"]
+    loaded = [module for module in CONSOLE_FORBIDDEN if module in profile["modules"]]
+    assert loaded == []
+
+def test_ui_startup_does_not_load_optional_backends():
+    """Проверяет, что UI не загружает NumPy, пулы процессов и asyncio до их использования."""
+    pytest.importorskip("PySide6.QtWidgets")
+    assert "PySide6" not in import_profile("main_ui")["modules"]
+    modules = import_profile("ui.main_window")["modules"]
+    assert "PySide6.QtWidgets" in modules
+    loaded = [module for module in ("numpy", "multiprocessing", "asyncio", "app.process_backend", "app.expressions")
+              if module in modules]
+    assert loaded == []
+
+def test_compare_results_reports_slower_startup():
+    """Проверяет, что рост времени импорта считается регрессией."""
+    baseline = {"results": [], "startup": [{"module": "main", "total_us": 10000}]}
+    assert compare_results(baseline, {"results": [], "startup": [{"module": "main", "total_us": 11000}]}) == []
+    assert len(compare_results(baseline, {"results": [], "startup": [{"module": "main", "total_us": 20000}]})) == 1
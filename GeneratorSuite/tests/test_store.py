@@ -0,0 +1,78 @@
+import math
+
+import pytest
+
+from app.city_filter import filter_cities_by_length
+from app.generators import generate_function_values
+from app.store import (StoreFormatError, StringStore, ValueStore, function_id, open_store, write_cities,
+                       write_combinations, write_function_values, write_values)
+
+def test_function_values_roundtrip(tmp_path):
+    """Проверяет, что значения читаются из файла без изменений, а заголовок содержит параметры сетки."""
+    path = str(tmp_path / "values.gsr")
+    assert write_function_values(path, -5, 7, 0.01, batch_size=100) == 1201
+    with open_store(path) as store:
+        assert isinstance(store, ValueStore)
+        assert (store.a, store.b, store.step, len(store)) == (-5, 7, 0.01, 1201)
+        assert store.function_id == "app.generators:f"
+        assert list(store) == list(generate_function_values(-5, 7, 0.01))
+        assert store[10:13].tolist() == list(store.values[10:13])
+        assert store.x(1200) == 7
+
+def test_function_errors_stored_as_nan(tmp_path, capsys):
+    """Проверяет, что точки с ошибкой хранятся как nan и номер значения совпадает с номером точки."""
+    path = str(tmp_path / "values.gsr")
+    assert write_function_values(path, -1, 1, 0.5, "1/x") == 5
+    with ValueStore(path) as store:
+        assert store.function_id == "1/x"
+        assert math.isnan(store[2]) and store.x(2) == 0.0
+        assert [store[0], store[4]] == [-1.0, 1.0]
+    assert "f(0.0)" in capsys.readouterr().err
+
+def test_values_numpy_memmap(tmp_path):
+    """Проверяет чтение значений как numpy.memmap."""
+    np = pytest.importorskip("numpy")
+    path = str(tmp_path / "values.gsr")
+    write_values(path, [np.arange(3, dtype=np.float64), np.arange(3, 5, dtype=np.float64)], 0, 4, 1, "x")
+    with ValueStore(path) as store:
+        mapped = store.as_numpy()
+        assert mapped.tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+        del mapped
+    with pytest.raises(ValueError):
+        write_values(path, [np.arange(3, dtype=np.float64)], 0, 4, 1, "x")
+    assert not (tmp_path / "values.gsr").exists()
+
+def test_strings_roundtrip(tmp_path):
+    """Проверяет запись и чтение сочетаний и городов, включая не-ASCII названия."""
+    path = str(tmp_path / "words.gsr")
+    assert write_combinations(path, "abв", 2, batch_size=4) == 9
+    with open_store(path) as store:
+        assert isinstance(store, StringStore)
+        assert store.meta == {"kind": "combinations", "alphabet": "abв", "k": 2}
+        assert (store[0], store[-1], store[2:4]) == ("aa", "вв", ["aв", "ba"])
+        assert bytes(store.raw(8)) == "вв".encode("utf-8")
+        assert len(list(store)) == 9
+    cities = "Москва Санкт-Петербург Сочи Екатеринбург"
+    assert write_cities(path, filter_cities_by_length(cities, 5), min_length=5) == 3
+    with StringStore(path) as store:
+        assert store[:] == ["Москва", "Санкт-Петербург", "Екатеринбург"]
+        assert store.meta["min_length"] == 5
+    write_cities(path, [])
+    with StringStore(path) as store:
+        assert len(store) == 0 and store[:] == []
+
+def test_invalid_files(tmp_path):
+    """Проверяет, что посторонний, незавершенный или не тот по виду файл не открывается."""
+    path = tmp_path / "bad.gsr"
+    path.write_bytes(b"\0" * 128)
+    with pytest.raises(StoreFormatError):
+        open_store(str(path))
+    write_cities(str(path), ["Москва"])
+    with pytest.raises(StoreFormatError):
+        ValueStore(str(path))
+
+def test_function_id():
+    """Проверяет идентификаторы функций в заголовке."""
+    assert function_id() == "app.generators:f"
+    assert function_id("sin(x)") == "sin(x)"
+    assert function_id(math.sin) == "math:sin"
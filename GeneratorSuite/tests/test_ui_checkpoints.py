@@ -0,0 +1,151 @@
+import os
+import time
+
+import pytest
+
+pytest.importorskip("PySide6.QtWidgets")
+
+from PySide6.QtCore import Qt
+
+from app.checkpoint import ResumableJob, load_checkpoint, save_checkpoint
+from app.combinations import CombinationSpace
+from ui import jobs, main_window
+from ui.jobs import QueueFullError
+
+COMBINATIONS = [word for batch in CombinationSpace().iter_batches(1000) for word in batch]
+
+class AppDataPaths:
+    """Заменяет QStandardPaths в ui.main_window: каталог данных программы — временный каталог теста."""
+    AppDataLocation = main_window.QStandardPaths.AppDataLocation
+    directory = ""
+
+    @classmethod
+    def writableLocation(cls, location):
+        return cls.directory
+
+@pytest.fixture
+def make_window(qt_app, tmp_path, monkeypatch):
+    """Создает окна с каталогом данных во временном каталоге; окна закрываются после теста."""
+    monkeypatch.setattr(AppDataPaths, "directory", str(tmp_path))
+    monkeypatch.setattr(main_window, "QStandardPaths", AppDataPaths)
+    monkeypatch.setattr(main_window, "PULL_BATCH_SIZE", 100)
+    monkeypatch.setattr(jobs, "EMIT_INTERVAL", 0.0)
+    windows = []
+
+    def make():
+        window = main_window.MainWindow()
+        window.errors = []
+        window.show_error_message = window.errors.append
+        windows.append(window)
+        return window
+
+    yield make
+    for window in windows:
+        window.close()
+
+def wait_until(app, predicate, timeout=5.0):
+    """Обрабатывает события Qt, пока predicate() не станет истинным."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "истекло время ожидания"
+        app.processEvents()
+        time.sleep(0.005)
+
+def cancel_after_first_batch(window):
+    """Следующая задача окна будет отменена, как только передаст первый пакет."""
+    submit = window.scheduler.submit
+
+    def submit_once(job):
+        window.scheduler.submit = submit
+        # Прямое соединение: отмена в потоке задачи, до чтения следующего пакета
+        job.signals.batch_ready.connect(lambda batch: job.cancel(), Qt.DirectConnection)
+        return submit(job)
+
+    window.scheduler.submit = submit_once
+
+def interrupted_task1(app, window, limit=0):
+    """Запускает Задание 1 с сохранением прогресса и прерывает его после первого пакета."""
+    window.task1_checkpoint_input.setChecked(True)
+    window.task1_limit_input.setValue(limit)
+    cancel_after_first_batch(window)
+    window.run_task1()
+    wait_until(app, lambda: 1 not in window._jobs)
+
+def test_resume_appends_until_limit(qt_app, make_window):
+    """Проверяет учет extra["limit"] и extra["emitted"]: продолжение дописывает результаты до limit."""
+    window = make_window()
+    interrupted_task1(qt_app, window, limit=300)
+    path = window._checkpoint_path(1)
+    state = load_checkpoint(path)
+    assert window.task1_output_model.rowCount() == 100
+    assert (state["cursor"], state["extra"]) == (100, {"limit": 300, "emitted": 100})
+    assert window.task1_status.text().endswith("Можно продолжить.")
+
+    window.resume_task(1)
+    wait_until(qt_app, lambda: 1 not in window._jobs)
+    assert window.task1_output_model.items() == COMBINATIONS[:300]
+    assert not os.path.exists(path)
+    assert 1 not in window._checkpoints
+    window.resume_task(1)
+    assert window.task1_status.text() == "Нет незавершенной задачи."
+
+def test_resume_replaces_output_of_other_run(qt_app, make_window):
+    """Проверяет, что после обычного запуска продолжение заменяет вывод оставшимися результатами."""
+    window = make_window()
+    interrupted_task1(qt_app, window)
+    window.task1_checkpoint_input.setChecked(False)
+    window.run_task1()
+    wait_until(qt_app, lambda: 1 not in window._jobs)
+    assert window.task1_output_model.rowCount() == len(COMBINATIONS)
+    assert os.path.exists(window._checkpoint_path(1))
+
+    window.resume_task(1)
+    wait_until(qt_app, lambda: 1 not in window._jobs)
+    assert window.task1_output_model.items() == COMBINATIONS[100:]
+    assert not os.path.exists(window._checkpoint_path(1))
+
+def test_rejected_run_keeps_checkpoint(qt_app, make_window):
+    """Проверяет, что новая задача, не принятая планировщиком, не удаляет незавершенную."""
+    window = make_window()
+    interrupted_task1(qt_app, window)
+    job = window._checkpoint_jobs[1]
+
+    def reject(job):
+        raise QueueFullError("Очередь задач заполнена")
+
+    window.scheduler.submit = reject
+    window.run_task1()
+    assert window.errors == ["Очередь задач заполнена"]
+    assert window._checkpoint_jobs[1] is job
+    assert load_checkpoint(window._checkpoint_path(1))["cursor"] == 100
+
+def test_snapshots_of_replaced_job_are_ignored(qt_app, make_window):
+    """Проверяет, что снимок задачи, которая больше не владеет контрольной точкой, не сохраняется."""
+    window = make_window()
+    interrupted_task1(qt_app, window)
+    stale = ResumableJob.combinations()
+    stale.extra.update(limit=676, emitted=0)
+    window._on_job_checkpoint(1, jobs.GeneratorJob("stale", [], resumable=stale), stale.state(), 600)
+    assert load_checkpoint(window._checkpoint_path(1))["extra"]["emitted"] == 100
+
+def test_checkpoint_restored_after_restart(qt_app, make_window, tmp_path):
+    """Проверяет восстановление контрольной точки при запуске окна и продолжение в пустой вкладке."""
+    resumable = ResumableJob.combinations(start=200)
+    resumable.extra.update(limit=500, emitted=200)
+    os.makedirs(tmp_path / main_window.CHECKPOINT_SUBDIR)
+    save_checkpoint(str(tmp_path / main_window.CHECKPOINT_SUBDIR / "task1.json"), resumable.state())
+    window = make_window()
+    assert window.task1_status.text().startswith("Найдена незавершенная задача (30%)")
+    window.resume_task(1)
+    wait_until(qt_app, lambda: 1 not in window._jobs)
+    assert window.task1_output_model.items() == COMBINATIONS[200:500]
+
+def test_checkpoint_directory_is_locked(qt_app, make_window):
+    """Проверяет, что каталогом контрольных точек владеет одно окно."""
+    first = make_window()
+    second = make_window()
+    assert first._checkpoint_dir is not None and second._checkpoint_dir is None
+    assert not second.task2_checkpoint_input.isEnabled()
+    assert second.task2_checkpoint_input.toolTip() == "Контрольные точки использует другое окно программы."
+    first.close()
+    assert make_window()._checkpoint_dir == first._checkpoint_dir
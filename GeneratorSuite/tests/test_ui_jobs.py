@@ -0,0 +1,198 @@
+import threading
+import time
+from array import array
+
+import pytest
+
+pytest.importorskip("PySide6.QtCore")
+
+from ui import jobs
+from ui.jobs import GeneratorJob, JobScheduler, QueueFullError
+from ui.result_model import ResultListModel
+
+BATCHES = [list(range(start, start + 3)) for start in range(0, 30, 3)]
+
+def run_job(job):
+    """Выполняет задачу в текущем потоке и возвращает переданные пакеты и проценты выполнения."""
+    emitted, progress = [], []
+    job.signals.batch_ready.connect(emitted.append)
+    job.signals.progress.connect(progress.append)
+    job.run()
+    return emitted, progress
+
+def test_job_emits_when_batch_size_reached(qt_app, monkeypatch):
+    """Проверяет, что пакеты накапливаются до EMIT_BATCH_SIZE, а остаток передается в конце."""
+    monkeypatch.setattr(jobs, "EMIT_BATCH_SIZE", 7)
+    monkeypatch.setattr(jobs, "EMIT_INTERVAL", 3600.0)
+    job = GeneratorJob("test", BATCHES, total=30)
+    emitted, progress = run_job(job)
+    assert [len(batch) for batch in emitted] == [9, 9, 9, 3]
+    assert [item for batch in emitted for item in batch] == list(range(30))
+    assert progress == [30, 60, 90, 100]
+    assert job.processed == 30
+
+def test_job_emits_by_interval(qt_app, monkeypatch):
+    """Проверяет, что по истечении EMIT_INTERVAL передается каждый накопленный пакет."""
+    monkeypatch.setattr(jobs, "EMIT_INTERVAL", 0.0)
+    emitted, _ = run_job(GeneratorJob("test", BATCHES))
+    assert emitted == BATCHES
+
+def test_job_limit_slices_last_batch(qt_app, monkeypatch):
+    """Проверяет, что limit обрезает пакет и останавливает чтение генератора."""
+    monkeypatch.setattr(jobs, "EMIT_BATCH_SIZE", 7)
+    monkeypatch.setattr(jobs, "EMIT_INTERVAL", 3600.0)
+    pulled = []
+
+    def batches():
+        for batch in BATCHES:
+            pulled.append(batch)
+            yield batch
+
+    job = GeneratorJob("test", batches(), limit=20, total=30, new_buffer=lambda: array("d"))
+    emitted, progress = run_job(job)
+    assert [len(batch) for batch in emitted] == [9, 9, 2]
+    assert all(isinstance(batch, array) for batch in emitted)
+    assert list(emitted[-1]) == [18.0, 19.0]
+    assert len(pulled) == 7
+    assert progress[-1] == 100
+    assert job.processed == 20
+
+def test_cancelled_job_emits_nothing(qt_app):
+    """Проверяет, что задача, отмененная до запуска, не читает генератор."""
+    job = GeneratorJob("test", BATCHES)
+    cancelled = []
+    job.signals.cancelled.connect(lambda: cancelled.append(True))
+    job.cancel()
+    emitted, _ = run_job(job)
+    assert emitted == [] and cancelled == [True]
+    assert job.processed == 0
+
+def test_job_reports_generator_error(qt_app):
+    """Проверяет, что исключение генератора передается сигналом error_occurred."""
+    def batches():
+        yield [1, 2]
+        raise ValueError("сбой")
+
+    errors = []
+    job = GeneratorJob("test", batches())
+    job.signals.error_occurred.connect(errors.append)
+    run_job(job)
+    assert errors == ["Ошибка в задаче 'test': сбой"]
+
+def test_model_appends_batches_up_to_max_rows(qt_app):
+    """Проверяет вставку пакетов в модель и ограничение max_rows."""
+    model = ResultListModel(numeric=True, formatter=lambda value: f"{value:.1f}", max_rows=5)
+    inserted = []
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+    model.append_batch(array("d", [1.0, 2.0, 3.0]))
+    model.append_batch(array("d", [4.0, 5.0, 6.0]))
+    model.append_batch(array("d", [7.0]))
+    assert model.rowCount() == 5
+    assert inserted == [(0, 2), (3, 4)]
+    assert list(model.items()) == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert model.data(model.index(4)) == "5.0"
+    assert model.data(model.index(5)) is None
+    model.clear()
+    assert model.rowCount() == 0
+    assert isinstance(model.items(), array)
+
+def test_model_receives_job_batches(qt_app, monkeypatch):
+    """Проверяет, что строки модели совпадают с переданными задачей элементами."""
+    monkeypatch.setattr(jobs, "EMIT_BATCH_SIZE", 4)
+    model = ResultListModel()
+    job = GeneratorJob("test", (batch for batch in BATCHES), limit=25)
+    job.signals.batch_ready.connect(model.append_batch)
+    job.run()
+    assert model.rowCount() == 25
+    assert model.items() == list(range(25))
+    model.set_max_rows(26)
+    model.append_batch(iter(["a", "b"]))
+    assert model.items()[-1] == "a"
+
+# --- Планировщик ---
+
+def wait_until(app, predicate, timeout=5.0):
+    """Обрабатывает события Qt, пока predicate() не станет истинным (сигналы потоков задач доставляются в цикле событий)."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "истекло время ожидания"
+        app.processEvents()
+        time.sleep(0.005)
+
+def blocking_job(release, name="blocking", total=None):
+    """Задача, которая передает один пакет и ждет release, прежде чем прочитать второй."""
+    started = threading.Event()
+
+    def batches():
+        yield [1]
+        started.set()
+        release.wait(5)
+        yield [2]
+
+    job = GeneratorJob(name, batches(), total=total)
+    job.started = started
+    return job
+
+def record_signals(job):
+    """Собирает сигналы завершения задачи в список."""
+    events = []
+    job.signals.finished.connect(lambda: events.append("finished"))
+    job.signals.cancelled.connect(lambda: events.append("cancelled"))
+    return events
+
+def test_scheduler_queue_full_and_promotion(qt_app):
+    """Проверяет очередь при max_concurrent=1: переполнение, отмену ожидающей задачи и запуск следующей."""
+    scheduler = JobScheduler(max_concurrent=1, max_pending=1)
+    release = threading.Event()
+    first = blocking_job(release)
+    waiting = GeneratorJob("waiting", [[1]])
+    waiting_events = record_signals(waiting)
+    scheduler.submit(first)
+    scheduler.submit(waiting)
+    assert scheduler.active_jobs == [first]
+    assert scheduler.pending_jobs == [waiting]
+    with pytest.raises(QueueFullError):
+        scheduler.submit(GeneratorJob("rejected", [[1]]))
+
+    scheduler.cancel(waiting)
+    assert waiting_events == ["cancelled"]
+    assert scheduler.pending_jobs == []
+    last = GeneratorJob("last", [[3, 4]])
+    last_events = record_signals(last)
+    scheduler.submit(last)
+    assert scheduler.pending_jobs == [last]
+
+    release.set()
+    wait_until(qt_app, lambda: not scheduler.active_jobs and not scheduler.pending_jobs)
+    assert scheduler.wait(5000)
+    assert last_events == ["finished"]
+    assert waiting.processed == 0
+
+def test_scheduler_cancels_active_job(qt_app):
+    """Проверяет, что отмененная выполняющаяся задача останавливается перед следующим пакетом."""
+    scheduler = JobScheduler(max_concurrent=1, max_pending=1)
+    release = threading.Event()
+    job = blocking_job(release)
+    events = record_signals(job)
+    emitted = []
+    job.signals.batch_ready.connect(emitted.append)
+    scheduler.submit(job)
+    assert job.started.wait(5)
+    scheduler.cancel(job)
+    assert scheduler.active_jobs == [job]
+    release.set()
+    wait_until(qt_app, lambda: not scheduler.active_jobs)
+    assert events == ["cancelled"]
+    assert emitted == [[1]]
+    assert job.processed == 1
+
+def test_scheduler_reports_progress(qt_app, monkeypatch):
+    """Проверяет проценты выполнения задачи, запущенной планировщиком."""
+    monkeypatch.setattr(jobs, "EMIT_INTERVAL", 0.0)
+    scheduler = JobScheduler(max_concurrent=1, max_pending=1)
+    job = GeneratorJob("progress", [[1], [2], [3], [4]], total=4)
+    progress = []
+    job.signals.progress.connect(progress.append)
+    scheduler.submit(job)
+    wait_until(qt_app, lambda: not scheduler.active_jobs)
+    assert progress == [25, 50, 75, 100, 100]
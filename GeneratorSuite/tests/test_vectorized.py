@@ -0,0 +1,52 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.generators import generate_function_values, f
+from app.metrics import collect_metrics
+from app.vectorized import (
+    generate_function_value_chunks, function_values_array, RTOL, ATOL
+)
+
+def test_function_values_array_matches_scalar():
+    """Проверяет, что векторизованный режим совпадает со скалярным генератором."""
+    scalar = list(generate_function_values(a=-5.0, b=7.0, step=0.5))
+    vector = function_values_array(a=-5.0, b=7.0, step=0.5)
+    assert len(vector) == len(scalar)
+    np.testing.assert_allclose(vector, scalar, rtol=RTOL, atol=ATOL)
+
+def test_generate_function_value_chunks_sizes():
+    """Проверяет разбиение сетки на блоки заданного размера."""
+    chunks = list(generate_function_value_chunks(a=0.0, b=9.0, step=1.0, chunk_size=4))
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    np.testing.assert_allclose(np.concatenate(chunks), [f(x) for x in range(10)])
+
+def test_function_values_array_expression():
+    """Проверяет векторный режим для строки-выражения и произвольной функции."""
+    np.testing.assert_allclose(function_values_array(0.0, 3.0, 1.0, func="sqrt(x)"), np.sqrt([0, 1, 2, 3]))
+    np.testing.assert_allclose(function_values_array(0.0, 3.0, 1.0, func=lambda x: 2 * x), [0, 2, 4, 6])
+
+def test_vectorized_invalid_params():
+    """Проверяет обработку некорректных параметров."""
+    with pytest.raises(ValueError, match="Шаг \\(step\\) должен быть положительным."):
+        function_values_array(a=-5, b=7, step=0)
+    with pytest.raises(ValueError, match="Размер блока"):
+        list(generate_function_value_chunks(a=-5, b=7, step=0.1, chunk_size=0))
+
+def test_non_finite_results_match_scalar(capsys):
+    """Проверяет, что inf и nan, возвращенные функцией, сохраняются, а пропускаются только точки с исключениями."""
+    for func in ("1/x", "log(x)", "1e308 * x * 10", "exp(x * 400)", lambda x: float("nan") if x == 0 else x):
+        scalar = list(generate_function_values(a=-2.0, b=2.0, step=1.0, func=func))
+        vector = function_values_array(a=-2.0, b=2.0, step=1.0, func=func)
+        assert len(vector) == len(scalar)
+        np.testing.assert_allclose(vector, scalar, rtol=RTOL, atol=ATOL)
+    assert "Ошибка при вычислении" in capsys.readouterr().err
+
+def test_errors_counted_in_metrics(capsys):
+    """Проверяет, что точки с ошибками векторного режима учитываются в метриках, как у скалярного генератора."""
+    with collect_metrics() as recorder:
+        assert function_values_array(a=-2.0, b=2.0, step=1.0, func="sqrt(x)").tolist() == [0.0, 1.0, math.sqrt(2)]
+    assert recorder.counter("function_values.errors") == 2
+    assert "Ошибка при вычислении f(x) в 2 точках, первая x=-2.0" in capsys.readouterr().err
@@ -0,0 +1,238 @@
+import itertools
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Deque, Iterable, List, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+from app import metrics
+
+if TYPE_CHECKING:
+    from app.checkpoint import ResumableJob
+
+# --- Задачи и планировщик для UI ---
+#
+# Каждый запуск генератора — отдельный объект GeneratorJob (QRunnable),
+# который выполняется на QThreadPool. Поэтому вкладки работают параллельно,
+# каждую задачу можно отменить отдельно, а повторный запуск не мешает
+# уже выполняющейся задаче. JobScheduler ограничивает число одновременно
+# выполняемых задач и длину очереди ожидающих (при переполнении очереди
+# новые задачи отклоняются).
+#
+# Задача с resumable (app.checkpoint.ResumableJob) отмечает каждый забранный
+# пакет как обработанный и периодически (а также при остановке) передает
+# снимок его состояния сигналом checkpoint. Курсор resumable меняется только
+# в потоке задачи, а сохраняет снимки на диск UI в своем потоке, поэтому
+# отмененная задача не может перезаписать контрольную точку новой.
+
+# Результаты передаются в UI пакетами: не чаще раза в EMIT_INTERVAL секунд
+# или как только накопится EMIT_BATCH_SIZE элементов.
+EMIT_INTERVAL = 0.05
+EMIT_BATCH_SIZE = 10000
+
+DEFAULT_MAX_PENDING = 8
+# Интервал передачи снимков состояния задачи с курсором, секунды
+CHECKPOINT_INTERVAL = 2.0
+
+class QueueFullError(RuntimeError):
+    """Исключение, если очередь задач планировщика заполнена."""
+    pass
+
+class JobSignals(QObject):
+    """Сигналы задачи (QRunnable не является QObject и не может иметь сигналов)."""
+    batch_ready = Signal(object) # Пакет результатов: список или array('d')
+    progress = Signal(int) # Процент выполнения, если количество элементов известно заранее
+    finished = Signal() # Задача выполнена полностью
+    cancelled = Signal() # Задача отменена
+    error_occurred = Signal(str) # Сообщение об ошибке
+    checkpoint = Signal(object, int) # Снимок состояния resumable (ResumableJob.state()) и число переданных элементов
+    done = Signal(object) # Задача завершилась (любым способом), аргумент - сама задача
+
+class GeneratorJob(QRunnable):
+    """
+    Одна задача: забирает пакеты из генератора batches и передает их в UI.
+    :param batches: итерируемый объект пакетов (списков или массивов)
+    :param limit: сколько элементов передать (None - все)
+    :param total: сколько элементов ожидается (для процента выполнения), None - неизвестно
+    :param new_buffer: фабрика пустого буфера для накопления пакета (list или array)
+    :param resumable: задача с курсором, из которой получены batches (resumable.batches(...));
+        пока задача выполняется, resumable читается и меняется только в ее потоке
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, name: str, batches: Iterable[Any], limit: Optional[int] = None,
+                 total: Optional[int] = None, new_buffer: Callable[[], Any] = list,
+                 resumable: Optional["ResumableJob"] = None):
+        super().__init__()
+        self.setAutoDelete(False) # Объектом владеет Python (планировщик), а не QThreadPool
+        self.id = next(GeneratorJob._ids)
+        self.name = name
+        self.signals = JobSignals()
+        self._batches = batches
+        self._limit = limit
+        self._total = min(total, limit) if total is not None and limit is not None else total
+        self._new_buffer = new_buffer
+        self.resumable = resumable
+        self._checkpoint_at = time.monotonic()
+        self._cancelled = False
+        self.processed = 0
+
+    def cancel(self) -> None:
+        """
+        Запрашивает отмену: задача остановится перед следующим пакетом,
+        уже забранные элементы будут переданы в UI.
+        """
+        self._cancelled = True
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled
+
+    def run(self) -> None:
+        recorder = metrics.current()
+        started = time.perf_counter()
+        try:
+            if not self._cancelled:
+                self._emit_batches(recorder)
+            if self._cancelled:
+                self.signals.cancelled.emit()
+                if recorder is not None:
+                    recorder.count("job.cancelled")
+            else:
+                self.signals.finished.emit()
+        except Exception as e:
+            self.signals.error_occurred.emit(f"Ошибка в задаче '{self.name}': {e}")
+            if recorder is not None:
+                recorder.count("job.errors")
+        finally:
+            self._batches = None
+            if recorder is not None:
+                recorder.record("job", time.perf_counter() - started, self.processed)
+            self.signals.done.emit(self)
+
+    def _emit_batches(self, recorder: Optional[metrics.MetricsRecorder] = None) -> None:
+        """
+        Накапливает элементы и отправляет их в UI не чаще раза в EMIT_INTERVAL секунд.
+        Если включены метрики, время накопления каждого пакета учитывается в замере "job.batch".
+        """
+        limit = self._limit
+        pending = self._new_buffer()
+        last_emit = time.monotonic()
+        last_percent = -1
+        for batch in self._batches:
+            if self._cancelled:
+                break
+            if limit is not None:
+                batch = batch[:limit - self.processed]
+            pending.extend(batch)
+            self.processed += len(batch)
+            if self.resumable is not None:
+                self._commit(len(batch))
+            now = time.monotonic()
+            if len(pending) >= EMIT_BATCH_SIZE or now - last_emit >= EMIT_INTERVAL:
+                if recorder is not None:
+                    recorder.record("job.batch", now - last_emit, len(pending))
+                self.signals.batch_ready.emit(pending)
+                pending = self._new_buffer()
+                last_emit = now
+                last_percent = self._emit_progress(last_percent)
+            if limit is not None and self.processed >= limit:
+                break
+        if len(pending):
+            if recorder is not None:
+                recorder.record("job.batch", time.monotonic() - last_emit, len(pending))
+            self.signals.batch_ready.emit(pending)
+        if self.resumable is not None:
+            self.signals.checkpoint.emit(self.resumable.state(), self.processed)
+        if self._total is not None and not self._cancelled:
+            self.signals.progress.emit(100)
+
+    def _commit(self, count: int) -> None:
+        """Отмечает count элементов пакета обработанными и не чаще раза в CHECKPOINT_INTERVAL секунд передает снимок."""
+        self.resumable.commit(count)
+        now = time.monotonic()
+        if now - self._checkpoint_at >= CHECKPOINT_INTERVAL:
+            self._checkpoint_at = now
+            self.signals.checkpoint.emit(self.resumable.state(), self.processed)
+
+    def _emit_progress(self, last_percent: int) -> int:
+        if not self._total:
+            return last_percent
+        percent = min(100, self.processed * 100 // self._total)
+        if percent != last_percent:
+            self.signals.progress.emit(percent)
+        return percent
+
+class JobScheduler(QObject):
+    """
+    Планировщик задач GeneratorJob на собственном QThreadPool.
+    Одновременно выполняется не более max_concurrent задач, еще не более
+    max_pending ждут в очереди; submit при заполненной очереди выдает QueueFullError.
+    """
+
+    def __init__(self, max_concurrent: Optional[int] = None, max_pending: int = DEFAULT_MAX_PENDING, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        if max_concurrent is not None:
+            self._pool.setMaxThreadCount(max_concurrent)
+        self.max_concurrent = self._pool.maxThreadCount()
+        self.max_pending = max_pending
+        self._active: List[GeneratorJob] = []
+        self._pending: Deque[GeneratorJob] = deque()
+
+    def submit(self, job: GeneratorJob) -> GeneratorJob:
+        """
+        Ставит задачу в очередь и запускает ее, если есть свободный поток.
+        Исключительные ситуации:
+        - Если очередь ожидающих задач заполнена, выдает QueueFullError.
+        """
+        if len(self._active) >= self.max_concurrent and len(self._pending) >= self.max_pending:
+            raise QueueFullError("Очередь задач заполнена, дождитесь завершения текущих задач.")
+        job.signals.done.connect(self._on_job_done)
+        self._pending.append(job)
+        self._start_pending()
+        self._record_queue_depth()
+        return job
+
+    def cancel(self, job: GeneratorJob) -> None:
+        """Отменяет задачу: ожидающая удаляется из очереди, выполняющаяся останавливается."""
+        job.cancel()
+        if job in self._pending:
+            self._pending.remove(job)
+            job.signals.cancelled.emit()
+
+    def cancel_all(self) -> None:
+        for job in list(self._pending) + list(self._active):
+            self.cancel(job)
+
+    def wait(self, timeout_ms: int = -1) -> bool:
+        """Ждет завершения всех выполняющихся задач."""
+        return self._pool.waitForDone(timeout_ms)
+
+    @property
+    def active_jobs(self) -> List[GeneratorJob]:
+        return list(self._active)
+
+    @property
+    def pending_jobs(self) -> List[GeneratorJob]:
+        return list(self._pending)
+
+    def _start_pending(self) -> None:
+        while self._pending and len(self._active) < self.max_concurrent:
+            job = self._pending.popleft()
+            self._active.append(job)
+            self._pool.start(job)
+
+    @Slot(object)
+    def _on_job_done(self, job: GeneratorJob) -> None:
+        if job in self._active:
+            self._active.remove(job)
+        self._start_pending()
+        self._record_queue_depth()
+
+    def _record_queue_depth(self) -> None:
+        recorder = metrics.current()
+        if recorder is not None:
+            recorder.gauge("scheduler.pending", len(self._pending))
+            recorder.gauge("scheduler.active", len(self._active))
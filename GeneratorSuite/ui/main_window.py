@@ -1,90 +1,38 @@
-import sys
+import os
+from array import array
+from functools import partial
 from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QTabWidget, QLabel, QPushButton, QLineEdit, QSpinBox, QDoubleSpinBox,
-    QTextEdit, QListWidget, QListWidgetItem, QGridLayout, QMessageBox
+    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTabWidget, QLabel, QPushButton, QLineEdit,
+    QSpinBox, QDoubleSpinBox, QListView, QGridLayout, QMessageBox, QProgressBar, QCheckBox
 )
-from PySide6.QtCore import Qt, Slot, QThread, Signal
-from typing import Generator, Iterator, List, Optional, Tuple # Импортируем для аннотаций
+from PySide6.QtCore import QLockFile, QStandardPaths, QTimer, Slot
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple # Импортируем для аннотаций
 
 # Импортируем наши генераторы и фильтры
-from app.generators import generate_two_letter_combinations, generate_function_values, f
-from app.city_filter import filter_cities_by_length
-
-# --- Вспомогательный класс для многопоточности (для UI) ---
-# Этот класс поможет вынести долгие операции в отдельный поток,
-# чтобы UI не зависал.
-
-class GeneratorWorker(QThread):
-    # Сигналы для передачи результатов обратно в UI поток
-    progress_combination = Signal(str)
-    progress_function_value = Signal(float)
-    progress_city = Signal(str)
-    finished_combinations = Signal()
-    finished_function_values = Signal()
-    finished_cities = Signal()
-    error_occurred = Signal(str) # Сигнал для передачи сообщений об ошибках
-
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self._running = False
-        self._generators = {} # Словарь для хранения ссылок на генераторы
-
-    def run(self):
-        self._running = True
-        try:
-            # Обработка Задания 1
-            if 'combinations' in self._generators:
-                gen = self._generators['combinations']
-                for i, item in enumerate(gen):
-                    if not self._running: break
-                    if i < 50: # Выводим только первые 50, как в условии
-                        self.progress_combination.emit(item)
-                    else:
-                        break # Останавливаемся после 50
-                self.finished_combinations.emit()
-
-            # Обработка Задания 2
-            if 'function_values' in self._generators:
-                gen = self._generators['function_values']
-                for i, value in enumerate(gen):
-                    if not self._running: break
-                    if i < 20: # Выводим только первые 20
-                        self.progress_function_value.emit(value)
-                    else:
-                        break # Останавливаемся после 20
-                self.finished_function_values.emit()
-
-            # Обработка Задания 3
-            if 'cities' in self._generators:
-                gen = self._generators['cities']
-                # Извлекаем первые 3 значения
-                try:
-                    for _ in range(3):
-                        if not self._running: break
-                        city = next(gen)
-                        self.progress_city.emit(city)
-                    # Если генератор закончился раньше, это нормально
-                except StopIteration:
-                    pass # Просто заканчиваем, если городов меньше 3
-                self.finished_cities.emit()
-
-        except Exception as e:
-            self.error_occurred.emit(f"Ошибка в рабочем потоке: {e}")
-        finally:
-            self._running = False
-            # Очищаем использованные генераторы
-            self._generators.clear()
-
-    def set_generators(self, generators: dict):
-        """
-        Устанавливает генераторы, которые нужно выполнить.
-        :param generators: Словарь вида {'name': generator_object}
-        """
-        self._generators = generators
-
-    def stop(self):
-        self._running = False
+from app.combinations import CombinationSpace
+from app.generators import generate_two_letter_combinations
+from app.grid import point_count
+from app.city_index import CityIndex
+from app.checkpoint import CheckpointError, ResumableJob, load_checkpoint, remove_checkpoint, save_checkpoint
+from app import metrics
+from ui.jobs import GeneratorJob, JobScheduler, QueueFullError
+from ui.result_model import ResultListModel
+
+# Процессы-воркеры (multiprocessing) загружаются только при включении флажка
+if TYPE_CHECKING:
+    from app.process_backend import ProcessBackend
+
+# Размер пакета, который задача забирает у генератора за одно обращение
+PULL_BATCH_SIZE = 4096
+# Максимальное количество выводимых результатов в одной вкладке
+MAX_OUTPUT_ROWS = 10_000_000
+# Задержка автоматического пересчета Задания 2 после последнего изменения параметров, мс
+AUTO_RUN_DELAY_MS = 250
+# Каталог контрольных точек незавершенных задач вкладок (см. app/checkpoint.py)
+# внутри каталога данных программы пользователя (QStandardPaths.AppDataLocation)
+CHECKPOINT_SUBDIR = "checkpoints"
+# Вкладки, задачи которых можно продолжить, и вид их задач
+RESUMABLE_KINDS = {1: "combinations", 2: "function_values"}
 
 class MainWindow(QMainWindow):
     def __init__(self, parent=None):
@@ -96,37 +44,86 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(self.central_widget)
         self.layout = QVBoxLayout(self.central_widget)
 
+        # Вычисления в отдельных процессах: интерфейс не делит GIL с расчетами
+        self.use_processes_input = QCheckBox("Вычислять в отдельных процессах")
+        self.layout.addWidget(self.use_processes_input)
+        self._backend: Optional["ProcessBackend"] = None # Запускается при первом использовании
+
+        # Метрики (app.metrics): собираются, пока отмечен флажок
+        metrics_layout = QHBoxLayout()
+        self.collect_metrics_input = QCheckBox("Собирать метрики")
+        self.collect_metrics_input.toggled.connect(self.toggle_metrics)
+        metrics_layout.addWidget(self.collect_metrics_input)
+        btn_metrics = QPushButton("Показать метрики")
+        btn_metrics.clicked.connect(self.show_metrics)
+        metrics_layout.addWidget(btn_metrics)
+        self.layout.addLayout(metrics_layout)
+
         self.tab_widget = QTabWidget()
         self.layout.addWidget(self.tab_widget)
 
+        # Индекс городов для последней введенной строки (строится один раз на строку)
+        self._city_index_text: Optional[str] = None
+        self._city_index: Optional[CityIndex] = None
+
         self.init_task1_tab()
         self.init_task2_tab()
         self.init_task3_tab()
 
-        # --- Worker для многопоточности ---
-        self.worker = GeneratorWorker(self)
-        self.worker.progress_combination.connect(self.add_to_task1_output)
-        self.worker.progress_function_value.connect(self.add_to_task2_output)
-        self.worker.progress_city.connect(self.add_to_task3_output)
-        self.worker.finished_combinations.connect(self.on_task1_finished)
-        self.worker.finished_function_values.connect(self.on_task2_finished)
-        self.worker.finished_cities.connect(self.on_task3_finished)
-        self.worker.error_occurred.connect(self.show_error_message)
+        # --- Планировщик задач ---
+        # Каждый запуск - отдельная задача на пуле потоков, вкладки работают параллельно.
+        self.scheduler = JobScheduler(parent=self)
+        self._jobs: Dict[int, GeneratorJob] = {} # Текущая задача каждой вкладки
+        self._outputs = {1: self.task1_output_model, 2: self.task2_output_model, 3: self.task3_output_model}
+        self._statuses = {1: self.task1_status, 2: self.task2_status, 3: self.task3_status}
+        self._progress_bars = {1: self.task1_progress, 2: self.task2_progress, 3: self.task3_progress}
+        self._limit_inputs = {1: self.task1_limit_input, 2: self.task2_limit_input, 3: self.task3_limit_input}
+        self._checkpoint_inputs = {1: self.task1_checkpoint_input, 2: self.task2_checkpoint_input}
+        self._buffers = {1: list, 2: lambda: array("d"), 3: list}
+        self._finished_messages = {
+            1: "Генерация комбинаций завершена.",
+            2: "Генерация значений функции завершена.",
+            3: "Фильтрация городов завершена.",
+        }
+        # Незавершенные задачи вкладок 1 и 2 (последний снимок состояния ResumableJob):
+        # продолжаются кнопкой «Продолжить», в том числе после перезапуска программы
+        # (по контрольной точке на диске)
+        self._checkpoints: Dict[int, Dict[str, Any]] = {}
+        # Задача, снимки которой сохраняются в контрольную точку вкладки
+        self._checkpoint_jobs: Dict[int, GeneratorJob] = {}
+        # Выведены ли во вкладке результаты незавершенной задачи (продолжение дописывает их)
+        self._shows_checkpoint: Dict[int, bool] = {}
+        self._checkpoint_dir: Optional[str] = None
+        self._checkpoint_lock: Optional[QLockFile] = None
+        self._init_checkpoints()
 
     def init_task1_tab(self):
         """Инициализация вкладки для Задания 1."""
         tab = QWidget()
         layout = QVBoxLayout(tab)
 
-        self.task1_output = QTextEdit()
-        self.task1_output.setReadOnly(True)
+        self.task1_output_model = ResultListModel(parent=self)
+        self.task1_output = self._create_output_view(self.task1_output_model)
         layout.addWidget(self.task1_output)
+        self.task1_status = QLabel()
+        layout.addWidget(self.task1_status)
+
+        layout.addWidget(QLabel("Сколько выводить (0 - все):"))
+        self.task1_limit_input = self._create_limit_input(50)
+        layout.addWidget(self.task1_limit_input)
+        self.task1_checkpoint_input = self._create_checkpoint_input()
+        layout.addWidget(self.task1_checkpoint_input)
 
-        btn_run = QPushButton("Выполнить Задание 1 (Первые 50)")
+        btn_run = QPushButton("Выполнить Задание 1")
         btn_run.setObjectName("btn_run_task1")
         btn_run.clicked.connect(self.run_task1)
         layout.addWidget(btn_run)
 
+        self.task1_progress, btn_cancel = self._create_job_controls(1)
+        layout.addWidget(self.task1_progress)
+        layout.addWidget(btn_cancel)
+        layout.addWidget(self._create_resume_button(1))
+
         self.tab_widget.addTab(tab, "Комбинации Букв")
 
     def init_task2_tab(self):
@@ -150,19 +147,45 @@ class MainWindow(QMainWindow):
 
         layout.addWidget(QLabel("Шаг"), 1, 0)
         self.task2_step_input = QDoubleSpinBox()
+        self.task2_step_input.setDecimals(3) # Иначе шаг округляется до 0.01
         self.task2_step_input.setRange(0.001, 10.0) # Шаг должен быть > 0
         self.task2_step_input.setSingleStep(0.001)
         self.task2_step_input.setValue(0.01)
         layout.addWidget(self.task2_step_input, 1, 1)
-
-        btn_run = QPushButton("Выполнить Задание 2 (Первые 20)")
+        self.task2_checkpoint_input = self._create_checkpoint_input()
+        layout.addWidget(self.task2_checkpoint_input, 1, 2)
+
+        layout.addWidget(QLabel("Сколько выводить (0 - все)"), 2, 0)
+        self.task2_limit_input = self._create_limit_input(20)
+        layout.addWidget(self.task2_limit_input, 2, 1)
+
+        # Автоматический пересчет: запускается, когда параметры не меняются AUTO_RUN_DELAY_MS мс.
+        # Значения берутся из кэша (app.cache), поэтому вычисляются только новые точки.
+        self.task2_auto_run_input = QCheckBox("Пересчитывать при изменении")
+        self.task2_auto_run_input.setChecked(True)
+        layout.addWidget(self.task2_auto_run_input, 2, 2)
+        self._task2_timer = QTimer(self)
+        self._task2_timer.setSingleShot(True)
+        self._task2_timer.setInterval(AUTO_RUN_DELAY_MS)
+        self._task2_timer.timeout.connect(self._auto_run_task2)
+        for spin_box in (self.task2_a_input, self.task2_b_input, self.task2_step_input, self.task2_limit_input):
+            spin_box.valueChanged.connect(self._schedule_task2)
+
+        btn_run = QPushButton("Выполнить Задание 2")
         btn_run.setObjectName("btn_run_task2")
         btn_run.clicked.connect(self.run_task2)
-        layout.addWidget(btn_run, 2, 0, 1, 3) # Растягиваем кнопку на 3 колонки
+        layout.addWidget(btn_run, 3, 0, 1, 3) # Растягиваем кнопку на 3 колонки
 
-        self.task2_output = QTextEdit()
-        self.task2_output.setReadOnly(True)
-        layout.addWidget(self.task2_output, 3, 0, 1, 3)
+        self.task2_progress, btn_cancel = self._create_job_controls(2)
+        layout.addWidget(self.task2_progress, 4, 0)
+        layout.addWidget(btn_cancel, 4, 1)
+        layout.addWidget(self._create_resume_button(2), 4, 2)
+
+        self.task2_status = QLabel()
+        layout.addWidget(self.task2_status, 5, 0, 1, 3)
+        self.task2_output_model = ResultListModel(numeric=True, formatter="{:.4f}".format, parent=self)
+        self.task2_output = self._create_output_view(self.task2_output_model)
+        layout.addWidget(self.task2_output, 6, 0, 1, 3)
 
         self.tab_widget.addTab(tab, "Значения Функции")
 
@@ -182,51 +205,192 @@ class MainWindow(QMainWindow):
         self.task3_min_len_input.setValue(5)
         layout.addWidget(self.task3_min_len_input)
 
-        btn_run = QPushButton("Выполнить Задание 3 (Первые 3)")
+        layout.addWidget(QLabel("Сколько выводить (0 - все):"))
+        self.task3_limit_input = self._create_limit_input(3)
+        layout.addWidget(self.task3_limit_input)
+
+        btn_run = QPushButton("Выполнить Задание 3")
         btn_run.setObjectName("btn_run_task3")
         btn_run.clicked.connect(self.run_task3)
         layout.addWidget(btn_run)
 
-        self.task3_output = QTextEdit()
-        self.task3_output.setReadOnly(True)
+        self.task3_progress, btn_cancel = self._create_job_controls(3)
+        layout.addWidget(self.task3_progress)
+        layout.addWidget(btn_cancel)
+
+        self.task3_status = QLabel()
+        layout.addWidget(self.task3_status)
+        self.task3_output_model = ResultListModel(parent=self)
+        self.task3_output = self._create_output_view(self.task3_output_model)
         layout.addWidget(self.task3_output)
 
         self.tab_widget.addTab(tab, "Фильтр Городов")
 
+    def _create_output_view(self, model: ResultListModel) -> QListView:
+        """Создает виртуализированный список результатов: отрисовываются только видимые строки."""
+        view = QListView()
+        view.setModel(model)
+        view.setUniformItemSizes(True) # Высота строк одинакова - не нужно измерять каждую строку
+        view.setLayoutMode(QListView.Batched)
+        return view
+
+    def _create_limit_input(self, default: int) -> QSpinBox:
+        """Создает поле для количества выводимых результатов (0 - все)."""
+        limit_input = QSpinBox()
+        limit_input.setRange(0, MAX_OUTPUT_ROWS)
+        limit_input.setValue(default)
+        return limit_input
+
+    def _create_job_controls(self, tab: int) -> Tuple[QProgressBar, QPushButton]:
+        """Создает индикатор выполнения и кнопку отмены задачи вкладки."""
+        progress = QProgressBar()
+        progress.setRange(0, 100)
+        progress.setValue(0)
+        btn_cancel = QPushButton("Отменить")
+        btn_cancel.setObjectName(f"btn_cancel_task{tab}")
+        btn_cancel.clicked.connect(partial(self.cancel_task, tab))
+        return progress, btn_cancel
+
+    @staticmethod
+    def _create_checkpoint_input() -> QCheckBox:
+        """Создает флажок долгого запуска с контрольной точкой (вычисляется в потоке, а не в процессе-воркере)."""
+        checkpoint_input = QCheckBox("Сохранять прогресс (можно продолжить)")
+        checkpoint_input.setToolTip("После отмены или закрытия окна задачу можно продолжить с того же места")
+        return checkpoint_input
+
+    def _create_resume_button(self, tab: int) -> QPushButton:
+        """Создает кнопку продолжения незавершенной задачи вкладки."""
+        btn_resume = QPushButton("Продолжить")
+        btn_resume.setObjectName(f"btn_resume_task{tab}")
+        btn_resume.clicked.connect(partial(self.resume_task, tab))
+        return btn_resume
+
+    @staticmethod
+    def _limit(limit_input: QSpinBox) -> int:
+        """Количество выводимых результатов; 0 означает все (но не более MAX_OUTPUT_ROWS)."""
+        return limit_input.value() or MAX_OUTPUT_ROWS
+
+    def _remote(self) -> Optional["ProcessBackend"]:
+        """Возвращает пул процессов-воркеров, если включены вычисления в отдельных процессах."""
+        if not self.use_processes_input.isChecked():
+            return None
+        if self._backend is None:
+            from app.process_backend import ProcessBackend
+            self._backend = ProcessBackend()
+        return self._backend
+
     # --- Методы для запуска генераторов ---
 
+    def _start_job(self, tab: int, job: GeneratorJob, status: str, clear: bool = True) -> bool:
+        """
+        Запускает задачу вкладки tab через планировщик.
+        Предыдущая задача этой вкладки отменяется, задачи других вкладок продолжают работу.
+        clear=False — результаты добавляются к уже выведенным (продолжение задачи).
+        Возвращает False, если очередь планировщика заполнена и задача не принята.
+        """
+        previous = self._jobs.get(tab)
+        if previous is not None:
+            self.scheduler.cancel(previous)
+        job.signals.batch_ready.connect(partial(self._on_job_batch, tab, job))
+        job.signals.progress.connect(partial(self._on_job_progress, tab, job))
+        job.signals.finished.connect(partial(self._on_job_finished, tab, job))
+        job.signals.cancelled.connect(partial(self._on_job_cancelled, tab, job))
+        job.signals.error_occurred.connect(self.show_error_message)
+        try:
+            self.scheduler.submit(job)
+        except QueueFullError as e:
+            self._jobs.pop(tab, None)
+            self.show_error_message(str(e))
+            return False
+        self._jobs[tab] = job
+        if clear:
+            self._outputs[tab].clear()
+            self._shows_checkpoint[tab] = job.resumable is not None
+        self._progress_bars[tab].setValue(0)
+        self._statuses[tab].setText(status)
+        return True
+
+    def cancel_task(self, tab: int):
+        """Отменяет текущую задачу вкладки tab."""
+        job = self._jobs.get(tab)
+        if job is not None:
+            self.scheduler.cancel(job)
+
     def run_task1(self):
         """Запускает генератор комбинаций в отдельном потоке."""
-        self.task1_output.clear()
-        self.task1_output.append("Запуск генерации...")
-        self.worker.set_generators({'combinations': generate_two_letter_combinations()})
-        self.worker.start()
-        # Кнопка должна быть отключена во время выполнения
-        btn = self.findChild(QPushButton, "btn_run_task1")
-
-    def run_task2(self):
-        """Запускает генератор значений функции в отдельном потоке."""
-        self.task2_output.clear()
+        if self.task1_checkpoint_input.isChecked():
+            self._start_resumable(1, ResumableJob.combinations(), "Запуск генерации...")
+            return
+        limit = self._limit(self.task1_limit_input)
+        backend = self._remote()
+        if backend is not None:
+            batches = backend.run("combinations", limit=limit)
+        else:
+            batches = generate_two_letter_combinations(batch_size=PULL_BATCH_SIZE)
+        job = GeneratorJob("Задание 1", batches, limit=limit, total=len(CombinationSpace()))
+        self._start_job(1, job, "Запуск генерации...")
+
+    @staticmethod
+    def _task2_error(a: float, b: float, step: float) -> Optional[str]:
+        """Возвращает сообщение об ошибке параметров Задания 2 или None, если они корректны."""
+        if step <= 0:
+            return "Ошибка: Шаг должен быть положительным."
+        if a > b:
+            return "Ошибка: Начальное значение 'a' не может быть больше конечного 'b'."
+        return None
+
+    def _schedule_task2(self):
+        """Откладывает пересчет Задания 2: каждое новое изменение параметров перезапускает таймер."""
+        if self.task2_auto_run_input.isChecked():
+            self._task2_timer.start()
+
+    def _auto_run_task2(self):
+        """Автоматический пересчет: ошибки параметров показываются в строке состояния, а не окном."""
+        error = self._task2_error(self.task2_a_input.value(), self.task2_b_input.value(),
+                                  self.task2_step_input.value())
+        if error is not None:
+            self.task2_status.setText(error)
+            return
+        self.run_task2(resumable=False)
+
+    def run_task2(self, resumable: bool = True):
+        """
+        Запускает генератор значений функции в отдельном потоке.
+        Без отдельных процессов значения берутся из кэша app.cache.default_cache:
+        при изменении a и b на той же решетке вычисляются только новые точки.
+        С отмеченным флажком «Сохранять прогресс» — задача с контрольной точкой (см. _start_resumable);
+        resumable=False (автоматический пересчет) — всегда обычная задача.
+        Обычные задачи не заменяют незавершенную задачу вкладки.
+        """
+        self._task2_timer.stop()
         a = self.task2_a_input.value()
         b = self.task2_b_input.value()
         step = self.task2_step_input.value()
 
-        if step <= 0:
-            self.show_error_message("Ошибка: Шаг должен быть положительным.")
-            return
-        if a > b:
-            self.show_error_message("Ошибка: Начальное значение 'a' не может быть больше конечного 'b'.")
+        error = self._task2_error(a, b, step)
+        if error is not None:
+            self.show_error_message(error)
             return
 
-        self.task2_output.append(f"Запуск для a={a}, b={b}, step={step}...")
         try:
             # Важно: нужно создать новый генератор каждый раз,
             # так как генераторы конечны.
-            func_gen = generate_function_values(a=a, b=b, step=step)
-            self.worker.set_generators({'function_values': func_gen})
-            self.worker.start()
-            # Отключаем кнопку
-            btn = self.findChild(QPushButton, "btn_run_task2")
+            limit = self._limit(self.task2_limit_input)
+            backend = self._remote()
+            if resumable and self.task2_checkpoint_input.isChecked():
+                from app.cache import default_cache # Загружается при первом запуске Задания 2
+                self._start_resumable(2, ResumableJob.function_values(a, b, step, cache=default_cache),
+                                      f"Запуск для a={a}, b={b}, step={step}...")
+                return
+            if backend is not None:
+                func_gen = backend.run("function_values", limit=limit, a=a, b=b, step=step)
+                job = GeneratorJob("Задание 2", func_gen, limit=limit,
+                                   total=point_count(a, b, step), new_buffer=self._buffers[2])
+            else:
+                from app.cache import default_cache
+                job = GeneratorJob("Задание 2", default_cache.function_value_batches(a, b, step, PULL_BATCH_SIZE),
+                                   limit=limit, total=point_count(a, b, step), new_buffer=self._buffers[2])
+            self._start_job(2, job, f"Запуск для a={a}, b={b}, step={step}...")
         except ValueError as ve:
             self.show_error_message(f"Ошибка параметров: {ve}")
         except Exception as e:
@@ -234,71 +398,210 @@ class MainWindow(QMainWindow):
 
     def run_task3(self):
         """Запускает фильтр городов в отдельном потоке."""
-        self.task3_output.clear()
         cities_str = self.task3_input_cities.text()
         min_len = self.task3_min_len_input.value()
 
         if not cities_str:
-            self.task3_output.append("Введите названия городов.")
+            self.task3_status.setText("Введите названия городов.")
             return
 
         try:
-            # Создаем генератор фильтра
-            city_gen = filter_cities_by_length(cities_str, min_length=min_len)
-            self.worker.set_generators({'cities': city_gen})
-            self.worker.start()
-            # Отключаем кнопку
-            btn = self.findChild(QPushButton, "btn_run_task3")
+            limit = self._limit(self.task3_limit_input)
+            backend = self._remote()
+            if backend is not None:
+                # Индекс строится в воркере; количество результатов заранее неизвестно
+                job = GeneratorJob("Задание 3", backend.run("cities", limit=limit, text=cities_str, min_length=min_len),
+                                   limit=limit)
+                self._start_job(3, job, "Фильтрация городов...")
+                return
+            # Индекс перестраивается только при изменении строки городов
+            if cities_str != self._city_index_text:
+                self._city_index = CityIndex.from_string(cities_str)
+                self._city_index_text = cities_str
+            # Результат запроса к индексу уже готов - передаем его одним пакетом
+            cities = self._city_index.longer_than(min_length=min_len, keep_order=True)
+            job = GeneratorJob("Задание 3", [cities], limit=limit, total=len(cities))
+            self._start_job(3, job, "Фильтрация городов...")
         except ValueError as ve:
             self.show_error_message(f"Ошибка параметров: {ve}")
         except Exception as e:
             self.show_error_message(f"Непредвиденная ошибка: {e}")
 
 
-    # --- Слоты для получения данных от Worker ---
+    # --- Контрольные точки и продолжение задач (app/checkpoint.py) ---
 
-    @Slot(str)
-    def add_to_task1_output(self, combination):
-        self.task1_output.append(combination)
+    def _init_checkpoints(self):
+        """
+        Занимает каталог контрольных точек пользователя и находит задачи, не завершенные при прошлом запуске.
+        Каталогом владеет одно окно программы (блокировка QLockFile); если он занят другим окном
+        или недоступен, запуск с сохранением прогресса выключается.
+        """
+        base = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+        reason = "Каталог данных программы недоступен."
+        if base:
+            directory = os.path.join(base, CHECKPOINT_SUBDIR)
+            try:
+                os.makedirs(directory, exist_ok=True)
+            except OSError as e:
+                reason = f"Каталог контрольных точек недоступен: {e}"
+            else:
+                lock = QLockFile(os.path.join(directory, "checkpoints.lock"))
+                lock.setStaleLockTime(0) # Блокировка окна, которое еще работает, не устаревает
+                if lock.tryLock(0):
+                    self._checkpoint_dir, self._checkpoint_lock = directory, lock
+                else:
+                    reason = "Контрольные точки использует другое окно программы."
+        if self._checkpoint_dir is None:
+            for checkpoint_input in self._checkpoint_inputs.values():
+                checkpoint_input.setEnabled(False)
+                checkpoint_input.setToolTip(reason)
+            return
+        self._restore_checkpoints()
 
-    @Slot(float)
-    def add_to_task2_output(self, value):
-        self.task2_output.append(f"{value:.4f}")
+    def _checkpoint_path(self, tab: int) -> str:
+        return os.path.join(self._checkpoint_dir, f"task{tab}.json")
 
-    @Slot(str)
-    def add_to_task3_output(self, city):
-        self.task3_output.append(city)
+    def _drop_checkpoint(self, tab: int):
+        """Забывает незавершенную задачу вкладки и удаляет ее контрольную точку."""
+        self._checkpoint_jobs.pop(tab, None)
+        if self._checkpoints.pop(tab, None) is not None:
+            remove_checkpoint(self._checkpoint_path(tab))
 
-    # --- Слоты для завершения работы ---
+    def _start_resumable(self, tab: int, resumable: ResumableJob, status: str, resume: bool = False):
+        """
+        Запускает задачу с курсором; ее снимки сохраняются в контрольную точку вкладки (_on_job_checkpoint).
+        Новая задача (resume=False) заменяет незавершенную задачу вкладки, но только если планировщик
+        ее принял. Задача считается завершенной, когда пройдена целиком или выведено заданное
+        при запуске количество результатов (extra["limit"]); продолжение выводит оставшиеся.
+        """
+        if not resume:
+            resumable.extra.update(limit=self._limit(self._limit_inputs[tab]), emitted=0)
+        # Курсор задач вкладок 1 и 2 — номер элемента, поэтому остаток известен заранее
+        total = resumable.end - resumable.cursor - resumable.skip
+        limit = resumable.extra.get("limit", MAX_OUTPUT_ROWS) - resumable.extra.get("emitted", 0)
+        job = GeneratorJob(f"Задание {tab}", resumable.batches(PULL_BATCH_SIZE), limit=limit, total=total,
+                           new_buffer=self._buffers[tab], resumable=resumable)
+        job.signals.checkpoint.connect(partial(self._on_job_checkpoint, tab, job))
+        # Продолжение добавляется к выведенным результатам, если во вкладке показана эта же задача
+        clear = not resume or not self._shows_checkpoint.get(tab, False)
+        if not self._start_job(tab, job, status, clear):
+            return
+        if not resume:
+            self._drop_checkpoint(tab)
+        self._checkpoint_jobs[tab] = job
+
+    def _restore_checkpoints(self):
+        """Находит контрольные точки задач, не завершенных при прошлом запуске."""
+        for tab, kind in RESUMABLE_KINDS.items():
+            path = self._checkpoint_path(tab)
+            if not os.path.exists(path):
+                continue
+            try:
+                state = load_checkpoint(path)
+                resumable = ResumableJob.from_state(state)
+            except (OSError, CheckpointError, KeyError, TypeError, ValueError):
+                continue
+            if resumable.kind == kind and not resumable.finished:
+                self._checkpoints[tab] = state
+                self._statuses[tab].setText(
+                    f"Найдена незавершенная задача ({resumable.progress():.0%}). Нажмите «Продолжить».")
+
+    def _on_job_checkpoint(self, tab: int, job: GeneratorJob, state: Dict[str, Any], processed: int):
+        """
+        Сохраняет снимок состояния задачи (processed — сколько результатов она вывела)
+        в контрольную точку вкладки или удаляет ее, если задача завершена.
+        Снимки замененных задач не сохраняются.
+        """
+        if self._checkpoint_jobs.get(tab) is not job:
+            return
+        extra = state["extra"]
+        extra["emitted"] = extra.get("emitted", 0) + processed
+        if state["finished"] or extra["emitted"] >= extra.get("limit", MAX_OUTPUT_ROWS):
+            self._drop_checkpoint(tab)
+            return
+        self._checkpoints[tab] = state
+        try:
+            save_checkpoint(self._checkpoint_path(tab), state)
+        except OSError as e:
+            self._statuses[tab].setText(f"Не удалось сохранить контрольную точку: {e}")
+
+    def resume_task(self, tab: int):
+        """Продолжает незавершенную задачу вкладки с первого необработанного элемента."""
+        state = self._checkpoints.get(tab)
+        if state is None:
+            self._statuses[tab].setText("Нет незавершенной задачи.")
+            return
+        job = self._checkpoint_jobs.get(tab)
+        if job is not None and (job in self.scheduler.active_jobs or job in self.scheduler.pending_jobs):
+            self._statuses[tab].setText("Задача еще выполняется.")
+            return
+        resumable = ResumableJob.from_state(state)
+        if resumable.kind == "function_values":
+            from app.cache import default_cache
+            resumable.cache = default_cache
+        self._start_resumable(tab, resumable, f"Продолжение задачи ({resumable.progress():.0%})...", resume=True)
+
+    # --- Слоты для получения данных от задач ---
+    # Пакеты от уже замененной (отмененной) задачи вкладки игнорируются.
+
+    def _on_job_batch(self, tab: int, job: GeneratorJob, batch):
+        if self._jobs.get(tab) is job:
+            self._outputs[tab].append_batch(batch)
 
-    @Slot()
-    def on_task1_finished(self):
-        self.task1_output.append("\nГенерация комбинаций завершена.")
-        btn = self.findChild(QPushButton, "btn_run_task1")
+    def _on_job_progress(self, tab: int, job: GeneratorJob, percent: int):
+        if self._jobs.get(tab) is job:
+            self._progress_bars[tab].setValue(percent)
 
-    @Slot()
-    def on_task2_finished(self):
-        self.task2_output.append("\nГенерация значений функции завершена.")
-        btn = self.findChild(QPushButton, "btn_run_task2")
+    # --- Слоты для завершения работы ---
+
+    def _on_job_finished(self, tab: int, job: GeneratorJob):
+        if self._jobs.get(tab) is job:
+            del self._jobs[tab]
+            self._progress_bars[tab].setValue(100)
+            self._statuses[tab].setText(f"{self._finished_messages[tab]} Выведено: {self._outputs[tab].rowCount()}")
+
+    def _on_job_cancelled(self, tab: int, job: GeneratorJob):
+        if self._jobs.get(tab) is job:
+            del self._jobs[tab]
+            status = f"Задача отменена. Выведено: {self._outputs[tab].rowCount()}"
+            if self._checkpoint_jobs.get(tab) is job and tab in self._checkpoints:
+                status += ". Можно продолжить."
+            self._statuses[tab].setText(status)
+
+    # --- Метрики ---
+
+    def toggle_metrics(self, checked: bool):
+        """Включает или выключает сбор метрик (при включении счетчики начинаются заново)."""
+        if checked:
+            metrics.enable()
+        else:
+            metrics.disable()
+
+    def show_metrics(self):
+        recorder = metrics.current()
+        if recorder is None:
+            QMessageBox.information(self, "Метрики", "Сбор метрик выключен.")
+            return
+        QMessageBox.information(self, "Метрики", metrics.format_snapshot(recorder.snapshot()))
 
-    @Slot()
-    def on_task3_finished(self):
-        self.task3_output.append("\nФильтрация городов завершена.")
-        btn = self.findChild(QPushButton, "btn_run_task3")
     # --- Обработка ошибок ---
     @Slot(str)
     def show_error_message(self, message):
         QMessageBox.critical(self, "Ошибка", message)
-        # Включаем кнопки обратно, если произошла ошибка
-        self.tab_widget.findChild(QPushButton, "Выполнить Задание 1 (Первые 50)").setEnabled(True)
-        self.tab_widget.findChild(QPushButton, "Выполнить Задание 2 (Первые 20)").setEnabled(True)
-        self.tab_widget.findChild(QPushButton, "Выполнить Задание 3 (Первые 3)").setEnabled(True)
 
     def closeEvent(self, event):
         """
-        Обработка закрытия окна. Останавливаем worker, если он работает.
+        Обработка закрытия окна. Отменяем все задачи, ждем завершения выполняющихся
+        и останавливаем процессы-воркеры.
         """
-        if self.worker.isRunning():
-            self.worker.stop()
-            self.worker.wait() # Ждем завершения потока
+        self.scheduler.cancel_all()
+        self.scheduler.wait() # Ждем завершения потоков
+        # Сигналы со снимками уже не будут обработаны, а потоки задач завершены -
+        # сохраняем контрольные точки по состоянию задач
+        for tab, job in list(self._checkpoint_jobs.items()):
+            self._on_job_checkpoint(tab, job, job.resumable.state(), job.processed)
+        if self._checkpoint_lock is not None:
+            self._checkpoint_lock.unlock()
+        if self._backend is not None:
+            self._backend.shutdown()
         event.accept()
@@ -0,0 +1,58 @@
+from array import array
+from typing import Any, Callable, Iterable, Optional
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+
+# --- Модель результатов для виртуализированного вывода ---
+#
+# QListView запрашивает у модели только видимые строки, поэтому даже
+# миллионы результатов прокручиваются плавно. Сами результаты хранятся
+# компактно: числа — в array('d') (8 байт на значение), строки — в списке,
+# а текст для отображения формируется только при отрисовке строки.
+
+class ResultListModel(QAbstractListModel):
+    """
+    Модель списка результатов над компактным буфером.
+    numeric=True — значения хранятся в array('d') и форматируются через formatter.
+    max_rows — ограничение числа строк (None — без ограничения); лишние элементы отбрасываются.
+    """
+
+    def __init__(self, numeric: bool = False, formatter: Callable[[Any], str] = str,
+                 max_rows: Optional[int] = None, parent=None):
+        super().__init__(parent)
+        self._numeric = numeric
+        self._formatter = formatter
+        self._max_rows = max_rows
+        self._items = array("d") if numeric else []
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if role == Qt.DisplayRole and index.isValid() and index.row() < len(self._items):
+            return self._formatter(self._items[index.row()])
+        return None
+
+    def append_batch(self, batch: Iterable[Any]) -> None:
+        """Добавляет пакет элементов одной операцией вставки строк."""
+        batch = batch if isinstance(batch, (list, array)) else list(batch)
+        if self._max_rows is not None:
+            batch = batch[:max(self._max_rows - len(self._items), 0)]
+        if not len(batch):
+            return
+        first = len(self._items)
+        self.beginInsertRows(QModelIndex(), first, first + len(batch) - 1)
+        self._items.extend(batch)
+        self.endInsertRows()
+
+    def set_max_rows(self, max_rows: Optional[int]) -> None:
+        self._max_rows = max_rows
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._items = array("d") if self._numeric else []
+        self.endResetModel()
+
+    def items(self):
+        """Возвращает буфер с результатами (без копирования)."""
+        return self._items